@@ -0,0 +1,153 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+from reviews.models import ADMIN, MODERATOR, CustomUser
+
+CLAIMS_CHANGED_KEY = 'auth:claims_changed:{}'
+TOKEN_CLAIMS = ('username', 'role', 'is_staff')
+
+
+def get_access_token(user):
+    """Выдаёт access-токен с ролью пользователя в claims."""
+    token = RefreshToken.for_user(user).access_token
+    for claim in TOKEN_CLAIMS:
+        token[claim] = getattr(user, claim)
+    # Первый запрос с токеном не идёт в базу за временем изменения прав.
+    remember_claims_changed(user.pk, user.claims_changed)
+    return token
+
+
+def invalidate_claims(user_id):
+    """
+    Сбрасывает закэшированное время изменения прав пользователя:
+    следующий запрос прочитает его из базы.
+    """
+    key = CLAIMS_CHANGED_KEY.format(user_id)
+    cache.delete(key)
+    # До фиксации транзакции параллельный запрос мог снова
+    # закэшировать прежнее значение из базы.
+    transaction.on_commit(lambda: cache.delete(key))
+
+
+def get_claims_changed(user_id):
+    """
+    Время последнего изменения прав пользователя в секундах
+    (0 — не менялись, None — пользователя нет). Источник — поле
+    CustomUser.claims_changed; кэш только избавляет от запроса,
+    и промах кэша ведёт в основную базу: отстающая реплика вернула бы
+    время до изменения прав, и оно снова попало бы в кэш.
+    """
+    key = CLAIMS_CHANGED_KEY.format(user_id)
+    changed = cache.get(key)
+    if changed is not None:
+        return changed
+    rows = list(
+        CustomUser.objects.db_manager(DEFAULT_DB_ALIAS).filter(
+            pk=user_id
+        ).values_list('claims_changed', flat=True)
+    )
+    if not rows:
+        return None
+    return remember_claims_changed(user_id, rows[0])
+
+
+def remember_claims_changed(user_id, claims_changed):
+    changed = int(claims_changed.timestamp()) if claims_changed else 0
+    cache.set(
+        CLAIMS_CHANGED_KEY.format(user_id), changed,
+        settings.JWT_CLAIMS_CACHE_TIMEOUT
+    )
+    return changed
+
+
+class ClaimsUser(TokenUser):
+    """Пользователь, собранный из claims токена без запроса к базе."""
+
+    @property
+    def role(self):
+        return self.token.get('role')
+
+    @property
+    def is_admin(self):
+        return self.is_staff or self.role == ADMIN
+
+    @property
+    def is_moderator(self):
+        return self.role == MODERATOR
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """
+    JWT-аутентификация без запроса пользователя из базы.
+    Пользователь берётся из claims токена, проверенные токены хранятся
+    в ограниченном LRU-кэше процесса. Если права пользователя изменились
+    после выдачи токена (см. get_claims_changed) или в токене нет claims,
+    пользователь загружается из основной базы, как в JWTAuthentication.
+    """
+    tokens = OrderedDict()
+    tokens_lock = threading.Lock()
+
+    def get_validated_token(self, raw_token):
+        with self.tokens_lock:
+            token = self.tokens.get(raw_token)
+            if token is not None:
+                if token['exp'] > time.time():
+                    self.tokens.move_to_end(raw_token)
+                    return token
+                del self.tokens[raw_token]
+        token = super().get_validated_token(raw_token)
+        with self.tokens_lock:
+            self.tokens[raw_token] = token
+            while len(self.tokens) > settings.JWT_TOKEN_CACHE_SIZE:
+                self.tokens.popitem(last=False)
+        return token
+
+    def get_user(self, validated_token):
+        if (
+            any(claim not in validated_token for claim in TOKEN_CLAIMS)
+            or self.claims_changed(validated_token)
+        ):
+            return self.get_primary_user(validated_token)
+        return ClaimsUser(validated_token)
+
+    def get_primary_user(self, validated_token):
+        """
+        То же, что JWTAuthentication.get_user, но из основной базы:
+        в реплике у пользователя могут быть ещё прежние права.
+        """
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(
+                _('Token contained no recognizable user identification')
+            )
+        try:
+            user = self.user_model.objects.db_manager(DEFAULT_DB_ALIAS).get(
+                **{api_settings.USER_ID_FIELD: user_id}
+            )
+        except self.user_model.DoesNotExist:
+            raise AuthenticationFailed(
+                _('User not found'), code='user_not_found'
+            )
+        if not user.is_active:
+            raise AuthenticationFailed(
+                _('User is inactive'), code='user_inactive'
+            )
+        return user
+
+    def claims_changed(self, validated_token):
+        changed = get_claims_changed(
+            validated_token[api_settings.USER_ID_CLAIM]
+        )
+        return changed is None or validated_token.get('iat', 0) <= changed
@@ -0,0 +1,144 @@
+import hashlib
+import threading
+import time
+from collections import Counter
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.response import Response
+
+from api_yamdb.db_router import REPLICA_DB_ALIAS, routing_state
+
+from .metrics import observe_cache_access
+
+GENERATION_KEY = 'api:generation:{}'
+RESPONSE_KEY = 'api:response:{}'
+
+_stats = Counter()
+_stats_lock = threading.Lock()
+
+
+def _generation_key(model):
+    return GENERATION_KEY.format(model._meta.label_lower)
+
+
+def _initial_generation():
+    # Начальное значение берётся из времени, а не с нуля: если счётчик
+    # вытеснят из кэша, новые версии не совпадут со старыми ключами.
+    return time.time_ns()
+
+
+def bump_generation(model):
+    """Делает недействительными все закэшированные ответы по модели."""
+    key = _generation_key(model)
+    try:
+        cache.incr(key)
+    except ValueError:
+        if not cache.add(key, _initial_generation(), timeout=None):
+            cache.incr(key)
+
+
+def get_generations(models):
+    keys = [_generation_key(model) for model in models]
+    generations = cache.get_many(keys)
+    for key in keys:
+        if key not in generations:
+            generation = _initial_generation()
+            if not cache.add(key, generation, timeout=None):
+                generation = cache.get(key, generation)
+            generations[key] = generation
+    return [generations[key] for key in keys]
+
+
+def record_cache_access(hit):
+    with _stats_lock:
+        _stats['hits' if hit else 'misses'] += 1
+    if settings.PROMETHEUS_METRICS:
+        observe_cache_access(hit)
+
+
+def response_cache_stats():
+    """Счётчики попаданий и промахов кэша ответов в текущем процессе."""
+    with _stats_lock:
+        return {'hits': _stats['hits'], 'misses': _stats['misses']}
+
+
+class ResponseCacheMixin:
+    """
+    Кэширует ответы GET-запросов к каталогу.
+    Ключ строится из адреса, значимых параметров запроса и поколений
+    моделей из cache_models; сохранение или удаление любой из этих
+    моделей увеличивает поколение, и старые ответы больше не читаются.
+    """
+    cache_models = ()
+
+    def get_cache_query_params(self):
+        names = set()
+        filterset_class = getattr(self, 'filterset_class', None)
+        if filterset_class is not None:
+            names.update(filterset_class.base_filters)
+        for backend in self.filter_backends:
+            for attr in ('search_param', 'ordering_param'):
+                if hasattr(backend, attr):
+                    names.add(getattr(backend, attr))
+        for attr in ('limit_query_param', 'offset_query_param',
+                     'cursor_query_param', 'page_query_param'):
+            name = getattr(self.paginator, attr, None)
+            if name:
+                names.add(name)
+        return names
+
+    def get_response_cache_key(self, request):
+        names = self.get_cache_query_params()
+        params = sorted(
+            (name, value)
+            for name, values in request.query_params.lists()
+            if name in names
+            for value in values
+            if value != ''
+        )
+        raw_key = '|'.join((
+            request.build_absolute_uri(request.path),
+            urlencode(params),
+            ','.join(map(str, get_generations(self.cache_models)))
+        ))
+        return RESPONSE_KEY.format(hashlib.md5(raw_key.encode()).hexdigest())
+
+    def get_cached_response(self, handler, request, *args, **kwargs):
+        key = self.get_response_cache_key(request)
+        data = cache.get(key)
+        record_cache_access(data is not None)
+        if data is not None:
+            response = Response(data)
+            response['X-Cache'] = 'HIT'
+            return response
+        response = handler(request, *args, **kwargs)
+        if response.status_code == 200 and not self.read_from_replica():
+            cache.set(key, response.data, settings.RESPONSE_CACHE_TIMEOUT)
+        response['X-Cache'] = 'MISS'
+        return response
+
+    def read_from_replica(self):
+        # Реплика может отставать: её данные под только что увеличенным
+        # поколением раздавались бы всем до RESPONSE_CACHE_TIMEOUT.
+        state = routing_state.get()
+        return state is not None and REPLICA_DB_ALIAS in state.used
+
+
+class CachedListMixin(ResponseCacheMixin):
+    """Кэширует ответ на получение списка объектов."""
+
+    def list(self, request, *args, **kwargs):
+        return self.get_cached_response(
+            super().list, request, *args, **kwargs
+        )
+
+
+class CachedRetrieveMixin(ResponseCacheMixin):
+    """Кэширует ответ на получение объекта."""
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.get_cached_response(
+            super().retrieve, request, *args, **kwargs
+        )
@@ -0,0 +1,114 @@
+import hashlib
+import json
+
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+
+def make_etag(data):
+    payload = json.dumps(data, sort_keys=True, default=str)
+    return f'W/"{hashlib.md5(payload.encode()).hexdigest()}"'
+
+
+def get_timestamp(last_modified):
+    return int(last_modified.timestamp()) if last_modified else None
+
+
+def set_validators(response, etag, timestamp):
+    response['ETag'] = etag
+    if timestamp is not None:
+        response['Last-Modified'] = http_date(timestamp)
+    return response
+
+
+class ConditionalGetMixin:
+    """
+    Поддержка условных GET-запросов (If-None-Match, If-Modified-Since).
+    ETag считается по данным ответа — из кэша ответов или из базы, —
+    поэтому валидаторам не нужен отдельный запрос, а ETag меняется
+    при любом изменении ответа, в том числе при переименовании автора.
+    Last-Modified отдаётся у объекта, загруженного из базы (поле
+    updated_field); для запроса с одним If-Modified-Since дата читается
+    одним лёгким запросом. Если вьюсет знает версию списка без выборки
+    страницы (get_list_validators), 304 отдаётся до запроса страницы
+    и сериализации.
+    """
+    updated_field = 'updated'
+
+    def list(self, request, *args, **kwargs):
+        validators = self.get_list_validators()
+        if validators is None:
+            return self.get_conditional_response(
+                super().list, request, *args, **kwargs
+            )
+        etag, last_modified = validators
+        timestamp = get_timestamp(last_modified)
+        response = get_conditional_response(
+            request._request, etag=etag, last_modified=timestamp
+        )
+        if response is None:
+            response = super().list(request, *args, **kwargs)
+        if response.status_code in (200, 304):
+            set_validators(response, etag, timestamp)
+        return response
+
+    def get_list_validators(self):
+        """
+        ETag и дата изменения списка, известные до выборки страницы,
+        или None: тогда ETag считается по данным ответа.
+        """
+
+    def get_feed_validators(self, parent):
+        """
+        Валидаторы вложенной ленты (отзывы произведения, комментарии
+        отзыва) по уже загруженному родителю без запросов: дата его
+        изменения обновляется при любом изменении ленты, включая
+        переименование авторов. Страница и её параметры входят в ETag.
+        """
+        last_modified = getattr(parent, self.updated_field)
+        etag = make_etag([
+            self.request.get_full_path(), parent.pk, last_modified
+        ])
+        return etag, last_modified
+
+    def retrieve(self, request, *args, **kwargs):
+        meta = request._request.META
+        if (
+            'HTTP_IF_MODIFIED_SINCE' in meta
+            and 'HTTP_IF_NONE_MATCH' not in meta
+        ):
+            timestamp = get_timestamp(self.get_last_modified())
+            not_modified = timestamp and get_conditional_response(
+                request._request, last_modified=timestamp
+            )
+            if not_modified:
+                not_modified['Last-Modified'] = http_date(timestamp)
+                return not_modified
+        return self.get_conditional_response(
+            super().retrieve, request, *args, **kwargs
+        )
+
+    def get_object(self):
+        instance = super().get_object()
+        self.last_modified = getattr(instance, self.updated_field, None)
+        return instance
+
+    def get_last_modified(self):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        return self.filter_queryset(
+            self.get_queryset()
+        ).prefetch_related(None).filter(
+            **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+        ).values_list(self.updated_field, flat=True).first()
+
+    def get_conditional_response(self, handler, request, *args, **kwargs):
+        response = handler(request, *args, **kwargs)
+        if response.status_code != 200:
+            return response
+        etag = make_etag(response.data)
+        timestamp = get_timestamp(getattr(self, 'last_modified', None))
+        not_modified = get_conditional_response(request._request, etag=etag)
+        if not_modified is not None:
+            not_modified['ETag'] = etag
+            return not_modified
+        return set_validators(response, etag, timestamp)
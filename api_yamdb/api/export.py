@@ -0,0 +1,102 @@
+import json
+from collections import defaultdict
+from datetime import datetime, time
+from itertools import islice
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils.dateparse import parse_date, parse_datetime
+from django.utils.timezone import is_naive, make_aware
+from reviews.models import Comment, GenreTitle, Review, Title
+
+EXPORT_TYPES = ('titles', 'reviews', 'comments')
+CHUNK_SIZE = 2000
+
+
+def parse_since(value):
+    """Разбирает дату или дату и время; наивное время считается местным."""
+    since = parse_datetime(value)
+    if since is None:
+        date = parse_date(value)
+        if date is None:
+            raise ValueError(value)
+        since = datetime.combine(date, time.min)
+    return make_aware(since) if is_naive(since) else since
+
+
+def chunks(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def export_titles(since=None, chunk_size=CHUNK_SIZE):
+    titles = Title.objects.order_by('pk').values(
+        'id', 'name', 'year', 'description', 'rating', 'rating_count',
+        'updated', 'category__name', 'category__slug'
+    )
+    if since is not None:
+        titles = titles.filter(updated__gte=since)
+    for chunk in chunks(titles.iterator(chunk_size=chunk_size), chunk_size):
+        genres = defaultdict(list)
+        for title_id, name, slug in GenreTitle.objects.filter(
+            title_id__in=[title['id'] for title in chunk]
+        ).order_by('genre__name').values_list(
+            'title_id', 'genre__name', 'genre__slug'
+        ):
+            genres[title_id].append({'name': name, 'slug': slug})
+        for title in chunk:
+            category_slug = title.pop('category__slug')
+            category_name = title.pop('category__name')
+            title['category'] = category_slug and {
+                'name': category_name, 'slug': category_slug
+            }
+            title['genre'] = genres[title['id']]
+            yield 'title', title
+
+
+def export_reviews(since=None, chunk_size=CHUNK_SIZE):
+    reviews = Review.objects.order_by('pk').values(
+        'id', 'title_id', 'author__username', 'text', 'score', 'pub_date',
+        'updated'
+    )
+    if since is not None:
+        reviews = reviews.filter(updated__gte=since)
+    for review in reviews.iterator(chunk_size=chunk_size):
+        review['author'] = review.pop('author__username')
+        yield 'review', review
+
+
+def export_comments(since=None, chunk_size=CHUNK_SIZE):
+    comments = Comment.objects.order_by('pk').values(
+        'id', 'review_id', 'author__username', 'text', 'pub_date', 'updated'
+    )
+    if since is not None:
+        comments = comments.filter(updated__gte=since)
+    for comment in comments.iterator(chunk_size=chunk_size):
+        comment['author'] = comment.pop('author__username')
+        yield 'comment', comment
+
+
+EXPORTERS = {
+    'titles': export_titles,
+    'reviews': export_reviews,
+    'comments': export_comments,
+}
+
+
+def export_ndjson(types=EXPORT_TYPES, since=None, chunk_size=CHUNK_SIZE):
+    """
+    Построчно выгружает каталог, отзывы и комментарии в NDJSON.
+    Строки читаются серверным курсором пачками по chunk_size,
+    поэтому память не зависит от размера таблиц.
+    """
+    for export_type in types:
+        for record_type, record in EXPORTERS[export_type](since, chunk_size):
+            yield json.dumps(
+                {'type': record_type, **record},
+                cls=DjangoJSONEncoder,
+                ensure_ascii=False
+            ) + '\n'
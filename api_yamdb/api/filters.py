@@ -1,13 +1,45 @@
 from django_filters import rest_framework as filters
+from rest_framework.filters import OrderingFilter
 from reviews.models import Title
+from reviews.search import search_titles
 
 
 class TitlesFilter(filters.FilterSet):
     genre = filters.CharFilter(field_name='genre__slug')
     category = filters.CharFilter(field_name='category__slug')
     name = filters.CharFilter(field_name='name', lookup_expr='icontains')
+    year__gte = filters.NumberFilter(field_name='year', lookup_expr='gte')
+    year__lte = filters.NumberFilter(field_name='year', lookup_expr='lte')
     rating = filters.NumberFilter(field_name='rating')
+    rating__gte = filters.NumberFilter(field_name='rating', lookup_expr='gte')
+    rating__lte = filters.NumberFilter(field_name='rating', lookup_expr='lte')
+    search = filters.CharFilter(method='filter_search')
 
     class Meta:
         model = Title
-        fields = ('genre', 'category', 'name', 'year', 'rating')
+        fields = (
+            'genre', 'category', 'name', 'year', 'year__gte', 'year__lte',
+            'rating', 'rating__gte', 'rating__lte', 'search'
+        )
+
+    def filter_search(self, queryset, name, value):
+        return search_titles(queryset, value)
+
+
+class TitlesOrderingFilter(OrderingFilter):
+    """
+    Сортировка по ordering с id в конце: у произведений с одинаковым
+    годом или рейтингом порядок постоянный, и страницы не пересекаются.
+    Индексы (поле, id) отдают строки сразу в этом порядке.
+    Без ordering порядок не меняется (по названию или по релевантности
+    при поиске).
+    """
+    ordering_fields = ('name', 'year', 'rating')
+
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+        if ordering:
+            ordering = [
+                *ordering, '-id' if ordering[-1].startswith('-') else 'id'
+            ]
+        return ordering
@@ -0,0 +1,128 @@
+"""
+Замеры запроса: число и время SQL-запросов, время сериализации
+и рендеринга, вьюсет и действие. Собираются в RequestMetrics,
+который RequestMetricsMiddleware кладёт в request_metrics на время
+запроса. Без middleware (REQUEST_METRICS выключен) request_metrics
+пуст, и замеры сводятся к одной проверке контекстной переменной.
+Фазы не исключают друг друга: SQL, выполненный при сериализации,
+учитывается и в sql, и в serialize.
+"""
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from rest_framework.renderers import JSONRenderer
+
+request_metrics = ContextVar('request_metrics', default=None)
+
+
+class RequestMetrics:
+    """Замеры одного запроса, длительности в секундах."""
+
+    def __init__(self, track_duplicates=False, capture_queries=False):
+        self.started = time.perf_counter()
+        self.view = None
+        self.action = None
+        self.route = None
+        self.queries = 0
+        self.sql_time = 0.0
+        self.phases = Counter()
+        # Одинаковый SQL с разными параметрами — признак N+1.
+        self.statements = Counter() if track_duplicates else None
+        # SQL с параметрами и длительностью, для профилей запросов.
+        self.captured = [] if capture_queries else None
+
+    def record_query(self, execute, sql, params, many, context):
+        """Обёртка для connection.execute_wrapper."""
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - started
+            self.sql_time += duration
+            self.queries += 1
+            if self.statements is not None:
+                self.statements[sql] += 1
+            if self.captured is not None:
+                self.captured.append((sql, params, duration))
+
+    @property
+    def total_time(self):
+        return time.perf_counter() - self.started
+
+    def duplicates(self, threshold):
+        """SQL, выполненный за запрос не меньше threshold раз."""
+        if self.statements is None:
+            return {}
+        return {
+            sql: count for sql, count in self.statements.items()
+            if count >= threshold
+        }
+
+    def server_timing(self):
+        """Значение заголовка Server-Timing, длительности в миллисекундах."""
+        parts = [
+            f'sql;dur={self.sql_time * 1000:.1f};desc="{self.queries} queries"'
+        ]
+        parts += [
+            f'{phase};dur={duration * 1000:.1f}'
+            for phase, duration in self.phases.items()
+        ]
+        parts.append(f'total;dur={self.total_time * 1000:.1f}')
+        return ', '.join(parts)
+
+    def as_dict(self):
+        return {
+            'view': self.view,
+            'action': self.action,
+            'route': self.route,
+            'queries': self.queries,
+            'sql_ms': round(self.sql_time * 1000, 3),
+            **{
+                f'{phase}_ms': round(duration * 1000, 3)
+                for phase, duration in self.phases.items()
+            },
+            'total_ms': round(self.total_time * 1000, 3),
+        }
+
+
+@contextmanager
+def timed(phase):
+    """Добавляет длительность блока к фазе phase текущего запроса."""
+    metrics = request_metrics.get()
+    if metrics is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.phases[phase] += time.perf_counter() - started
+
+
+class TimedJSONRenderer(JSONRenderer):
+    """JSONRenderer, который учитывает время рендеринга ответа."""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        with timed('render'):
+            return super().render(data, accepted_media_type, renderer_context)
+
+
+class SerializerTimingMixin:
+    """
+    Учитывает время сериализации ответа во вьюсетах DRF.
+    Представление объекта (без входных данных) строится сразу
+    в get_serializer: serializer.data кэширует его, и вьюсет
+    получает готовый результат.
+    """
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        if (
+            request_metrics.get() is not None
+            and args and 'data' not in kwargs
+        ):
+            with timed('serialize'):
+                serializer.data
+        return serializer
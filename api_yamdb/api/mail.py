@@ -0,0 +1,169 @@
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+
+from .metrics import observe_mail_delivery, observe_mail_queue
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class MailDispatcher:
+    """
+    Отправляет письма в фоне: запрос кладёт письмо в ограниченную очередь,
+    пул потоков доставляет его. Каждый поток держит своё соединение
+    с почтовым сервером и закрывает его после idle_timeout без писем.
+    Ошибки доставки повторяются с экспоненциальной задержкой.
+    Если очередь переполнена, письмо отправляется сразу в текущем потоке.
+    """
+
+    def __init__(self, workers, queue_size, retries, retry_delay,
+                 idle_timeout):
+        self.workers = workers
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self.idle_timeout = idle_timeout
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.threads = []
+        self.pid = None
+        self.lock = threading.Lock()
+        self.stats_lock = threading.Lock()
+        self.sent = self.failed = self.retried = self.overflow = 0
+        self.latency_total = self.latency_max = 0.0
+
+    def start(self):
+        # Потоки не переживают fork, поэтому в каждом процессе
+        # gunicorn пул запускается заново при первом письме.
+        with self.lock:
+            if self.pid == os.getpid():
+                return
+            self.pid = os.getpid()
+            self.threads = [
+                threading.Thread(
+                    target=self.work, name=f'mail-{number}', daemon=True
+                )
+                for number in range(self.workers)
+            ]
+            for thread in self.threads:
+                thread.start()
+
+    def send(self, message):
+        self.start()
+        try:
+            self.queue.put_nowait((message, time.monotonic()))
+            observe_mail_queue(1)
+        except queue.Full:
+            with self.stats_lock:
+                self.overflow += 1
+            logger.warning('Очередь писем переполнена, отправка сразу.')
+            connection = get_connection()
+            try:
+                self.deliver(connection, message, time.monotonic())
+            finally:
+                connection.close()
+
+    def work(self):
+        connection = get_connection()
+        while True:
+            try:
+                item = self.queue.get(timeout=self.idle_timeout)
+            except queue.Empty:
+                connection.close()
+                continue
+            if item is _STOP:
+                connection.close()
+                self.queue.task_done()
+                return
+            observe_mail_queue(-1)
+            try:
+                self.deliver(connection, *item)
+            finally:
+                self.queue.task_done()
+
+    def deliver(self, connection, message, queued):
+        message.connection = connection
+        for attempt in range(self.retries + 1):
+            try:
+                # open() ничего не делает, если соединение уже открыто.
+                connection.open()
+                message.send()
+            except Exception:
+                # Соединение могло оборваться: закрываем его,
+                # следующая попытка откроет новое.
+                connection.close()
+                if attempt == self.retries:
+                    with self.stats_lock:
+                        self.failed += 1
+                    logger.exception(
+                        'Не удалось отправить письмо на %s', message.to
+                    )
+                    return
+                with self.stats_lock:
+                    self.retried += 1
+                time.sleep(self.retry_delay * 2 ** attempt)
+            else:
+                latency = time.monotonic() - queued
+                with self.stats_lock:
+                    self.sent += 1
+                    self.latency_total += latency
+                    self.latency_max = max(self.latency_max, latency)
+                observe_mail_delivery(latency)
+                return
+
+    def flush(self):
+        """Дожидается доставки всех писем из очереди."""
+        if self.pid == os.getpid():
+            self.queue.join()
+
+    def stop(self, timeout=10):
+        if self.pid != os.getpid():
+            return
+        for _ in self.threads:
+            self.queue.put(_STOP)
+        deadline = time.monotonic() + timeout
+        for thread in self.threads:
+            thread.join(max(deadline - time.monotonic(), 0))
+        self.pid = None
+
+    def stats(self):
+        """Глубина очереди и задержка доставки в текущем процессе."""
+        with self.stats_lock:
+            return {
+                'queue_depth': self.queue.qsize(),
+                'sent': self.sent,
+                'failed': self.failed,
+                'retried': self.retried,
+                'overflow': self.overflow,
+                'latency_avg': (
+                    self.latency_total / self.sent if self.sent else 0.0
+                ),
+                'latency_max': self.latency_max,
+            }
+
+
+dispatcher = MailDispatcher(
+    workers=settings.MAIL_WORKERS,
+    queue_size=settings.MAIL_QUEUE_SIZE,
+    retries=settings.MAIL_RETRIES,
+    retry_delay=settings.MAIL_RETRY_DELAY,
+    idle_timeout=settings.MAIL_IDLE_TIMEOUT,
+)
+atexit.register(dispatcher.stop)
+
+
+def send_mail_async(subject, message, from_email, recipient_list):
+    """Ставит письмо в очередь фоновой отправки и сразу возвращается."""
+    dispatcher.send(
+        EmailMessage(subject, message, from_email, recipient_list)
+    )
+
+
+def mail_stats():
+    return dispatcher.stats()
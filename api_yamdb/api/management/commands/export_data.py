@@ -0,0 +1,42 @@
+import sys
+
+from api.export import CHUNK_SIZE, EXPORT_TYPES, export_ndjson, parse_since
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = (
+        'Потоково выгружает произведения, отзывы и комментарии в NDJSON.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--types', default=','.join(EXPORT_TYPES),
+            help=f'Через запятую: {", ".join(EXPORT_TYPES)}.'
+        )
+        parser.add_argument(
+            '--since', help='Только записи, изменённые начиная с этой даты.'
+        )
+        parser.add_argument('--output', help='Файл; по умолчанию stdout.')
+        parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        types = options['types'].split(',')
+        if not set(types) <= set(EXPORT_TYPES):
+            raise CommandError(
+                f'Допустимые значения --types: {", ".join(EXPORT_TYPES)}.'
+            )
+        try:
+            since = parse_since(options['since']) if options['since'] else None
+        except ValueError:
+            raise CommandError('Некорректная дата в --since.')
+        output = (
+            open(options['output'], 'w', encoding='utf-8')
+            if options['output'] else sys.stdout
+        )
+        try:
+            for line in export_ndjson(types, since, options['chunk_size']):
+                output.write(line)
+        finally:
+            if output is not sys.stdout:
+                output.close()
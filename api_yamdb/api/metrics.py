@@ -0,0 +1,112 @@
+"""
+Метрики приложения в формате Prometheus (/metrics).
+Несколько процессов gunicorn пишут значения в файлы каталога
+PROMETHEUS_MULTIPROC_DIR, а /metrics собирает их по всем процессам,
+поэтому любой процесс отдаёт общие для сервиса числа. Без этой
+переменной метрики считаются в памяти процесса. Состояние очереди
+писем и пулов соединений процесс сам публикует при каждом изменении
+в датчики livesum: при сборе значения живых процессов складываются.
+"""
+import os
+
+from django.conf import settings
+from django.http import Http404, HttpResponse
+from prometheus_client import (CONTENT_TYPE_LATEST, REGISTRY,
+                               CollectorRegistry, Counter, Gauge, Histogram,
+                               generate_latest, multiprocess)
+
+REQUESTS = Counter(
+    'yamdb_http_requests_total',
+    'Запросы к приложению по вьюсету, действию, методу и статусу.',
+    ('view', 'action', 'method', 'status')
+)
+LATENCY = Histogram(
+    'yamdb_http_request_duration_seconds',
+    'Время обработки запроса.',
+    ('view', 'action'),
+    buckets=(
+        0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10
+    )
+)
+QUERIES = Histogram(
+    'yamdb_http_request_db_queries',
+    'Число SQL-запросов за запрос.',
+    ('view', 'action'),
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89)
+)
+RESPONSE_CACHE = Counter(
+    'yamdb_response_cache_requests_total',
+    'Обращения к кэшу ответов API: hit или miss.',
+    ('result',)
+)
+MAIL_QUEUE_DEPTH = Gauge(
+    'yamdb_mail_queue_depth',
+    'Письма в очереди фоновой отправки.',
+    multiprocess_mode='livesum'
+)
+MAIL_LATENCY = Histogram(
+    'yamdb_mail_delivery_seconds',
+    'Время от постановки письма в очередь до доставки.',
+    buckets=(0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+)
+DB_POOL_CONNECTIONS = Gauge(
+    'yamdb_db_pool_connections',
+    'Соединения пула по базе и состоянию: open, idle, in_use, max_size.',
+    ('alias', 'state'),
+    multiprocess_mode='livesum'
+)
+DB_POOL_WAITS = Counter(
+    'yamdb_db_pool_waits_total',
+    'Ожидания свободного соединения пула.',
+    ('alias',)
+)
+POOL_STATES = ('open', 'idle', 'in_use', 'max_size')
+
+
+def observe_request(request, response, metrics):
+    """Учитывает запрос по замерам api.instrumentation.RequestMetrics."""
+    view = metrics.view or 'none'
+    action = metrics.action or 'none'
+    REQUESTS.labels(
+        view, action, request.method, str(response.status_code)
+    ).inc()
+    LATENCY.labels(view, action).observe(metrics.total_time)
+    QUERIES.labels(view, action).observe(metrics.queries)
+
+
+def observe_cache_access(hit):
+    RESPONSE_CACHE.labels('hit' if hit else 'miss').inc()
+
+
+def observe_mail_queue(delta):
+    """Письмо поставлено в очередь (delta=1) или взято из неё (-1)."""
+    MAIL_QUEUE_DEPTH.inc(delta)
+
+
+def observe_mail_delivery(latency):
+    MAIL_LATENCY.observe(latency)
+
+
+def observe_pool(alias, stats, waited=False):
+    """Публикует состояние пула соединений из ConnectionPool.stats()."""
+    for state in POOL_STATES:
+        DB_POOL_CONNECTIONS.labels(alias, state).set(stats[state])
+    if waited:
+        DB_POOL_WAITS.labels(alias).inc()
+
+
+def get_registry():
+    if 'PROMETHEUS_MULTIPROC_DIR' not in os.environ:
+        return REGISTRY
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+
+def metrics_view(request):
+    """Метрики всех процессов gunicorn в текстовом формате Prometheus."""
+    if not settings.PROMETHEUS_METRICS:
+        raise Http404
+    return HttpResponse(
+        generate_latest(get_registry()), content_type=CONTENT_TYPE_LATEST
+    )
@@ -0,0 +1,218 @@
+import hashlib
+import json
+import logging
+import random
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.http import HttpResponse
+
+from api_yamdb.db_router import REPLICA_DB_ALIAS, RoutingState, routing_state
+
+from .instrumentation import RequestMetrics, request_metrics
+from .metrics import observe_request
+from .profiling import (REPORT, REQUESTED, SAMPLED, Profile, get_profile_mode,
+                        is_admin)
+
+logger = logging.getLogger(__name__)
+
+PINNED_KEY = 'db:pinned:{}'
+PINNED_COOKIE = 'db_pinned'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+REPLICA_VIEW_MODULES = ('api.views',)
+
+
+def get_pinned_key(request):
+    """
+    Ключ закрепления в кэше по токену клиента. Для анонимных клиентов
+    ключа нет: за прокси у них общий REMOTE_ADDR, и одна запись
+    закрепила бы за основной базой всех.
+    """
+    client = request.META.get('HTTP_AUTHORIZATION')
+    if client:
+        return PINNED_KEY.format(hashlib.md5(client.encode()).hexdigest())
+    return None
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Разрешает читать из реплики безопасные запросы к вьюсетам API.
+    После изменяющего запроса клиент на DB_REPLICA_PIN_SECONDS
+    закрепляется за основной базой, чтобы сразу видеть свои изменения,
+    которые ещё не дошли до реплики. Закрепление хранится в подписанной
+    cookie, которую клиент приносит в любой процесс, а для клиентов
+    с токеном ещё и в кэше — на случай, если cookie не сохраняются
+    (при общем бэкенде кэша). Анонимные клиенты закрепляются только
+    cookie. Базы, обслужившие
+    запрос, перечисляются в заголовке X-DB-Alias.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        state = RoutingState(DEFAULT_DB_ALIAS)
+        token = routing_state.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            routing_state.reset(token)
+        replica_enabled = REPLICA_DB_ALIAS in connections.databases
+        if replica_enabled and request.method not in SAFE_METHODS:
+            key = get_pinned_key(request)
+            if key is not None:
+                cache.set(key, True, settings.DB_REPLICA_PIN_SECONDS)
+            response.set_signed_cookie(
+                PINNED_COOKIE, '1', salt=PINNED_COOKIE,
+                max_age=settings.DB_REPLICA_PIN_SECONDS, httponly=True,
+                samesite='Lax'
+            )
+        if state.used:
+            response['X-DB-Alias'] = ','.join(sorted(state.used))
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        state = routing_state.get()
+        view_class = getattr(view_func, 'cls', None)
+        if (
+            state is not None
+            and REPLICA_DB_ALIAS in connections.databases
+            and request.method in SAFE_METHODS
+            and view_class is not None
+            and view_class.__module__ in REPLICA_VIEW_MODULES
+            and not self.is_pinned(request)
+        ):
+            state.read_alias = REPLICA_DB_ALIAS
+
+    def is_pinned(self, request):
+        # Подпись с отметкой времени: cookie старше
+        # DB_REPLICA_PIN_SECONDS не принимается, даже если клиент
+        # продлил её сам.
+        pinned = request.get_signed_cookie(
+            PINNED_COOKIE, default=None, salt=PINNED_COOKIE,
+            max_age=settings.DB_REPLICA_PIN_SECONDS
+        )
+        if pinned is not None:
+            return True
+        key = get_pinned_key(request)
+        return key is not None and bool(cache.get(key))
+
+
+class RequestMetricsMiddleware:
+    """
+    Замеряет запрос (см. api.instrumentation) и отдаёт результат
+    в заголовке Server-Timing. Запросы дольше SLOW_REQUEST_MS
+    пишутся в журнал одной строкой JSON. При
+    REQUEST_METRICS_DUPLICATES в журнал попадает и SQL, повторённый
+    за запрос DUPLICATE_QUERY_THRESHOLD раз и больше (признак N+1).
+    С PROMETHEUS_METRICS замеры идут и в метрики /metrics
+    (api.metrics). Если выключено и то и другое, middleware
+    не подключается.
+    """
+
+    def __init__(self, get_response):
+        if not (settings.REQUEST_METRICS or settings.PROMETHEUS_METRICS):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        metrics = RequestMetrics(
+            track_duplicates=settings.REQUEST_METRICS_DUPLICATES
+        )
+        token = request_metrics.set(metrics)
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(
+                        connection.execute_wrapper(metrics.record_query)
+                    )
+                response = self.get_response(request)
+        finally:
+            request_metrics.reset(token)
+        if settings.PROMETHEUS_METRICS:
+            observe_request(request, response, metrics)
+        if settings.REQUEST_METRICS:
+            response['Server-Timing'] = metrics.server_timing()
+            self.log(request, response, metrics)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        metrics = request_metrics.get()
+        if metrics is None:
+            return
+        view_class = getattr(view_func, 'cls', None)
+        metrics.view = (
+            view_class.__name__ if view_class else view_func.__name__
+        )
+        actions = getattr(view_func, 'actions', None)
+        if actions:
+            metrics.action = actions.get(request.method.lower())
+        if request.resolver_match is not None:
+            metrics.route = request.resolver_match.route
+
+    def log(self, request, response, metrics):
+        record = None
+        if metrics.total_time * 1000 >= settings.SLOW_REQUEST_MS:
+            record = self.make_record(request, response, metrics)
+            logger.warning('Медленный запрос: %s', json.dumps(record))
+        duplicates = metrics.duplicates(settings.DUPLICATE_QUERY_THRESHOLD)
+        if duplicates:
+            record = record or self.make_record(request, response, metrics)
+            record['duplicates'] = [
+                {'sql': sql, 'count': count}
+                for sql, count in duplicates.items()
+            ]
+            logger.warning(
+                'Повторяющиеся SQL-запросы: %s', json.dumps(record)
+            )
+
+    def make_record(self, request, response, metrics):
+        return {
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            **metrics.as_dict(),
+        }
+
+
+class ProfilingMiddleware:
+    """
+    Профилирует запрос (см. api.profiling), если об этом просит
+    администратор, а также выборочно. Ответ на запрос администратора
+    получает заголовок X-Profile-Id с именем сохранённого профиля,
+    а с X-Profile: report или ?profile=report вместо ответа приходит
+    отчёт: SQL с длительностью и самые долгие функции. Просьбы
+    остальных пользователей не учитываются. Без PROFILING middleware
+    не подключается.
+    """
+
+    def __init__(self, get_response):
+        if not settings.PROFILING:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        mode = get_profile_mode(request)
+        if mode and is_admin(request):
+            kind = REQUESTED
+        elif random.random() < settings.PROFILING_SAMPLE_RATE:
+            kind = SAMPLED
+        else:
+            return self.get_response(request)
+        profile = Profile(kind)
+        response = profile.run(self.get_response, request)
+        record = profile.as_dict(request, response)
+        profile.save(record)
+        if kind == SAMPLED:
+            return response
+        if mode == REPORT:
+            record['profile'] = profile.stats_text()
+            return HttpResponse(
+                json.dumps(record, ensure_ascii=False, default=str),
+                content_type='application/json'
+            )
+        response['X-Profile-Id'] = profile.name
+        return response
@@ -0,0 +1,103 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import LimitOffsetPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+INVALID_CURSOR_MESSAGE = 'Некорректный cursor.'
+
+
+class ReviewCommentPagination(LimitOffsetPagination):
+    """
+    Пагинация лент отзывов и комментариев.
+    По умолчанию работает через limit/offset. Если в запросе передан
+    параметр cursor (для первой страницы — пустой), включается
+    keyset-пагинация по (pub_date, id): страница выбирается условием
+    WHERE по позиции последней записи, поэтому её стоимость
+    не зависит от глубины прокрутки и COUNT(*) не выполняется.
+    """
+    cursor_query_param = 'cursor'
+    cursor_ordering = ('-pub_date', '-id')
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.use_cursor = self.cursor_query_param in request.query_params
+        if not self.use_cursor:
+            return super().paginate_queryset(queryset, request, view)
+        self.limit = self.get_limit(request)
+        if self.limit is None:
+            self.limit = self.default_limit
+        self.request = request
+        position, reverse = self.decode_cursor(request)
+        queryset = queryset.order_by(*self.cursor_ordering)
+        if position is not None:
+            pub_date, pk = position
+            if reverse:
+                queryset = queryset.filter(
+                    Q(pub_date__gt=pub_date) | Q(pub_date=pub_date, id__gt=pk)
+                ).reverse()
+            else:
+                queryset = queryset.filter(
+                    Q(pub_date__lt=pub_date) | Q(pub_date=pub_date, id__lt=pk)
+                )
+        results = list(queryset[:self.limit + 1])
+        has_more = len(results) > self.limit
+        results = results[:self.limit]
+        if reverse:
+            results.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = position is not None
+        self.page = results
+        return results
+
+    def get_paginated_response(self, data):
+        if not self.use_cursor:
+            return super().get_paginated_response(data)
+        return Response({
+            'next': self.get_cursor_link(self.has_next, -1, False),
+            'previous': self.get_cursor_link(self.has_previous, 0, True),
+            'results': data
+        })
+
+    def get_cursor_link(self, exists, index, reverse):
+        if not exists or not self.page:
+            return None
+        item = self.page[index]
+        if isinstance(item, dict):
+            # Строка values() из api.fast_serializers.RowListMixin.
+            pub_date, pk = item['pub_date'], item['id']
+        else:
+            pub_date, pk = item.pub_date, item.pk
+        url = remove_query_param(
+            self.request.build_absolute_uri(), self.offset_query_param
+        )
+        return replace_query_param(
+            url,
+            self.cursor_query_param,
+            self.encode_cursor(pub_date, pk, reverse)
+        )
+
+    def encode_cursor(self, pub_date, pk, reverse):
+        payload = json.dumps([pub_date.isoformat(), pk, int(reverse)])
+        return urlsafe_b64encode(payload.encode()).decode()
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            pub_date, pk, reverse = json.loads(
+                urlsafe_b64decode(encoded.encode()).decode()
+            )
+            pub_date = parse_datetime(pub_date)
+            pk = int(pk)
+        except (TypeError, ValueError):
+            raise NotFound(INVALID_CURSOR_MESSAGE)
+        if pub_date is None:
+            raise NotFound(INVALID_CURSOR_MESSAGE)
+        return (pub_date, pk), bool(reverse)
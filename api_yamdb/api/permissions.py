@@ -24,7 +24,7 @@ class IsStaffOrAuthorOrReadOnlyPermission(permissions.BasePermission):
     def has_object_permission(self, request, view, obj):
         if (
             request.method in permissions.SAFE_METHODS
-            or obj.author == request.user
+            or obj.author_id == request.user.id
         ):
             return True
         return (
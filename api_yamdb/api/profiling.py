@@ -0,0 +1,152 @@
+"""
+Профилирование запросов cProfile. Администратор включает его для своего
+запроса заголовком X-Profile или параметром ?profile=, кроме того,
+доля PROFILING_SAMPLE_RATE всех запросов профилируется выборочно.
+Для каждого профиля в PROFILING_DIR сохраняются файл .prof (формат
+pstats: snakeviz, flameprof, gprof2dot) и .json с запросом и выполненным
+SQL с длительностью. Каталоги requested и sampled работают как кольцевой
+буфер: в каждом хранятся PROFILING_MAX_FILES последних профилей.
+"""
+import cProfile
+import io
+import json
+import logging
+import os
+import pstats
+import time
+import uuid
+from contextlib import ExitStack, suppress
+
+from django.conf import settings
+from django.db import connections
+from rest_framework.exceptions import AuthenticationFailed
+
+from .authentication import ClaimsJWTAuthentication
+from .instrumentation import RequestMetrics
+
+logger = logging.getLogger(__name__)
+
+REQUESTED = 'requested'
+SAMPLED = 'sampled'
+PROFILE_HEADER = 'HTTP_X_PROFILE'
+PROFILE_PARAM = 'profile'
+# Значение X-Profile или ?profile=, при котором вместо ответа
+# возвращается отчёт о профиле.
+REPORT = 'report'
+REPORT_LINES = 40
+PROFILE_EXTENSIONS = ('.prof', '.json')
+
+
+def get_profile_mode(request):
+    """Значение заголовка X-Profile или параметра ?profile=."""
+    return (
+        request.META.get(PROFILE_HEADER)
+        or request.GET.get(PROFILE_PARAM)
+    )
+
+
+def is_admin(request):
+    """
+    Администратор ли автор запроса: по JWT, как в API,
+    или по сессии, как в админке.
+    """
+    if getattr(getattr(request, 'user', None), 'is_admin', False):
+        return True
+    try:
+        authenticated = ClaimsJWTAuthentication().authenticate(request)
+    except AuthenticationFailed:
+        return False
+    return authenticated is not None and authenticated[0].is_admin
+
+
+def trim_profiles(directory, keep):
+    """Удаляет из directory всё, кроме keep последних профилей."""
+    names = sorted({
+        os.path.splitext(filename)[0] for filename in os.listdir(directory)
+    })
+    for name in names[:max(len(names) - keep, 0)]:
+        for extension in PROFILE_EXTENSIONS:
+            # Профиль мог удалить параллельно другой процесс.
+            with suppress(FileNotFoundError):
+                os.remove(os.path.join(directory, name + extension))
+
+
+class Profile:
+    """
+    Профиль одного запроса. Параметры SQL сохраняются только
+    в профилях, запрошенных администратором: выборочно профилируются
+    и чужие запросы, например с кодами подтверждения.
+    """
+
+    def __init__(self, kind):
+        self.kind = kind
+        # Имена начинаются со времени, чтобы сортировка шла по возрасту.
+        self.name = f'{time.time_ns()}-{uuid.uuid4().hex[:8]}'
+        self.profiler = cProfile.Profile()
+        self.metrics = RequestMetrics(
+            track_duplicates=True, capture_queries=True
+        )
+
+    def run(self, get_response, request):
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(
+                    connection.execute_wrapper(self.metrics.record_query)
+                )
+            self.profiler.enable()
+            try:
+                return get_response(request)
+            finally:
+                self.profiler.disable()
+
+    def as_dict(self, request, response):
+        record = {
+            'name': self.name,
+            'kind': self.kind,
+            'method': request.method,
+            'path': request.get_full_path(),
+            'status': response.status_code,
+            **self.metrics.as_dict(),
+        }
+        if request.resolver_match is not None:
+            record['view'] = request.resolver_match.view_name
+            record['route'] = request.resolver_match.route
+        record['sql'] = [
+            {'sql': sql, 'ms': round(duration * 1000, 3)}
+            for sql, _, duration in self.metrics.captured
+        ]
+        if self.kind == REQUESTED:
+            for query, (_, params, _) in zip(
+                record['sql'], self.metrics.captured
+            ):
+                query['params'] = params
+        record['duplicates'] = [
+            {'sql': sql, 'count': count}
+            for sql, count in self.metrics.duplicates(
+                settings.DUPLICATE_QUERY_THRESHOLD
+            ).items()
+        ]
+        return record
+
+    def stats_text(self):
+        """Самые долгие функции с учётом вложенных вызовов."""
+        stream = io.StringIO()
+        stats = pstats.Stats(self.profiler, stream=stream)
+        stats.sort_stats('cumulative').print_stats(REPORT_LINES)
+        return stream.getvalue()
+
+    def save(self, record):
+        directory = os.path.join(settings.PROFILING_DIR, self.kind)
+        try:
+            os.makedirs(directory, exist_ok=True)
+            path = os.path.join(directory, self.name)
+            self.profiler.dump_stats(path + '.prof')
+            with open(path + '.json', 'w', encoding='utf-8') as file:
+                json.dump(
+                    record, file, ensure_ascii=False, indent=2, default=str
+                )
+            trim_profiles(directory, settings.PROFILING_MAX_FILES)
+        except OSError:
+            logger.warning(
+                'Не удалось сохранить профиль %s', self.name, exc_info=True
+            )
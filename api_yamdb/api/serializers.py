@@ -1,8 +1,8 @@
 from django.conf import settings
 from django.core.validators import MaxValueValidator, MinValueValidator
-from django.shortcuts import get_object_or_404
 from rest_framework import serializers
-from reviews.models import Category, Comment, CustomUser, Genre, Review, Title
+from reviews.models import (Category, Comment, CustomUser, Genre, Review,
+                            Title, TopTitle)
 from reviews.validators import (regex_validator, reserved_names_validator,
                                 validate_year)
 
@@ -97,6 +97,58 @@ class TitleSerializer(serializers.ModelSerializer):
         read_only_fields = fields
 
 
+class TitleStatsSerializer(serializers.ModelSerializer):
+    """Рейтинг произведения и число оценок каждого значения."""
+    rating = serializers.FloatField()
+    scores = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Title
+        fields = ('id', 'rating', 'rating_count', 'scores')
+        read_only_fields = fields
+
+    def get_scores(self, obj):
+        counts = {
+            score_count.score: score_count.count
+            for score_count in obj.score_counts.all()
+        }
+        return [
+            {'score': score, 'count': counts.get(score, 0)}
+            for score in range(settings.MIN_SCORE, settings.MAX_SCORE + 1)
+        ]
+
+
+class TitleWithStatsSerializer(TitleSerializer):
+    """Произведение вместе с распределением оценок."""
+    stats = TitleStatsSerializer(source='*')
+
+    class Meta(TitleSerializer.Meta):
+        fields = TitleSerializer.Meta.fields + ('stats',)
+        read_only_fields = fields
+
+
+class TopTitleSerializer(serializers.ModelSerializer):
+    """
+    Место произведения в рейтинге лучших. Рейтинг и число оценок —
+    сохранённые при пересборке, по которым расставлены места:
+    текущие значения произведения могут от них уже отличаться.
+    """
+    title = TitleSerializer()
+    rating = serializers.FloatField()
+
+    class Meta:
+        model = TopTitle
+        fields = ('position', 'rating', 'rating_count', 'title')
+        read_only_fields = fields
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        data['title']['rating'] = self.fields['title'].fields[
+            'rating'
+        ].to_representation(instance.rating)
+        return data
+
+
 class TitlePostPatchSerializer(serializers.ModelSerializer):
     """Десериализует данные модели Title."""
     category = serializers.SlugRelatedField(
@@ -143,18 +195,6 @@ class ReviewSerializer(serializers.ModelSerializer):
         model = Review
         fields = ('id', 'text', 'author', 'score', 'pub_date')
 
-    def validate(self, data):
-        request = self.context['request']
-        if request.method != 'POST':
-            return data
-        if Review.objects.filter(
-            title=get_object_or_404(
-                Title, pk=request.parser_context['kwargs'].get('title_id')
-            ), author=request.user
-        ).exists():
-            raise serializers.ValidationError('Вы уже оставили отзыв.')
-        return data
-
 
 class CommentSerializer(serializers.ModelSerializer):
     """Сериализует и десериализует данные модели Comment."""
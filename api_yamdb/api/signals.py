@@ -0,0 +1,51 @@
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from reviews.models import (Category, CustomUser, Genre, GenreTitle, Review,
+                            Title)
+from reviews.signals import data_changed, data_imported
+
+from .authentication import invalidate_claims
+from .cache import bump_generation
+
+CACHED_MODELS = (Category, Genre, GenreTitle, Review, Title)
+
+
+def invalidate_cached_responses(sender, **kwargs):
+    transaction.on_commit(lambda: bump_generation(sender))
+
+
+def invalidate_cached_title_genres(sender, action, **kwargs):
+    if action.startswith('post_'):
+        transaction.on_commit(lambda: bump_generation(GenreTitle))
+
+
+def invalidate_imported_responses(sender, **kwargs):
+    if sender in CACHED_MODELS:
+        bump_generation(sender)
+
+
+def invalidate_changed_responses(sender, **kwargs):
+    if sender in CACHED_MODELS:
+        transaction.on_commit(lambda: bump_generation(sender))
+
+
+def invalidate_changed_claims(sender, instance, created, **kwargs):
+    if not created and getattr(instance, '_claims', None) != (
+        instance.get_claims()
+    ):
+        invalidate_claims(instance.pk)
+    instance.remember_claims()
+
+
+def invalidate_deleted_claims(sender, instance, **kwargs):
+    invalidate_claims(instance.pk)
+
+
+for model in CACHED_MODELS:
+    post_save.connect(invalidate_cached_responses, sender=model)
+    post_delete.connect(invalidate_cached_responses, sender=model)
+m2m_changed.connect(invalidate_cached_title_genres, sender=Title.genre.through)
+data_imported.connect(invalidate_imported_responses)
+data_changed.connect(invalidate_changed_responses)
+post_save.connect(invalidate_changed_claims, sender=CustomUser)
+post_delete.connect(invalidate_deleted_claims, sender=CustomUser)
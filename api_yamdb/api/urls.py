@@ -1,9 +1,9 @@
 from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
-from .views import (CategoriesViewSet, CommentViewSet, GenresViewSet,
-                    GetTokenView, ReviewViewSet, SignUpView, TitlesViewSet,
-                    UserViewSet)
+from .views import (CategoriesViewSet, CommentViewSet, ExportView,
+                    GenresViewSet, GetTokenView, ReviewViewSet, SignUpView,
+                    TitlesViewSet, UserViewSet)
 
 router_v1 = DefaultRouter()
 router_v1.register(
@@ -44,4 +44,5 @@ registration_uls = [
 urlpatterns = [
     path('v1/', include(router_v1.urls)),
     path('v1/auth/', include(registration_uls)),
+    path('v1/export/', ExportView.as_view()),
 ]
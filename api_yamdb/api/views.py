@@ -1,24 +1,42 @@
 from django.conf import settings
 from django.contrib.auth.tokens import default_token_generator
-from django.core.mail import send_mail
-from django.db import IntegrityError
-from django.db.models import Avg
+from django.db import IntegrityError, transaction
+from django.db.models import Prefetch
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters, mixins, permissions, status, viewsets
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from rest_framework_simplejwt.tokens import RefreshToken
-from reviews.models import Category, CustomUser, Genre, Review, Title
+from reviews.deletion import (delete_category, delete_genre, delete_title,
+                              delete_user)
+from reviews.leaderboards import refresh_stale_leaderboard
+from reviews.models import (Category, CustomUser, Genre, GenreTitle, Review,
+                            Title, TopTitle)
 
-from .filters import TitlesFilter
+from .authentication import get_access_token
+from .cache import CachedListMixin, CachedRetrieveMixin
+from .conditional import ConditionalGetMixin
+from .export import EXPORT_TYPES, export_ndjson, parse_since
+from .fast_serializers import (CommentRowSerializer, ReviewRowSerializer,
+                               RowListMixin, TitleRowSerializer)
+from .filters import TitlesFilter, TitlesOrderingFilter
+from .instrumentation import SerializerTimingMixin, timed
+from .mail import send_mail_async
+from .pagination import ReviewCommentPagination
 from .permissions import (AdminPermission, IsAdminOrReadOnlyPermission,
                           IsStaffOrAuthorOrReadOnlyPermission)
 from .serializers import (AdminUserSerializer, CategorySerializer,
                           CommentSerializer, GenreSerializer, ReviewSerializer,
                           SignupSerializer, TitlePostPatchSerializer,
-                          TitleSerializer, TokenSerializer, UserSerializer)
+                          TitleSerializer, TitleStatsSerializer,
+                          TitleWithStatsSerializer, TokenSerializer,
+                          TopTitleSerializer, UserSerializer)
+
+# Жанры произведения в постоянном порядке, как в TitleRowSerializer.
+ORDERED_GENRES = Genre.objects.order_by('id')
 
 
 class SignUpView(APIView):
@@ -45,12 +63,11 @@ class SignUpView(APIView):
             )
         confirmation_code = default_token_generator.make_token(user)
         to_email = serializer.validated_data['email']
-        send_mail(
+        send_mail_async(
             'Вы зарегистрировались на сайте YaMDb',
             f'Ваш код подтверждения: {confirmation_code}.',
             settings.YAMDB_EMAIL,
             [to_email],
-            fail_silently=False,
         )
         return Response(serializer.validated_data, status=status.HTTP_200_OK)
 
@@ -69,8 +86,7 @@ class GetTokenView(APIView):
         user = get_object_or_404(CustomUser, username=username)
         confirmation_code = serializer.validated_data.get('confirmation_code')
         if default_token_generator.check_token(user, confirmation_code):
-            access_token = RefreshToken.for_user(user).access_token
-            data = {'token': str(access_token)}
+            data = {'token': str(get_access_token(user))}
             return Response(data, status=status.HTTP_201_CREATED)
         return Response(
             'Неверный код подтверждения.',
@@ -78,7 +94,38 @@ class GetTokenView(APIView):
         )
 
 
-class UserViewSet(viewsets.ModelViewSet):
+class ExportView(APIView):
+    """
+    Потоковая выгрузка произведений, отзывов и комментариев в NDJSON.
+    Параметры: types — через запятую из titles, reviews, comments;
+    since — только записи, изменённые начиная с этой даты.
+    """
+    http_method_names = ['get', ]
+    permission_classes = (AdminPermission,)
+
+    def get(self, request):
+        types = request.query_params.get('types')
+        types = types.split(',') if types else EXPORT_TYPES
+        if not set(types) <= set(EXPORT_TYPES):
+            return Response(
+                f'Допустимые значения types: {", ".join(EXPORT_TYPES)}.',
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        since = request.query_params.get('since')
+        try:
+            since = parse_since(since) if since else None
+        except ValueError:
+            return Response(
+                'Некорректная дата в параметре since.',
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        return StreamingHttpResponse(
+            export_ndjson(types, since),
+            content_type='application/x-ndjson'
+        )
+
+
+class UserViewSet(SerializerTimingMixin, viewsets.ModelViewSet):
     """
     Реализует операции с моделью CustomUser:
     - получения списка пользователей;
@@ -95,6 +142,9 @@ class UserViewSet(viewsets.ModelViewSet):
     search_fields = ('username',)
     lookup_field = 'username'
 
+    def perform_destroy(self, instance):
+        delete_user(instance)
+
     @action(
         ['GET', 'PATCH'],
         url_path='me',
@@ -102,12 +152,14 @@ class UserViewSet(viewsets.ModelViewSet):
         permission_classes=(permissions.IsAuthenticated,),
     )
     def me(self, request):
+        # request.user может быть собран из токена, профиль берём из базы.
+        user = get_object_or_404(CustomUser, pk=request.user.id)
         if request.method == 'GET':
             return Response(
-                UserSerializer(request.user).data, status=status.HTTP_200_OK
+                UserSerializer(user).data, status=status.HTTP_200_OK
             )
         serializer = UserSerializer(
-            request.user,
+            user,
             data=request.data,
             partial=True
         )
@@ -116,7 +168,14 @@ class UserViewSet(viewsets.ModelViewSet):
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
-class TitlesViewSet(viewsets.ModelViewSet):
+class TitlesViewSet(
+    ConditionalGetMixin,
+    CachedListMixin,
+    CachedRetrieveMixin,
+    RowListMixin,
+    SerializerTimingMixin,
+    viewsets.ModelViewSet
+):
     """
     Реализует следующие операции с моделью Title:
     — получение списка всех произведений;
@@ -125,22 +184,90 @@ class TitlesViewSet(viewsets.ModelViewSet):
     - обновление информации о произведении;
     - удаление произведения.
     """
-    queryset = Title.objects.all().annotate(rating=Avg('reviews__score'))
+    queryset = Title.objects.select_related(
+        'category'
+    ).prefetch_related(
+        Prefetch('genre', queryset=ORDERED_GENRES)
+    )
     permission_classes = (IsAdminOrReadOnlyPermission,)
-    filter_backends = (DjangoFilterBackend,)
+    filter_backends = (DjangoFilterBackend, TitlesOrderingFilter)
     filterset_class = TitlesFilter
-    ordering = ('rating', 'title')
+    cache_models = (Title, Genre, Category, GenreTitle, Review)
+    row_serializer_class = TitleRowSerializer
+
+    def with_stats(self):
+        return (
+            self.action == 'retrieve'
+            and self.request.query_params.get('stats') == 'true'
+        )
+
+    def get_queryset(self):
+        if self.action == 'stats':
+            return Title.objects.prefetch_related('score_counts')
+        if self.action == 'destroy':
+            return Title.objects.all()
+        if self.with_stats():
+            return self.queryset.prefetch_related('score_counts')
+        return super().get_queryset()
 
     def get_serializer_class(self):
         if self.action == 'create' or self.action == 'partial_update':
             return TitlePostPatchSerializer
+        if self.action == 'stats':
+            return TitleStatsSerializer
+        if self.with_stats():
+            return TitleWithStatsSerializer
         return TitleSerializer
 
+    def get_cache_query_params(self):
+        return super().get_cache_query_params() | {'stats'}
+
+    def perform_destroy(self, instance):
+        delete_title(instance)
+
+    @action(detail=True, methods=['get'])
+    def stats(self, request, *args, **kwargs):
+        """Рейтинг произведения и распределение оценок."""
+        return self.retrieve(request, *args, **kwargs)
+
+    @action(detail=False, methods=['get'])
+    def top(self, request):
+        """
+        Лучшие произведения: общий рейтинг или рейтинг жанра (?genre=)
+        либо категории (?category=), для неизвестного slug — 404.
+        Рейтинги хранятся в TopTitle и пересобираются не чаще
+        LEADERBOARD_REFRESH_INTERVAL секунд.
+        """
+        scope, slug = TopTitle.SCOPE_ALL, ''
+        for name, model in (
+            (TopTitle.SCOPE_GENRE, Genre), (TopTitle.SCOPE_CATEGORY, Category)
+        ):
+            if request.query_params.get(name):
+                scope, slug = name, request.query_params[name]
+                # Рейтинг пересобирается только для существующих жанров
+                # и категорий, а не для любого slug из запроса.
+                get_object_or_404(model, slug=slug)
+                break
+        refresh_stale_leaderboard(scope, slug)
+        queryset = TopTitle.objects.filter(
+            scope=scope, scope_slug=slug
+        ).select_related(
+            'title__category'
+        ).prefetch_related(
+            Prefetch('title__genre', queryset=ORDERED_GENRES)
+        )
+        page = self.paginate_queryset(queryset)
+        with timed('serialize'):
+            data = TopTitleSerializer(page, many=True).data
+        return self.get_paginated_response(data)
+
 
 class GenresCategoriesViewSet(
+    CachedListMixin,
     mixins.CreateModelMixin,
     mixins.ListModelMixin,
     mixins.DestroyModelMixin,
+    SerializerTimingMixin,
     viewsets.GenericViewSet
 ):
     """
@@ -161,6 +288,10 @@ class GenresViewSet(GenresCategoriesViewSet):
     """
     queryset = Genre.objects.all()
     serializer_class = GenreSerializer
+    cache_models = (Genre,)
+
+    def perform_destroy(self, instance):
+        delete_genre(instance)
 
 
 class CategoriesViewSet(GenresCategoriesViewSet):
@@ -172,9 +303,18 @@ class CategoriesViewSet(GenresCategoriesViewSet):
     """
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
+    cache_models = (Category,)
 
+    def perform_destroy(self, instance):
+        delete_category(instance)
 
-class ReviewViewSet(viewsets.ModelViewSet):
+
+class ReviewViewSet(
+    ConditionalGetMixin,
+    RowListMixin,
+    SerializerTimingMixin,
+    viewsets.ModelViewSet
+):
     """
     Реализует операции с моделью Review:
     — получение списка всех отзывов;
@@ -184,19 +324,49 @@ class ReviewViewSet(viewsets.ModelViewSet):
     — удаление отзыва.
     """
     serializer_class = ReviewSerializer
+    row_serializer_class = ReviewRowSerializer
     permission_classes = (IsStaffOrAuthorOrReadOnlyPermission,)
+    pagination_class = ReviewCommentPagination
 
     def get_title(self):
-        return get_object_or_404(Title, id=self.kwargs.get('title_id'))
+        # Вьюсет создаётся на каждый запрос, поэтому произведение
+        # ищется в базе один раз за запрос.
+        if not hasattr(self, '_title'):
+            self._title = get_object_or_404(
+                Title, id=self.kwargs.get('title_id')
+            )
+        return self._title
 
     def get_queryset(self):
-        return self.get_title().reviews.all()
+        return self.get_title().reviews.select_related('author')
+
+    def get_list_validators(self):
+        return self.get_feed_validators(self.get_title())
 
     def perform_create(self, serializer):
-        serializer.save(author=self.request.user, title=self.get_title())
+        # Повторный отзыв отсекает ограничение unique_review в базе,
+        # отдельный запрос нужен только после ошибки: по нему видно,
+        # что нарушено именно это ограничение.
+        title = self.get_title()
+        try:
+            with transaction.atomic():
+                serializer.save(author_id=self.request.user.id, title=title)
+        except IntegrityError:
+            if not Review.objects.filter(
+                author_id=self.request.user.id, title=title
+            ).exists():
+                raise
+            raise ValidationError(
+                {'non_field_errors': ['Вы уже оставили отзыв.']}
+            )
 
 
-class CommentViewSet(viewsets.ModelViewSet):
+class CommentViewSet(
+    ConditionalGetMixin,
+    RowListMixin,
+    SerializerTimingMixin,
+    viewsets.ModelViewSet
+):
     """
     Реализует операции с моделью Comment:
     — получение списка всех комментариев;
@@ -206,13 +376,28 @@ class CommentViewSet(viewsets.ModelViewSet):
     — удаление комментария.
     """
     serializer_class = CommentSerializer
+    row_serializer_class = CommentRowSerializer
     permission_classes = (IsStaffOrAuthorOrReadOnlyPermission,)
+    pagination_class = ReviewCommentPagination
 
     def get_review(self):
-        return get_object_or_404(Review, id=self.kwargs.get('review_id'))
+        # Одним запросом проверяется, что отзыв относится к произведению
+        # из адреса; результат запоминается до конца запроса.
+        if not hasattr(self, '_review'):
+            self._review = get_object_or_404(
+                Review,
+                id=self.kwargs.get('review_id'),
+                title_id=self.kwargs.get('titles_id')
+            )
+        return self._review
 
     def get_queryset(self):
-        return self.get_review().comments.all()
+        return self.get_review().comments.select_related('author')
+
+    def get_list_validators(self):
+        return self.get_feed_validators(self.get_review())
 
     def perform_create(self, serializer):
-        serializer.save(author=self.request.user, review=self.get_review())
+        serializer.save(
+            author_id=self.request.user.id, review=self.get_review()
+        )
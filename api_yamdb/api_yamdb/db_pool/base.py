@@ -0,0 +1,202 @@
+"""
+Бэкенд PostgreSQL с пулом соединений внутри процесса.
+Включается через DB_ENGINE=api_yamdb.db_pool, параметры пула задаются
+ключом POOL в настройках базы (см. settings.DATABASES).
+"""
+import os
+import threading
+import time
+
+import psycopg2
+from api.metrics import observe_pool
+from django.db import DatabaseError
+from django.db.backends.postgresql import base
+from psycopg2 import extensions
+
+POOL_DEFAULTS = {
+    # Максимум соединений в одном процессе gunicorn.
+    'MAX_SIZE': 10,
+    # Сколько секунд ждать свободного соединения, когда открыты все.
+    'TIMEOUT': 10,
+    # Соединение, простоявшее дольше, проверяется запросом перед выдачей.
+    'CHECK_AFTER': 30,
+    # Простаивающие дольше соединения закрываются.
+    'MAX_IDLE': 300,
+}
+
+
+class ConnectionPool:
+    """
+    Ограниченный пул соединений psycopg2, общий для потоков процесса.
+    Состояние пула публикуется в метрики при каждом изменении.
+    """
+
+    def __init__(self, max_size, timeout, check_after, max_idle,
+                 alias='default'):
+        self.alias = alias
+        self.max_size = max_size
+        self.timeout = timeout
+        self.check_after = check_after
+        self.max_idle = max_idle
+        self.idle = []
+        self.open = 0
+        self.waits = 0
+        self.condition = threading.Condition()
+
+    def getconn(self, connect):
+        deadline = time.monotonic() + self.timeout
+        with self.condition:
+            self.close_expired()
+            waited = False
+            while not self.idle and self.open >= self.max_size:
+                if not waited:
+                    self.waits += 1
+                    waited = True
+                    self.publish(waited=True)
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise DatabaseError(
+                        f'Нет свободных соединений в пуле '
+                        f'(максимум {self.max_size}).'
+                    )
+                self.condition.wait(remaining)
+            if self.idle:
+                connection, released = self.idle.pop()
+            else:
+                connection, released = None, None
+                self.open += 1
+            self.publish()
+        try:
+            if connection is not None and not self.is_healthy(
+                connection, released
+            ):
+                connection.close()
+                connection = None
+            if connection is None:
+                connection = connect()
+        except Exception:
+            self.discard()
+            raise
+        return connection
+
+    def putconn(self, connection):
+        status = connection.get_transaction_status()
+        if status in (
+            extensions.TRANSACTION_STATUS_INTRANS,
+            extensions.TRANSACTION_STATUS_INERROR,
+        ):
+            try:
+                connection.rollback()
+            except psycopg2.Error:
+                pass
+            status = connection.get_transaction_status()
+        if connection.closed or status != extensions.TRANSACTION_STATUS_IDLE:
+            connection.close()
+            self.discard()
+            return
+        with self.condition:
+            # Последнее возвращённое соединение выдаётся первым,
+            # лишние дольше простаивают и закрываются по MAX_IDLE.
+            self.idle.append((connection, time.monotonic()))
+            self.condition.notify()
+            self.publish()
+
+    def discard(self):
+        with self.condition:
+            self.open -= 1
+            self.condition.notify()
+            self.publish()
+
+    def is_healthy(self, connection, released):
+        if connection.closed:
+            return False
+        if time.monotonic() - released < self.check_after:
+            return True
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT 1')
+            if not connection.autocommit:
+                connection.rollback()
+        except psycopg2.Error:
+            return False
+        return True
+
+    def close_expired(self):
+        expired_before = time.monotonic() - self.max_idle
+        while self.idle and self.idle[0][1] < expired_before:
+            connection, _ = self.idle.pop(0)
+            connection.close()
+            self.open -= 1
+
+    def publish(self, waited=False):
+        observe_pool(self.alias, self.stats(), waited)
+
+    def stats(self):
+        with self.condition:
+            return {
+                'open': self.open,
+                'idle': len(self.idle),
+                'in_use': self.open - len(self.idle),
+                'waits': self.waits,
+                'max_size': self.max_size,
+            }
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+_pools_pid = None
+
+
+def get_pool(alias, settings_dict):
+    global _pools_pid
+    with _pools_lock:
+        # Соединения родительского процесса не переиспользуются после fork.
+        if _pools_pid != os.getpid():
+            _pools.clear()
+            _pools_pid = os.getpid()
+        if alias not in _pools:
+            options = {**POOL_DEFAULTS, **settings_dict.get('POOL', {})}
+            _pools[alias] = ConnectionPool(
+                max_size=int(options['MAX_SIZE']),
+                timeout=float(options['TIMEOUT']),
+                check_after=float(options['CHECK_AFTER']),
+                max_idle=float(options['MAX_IDLE']),
+                alias=alias,
+            )
+        return _pools[alias]
+
+
+def pool_stats():
+    """Открытые, простаивающие соединения и ожидания по каждому пулу."""
+    with _pools_lock:
+        pools = dict(_pools) if _pools_pid == os.getpid() else {}
+    return {alias: pool.stats() for alias, pool in pools.items()}
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """
+    Берёт соединение из пула вместо нового подключения и возвращает
+    его в пул вместо закрытия. Обычно используется с CONN_MAX_AGE = 0:
+    соединение возвращается в конце каждого запроса и достаётся
+    другому потоку.
+    """
+
+    @property
+    def pool(self):
+        return get_pool(self.alias, self.settings_dict)
+
+    def get_new_connection(self, conn_params):
+        connection = self.pool.getconn(
+            lambda: super(DatabaseWrapper, self).get_new_connection(
+                conn_params
+            )
+        )
+        self.isolation_level = self.settings_dict['OPTIONS'].get(
+            'isolation_level', connection.isolation_level
+        )
+        return connection
+
+    def _close(self):
+        if self.connection is not None:
+            with self.wrap_database_errors:
+                self.pool.putconn(self.connection)
@@ -0,0 +1,48 @@
+from contextvars import ContextVar
+
+from django.db import DEFAULT_DB_ALIAS, connections
+
+REPLICA_DB_ALIAS = 'replica'
+
+
+class RoutingState:
+    """Куда читать в текущем запросе и какие базы он использовал."""
+
+    def __init__(self, read_alias):
+        self.read_alias = read_alias
+        self.used = set()
+
+
+routing_state = ContextVar('routing_state', default=None)
+
+
+class ReplicaRouter:
+    """
+    Направляет чтение в реплику, если middleware разрешило это
+    для текущего запроса; запись и всё остальное — в основную базу.
+    Внутри транзакции чтение тоже идёт в основную базу,
+    чтобы видеть только что записанные в ней данные.
+    """
+
+    def db_for_read(self, model, **hints):
+        state = routing_state.get()
+        if state is None:
+            return DEFAULT_DB_ALIAS
+        alias = state.read_alias
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            alias = DEFAULT_DB_ALIAS
+        state.used.add(alias)
+        return alias
+
+    def db_for_write(self, model, **hints):
+        state = routing_state.get()
+        if state is not None:
+            state.used.add(DEFAULT_DB_ALIAS)
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Реплика содержит те же данные, что и основная база.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
@@ -27,11 +27,12 @@ INSTALLED_APPS = [
     'rest_framework_simplejwt',
     'rest_framework',
     'django_filters',
-    'reviews',
-    'api',
+    'reviews.apps.ReviewsConfig',
+    'api.apps.ApiConfig',
 ]
 
 MIDDLEWARE = [
+    'api.middleware.RequestMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -39,6 +40,8 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'api.middleware.ProfilingMiddleware',
+    'api.middleware.ReplicaRoutingMiddleware',
 ]
 
 ROOT_URLCONF = 'api_yamdb.urls'
@@ -70,6 +73,36 @@ DATABASES = {
         'PASSWORD': os.getenv('POSTGRES_PASSWORD', default='Elvenfoxes2401'),
         'HOST': os.getenv('DB_HOST', default='db'),
         'PORT': os.getenv('DB_PORT', default='5432'),
+        # С пулом (DB_ENGINE=api_yamdb.db_pool) ставьте 0: соединение
+        # возвращается в пул в конце каждого запроса.
+        'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', default=60)),
+        'POOL': {
+            'MAX_SIZE': int(os.getenv('DB_POOL_MAX_SIZE', default=10)),
+            'TIMEOUT': float(os.getenv('DB_POOL_TIMEOUT', default=10)),
+            'CHECK_AFTER': float(os.getenv('DB_POOL_CHECK_AFTER', default=30)),
+            'MAX_IDLE': float(os.getenv('DB_POOL_MAX_IDLE', default=300)),
+        },
+    },
+}
+
+# Реплика для чтения включается, если задан её хост или имя базы.
+if os.getenv('DB_REPLICA_HOST') or os.getenv('DB_REPLICA_NAME'):
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'NAME': os.getenv('DB_REPLICA_NAME', default=DATABASES['default']['NAME']),
+        'HOST': os.getenv('DB_REPLICA_HOST', default=DATABASES['default']['HOST']),
+        'PORT': os.getenv('DB_REPLICA_PORT', default=DATABASES['default']['PORT']),
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_ROUTERS = ['api_yamdb.db_router.ReplicaRouter']
+# Сколько секунд после записи клиент читает из основной базы.
+DB_REPLICA_PIN_SECONDS = int(os.getenv('DB_REPLICA_PIN_SECONDS', default=10))
+
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv('CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv('CACHE_LOCATION', default=''),
     },
 }
 
@@ -115,10 +148,14 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.IsAuthenticated',
     ],
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'api.authentication.ClaimsJWTAuthentication',
     ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.LimitOffsetPagination',
-    'PAGE_SIZE': 10
+    'PAGE_SIZE': 10,
+    'DEFAULT_RENDERER_CLASSES': [
+        'api.instrumentation.TimedJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
 }
 
 SIMPLE_JWT = {
@@ -126,6 +163,23 @@ SIMPLE_JWT = {
     'AUTH_HEADER_TYPES': ('Bearer',),
 }
 
+# Сколько проверенных токенов помнит каждый процесс.
+JWT_TOKEN_CACHE_SIZE = int(os.getenv('JWT_TOKEN_CACHE_SIZE', default=10000))
+
+# Сколько секунд кэшируется время изменения прав пользователя
+# (api/authentication.py). Кэш в памяти процесса не узнаёт о сбросе
+# из других процессов, поэтому с ним время хранится недолго: смена прав
+# в другом процессе действует не позже чем через столько секунд.
+PROCESS_LOCAL_CACHES = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+JWT_CLAIMS_CACHE_TIMEOUT = int(os.getenv(
+    'JWT_CLAIMS_CACHE_TIMEOUT',
+    default=30 if CACHES['default']['BACKEND'] in PROCESS_LOCAL_CACHES
+    else 3600
+))
+
 DEFAULT_AUTO_FIELD = 'django.db.models.AutoField'
 
 SILENCED_SYSTEM_CHECKS = ['models.E006']
@@ -140,3 +194,51 @@ MIN_SCORE = 1
 MAX_SCORE = 10
 
 RESERVED_USERNAMES = ['me', 'admin', 'moderator']
+
+RESPONSE_CACHE_TIMEOUT = int(os.getenv('RESPONSE_CACHE_TIMEOUT', default=60))
+
+# Фоновая отправка писем (api/mail.py).
+MAIL_WORKERS = int(os.getenv('MAIL_WORKERS', default=2))
+MAIL_QUEUE_SIZE = int(os.getenv('MAIL_QUEUE_SIZE', default=1000))
+MAIL_RETRIES = int(os.getenv('MAIL_RETRIES', default=3))
+MAIL_RETRY_DELAY = float(os.getenv('MAIL_RETRY_DELAY', default=1))
+MAIL_IDLE_TIMEOUT = float(os.getenv('MAIL_IDLE_TIMEOUT', default=30))
+
+# Рейтинги лучших произведений (/api/v1/titles/top/): размер, минимум
+# отзывов и сколько секунд рейтинг может отставать от отзывов.
+LEADERBOARD_SIZE = int(os.getenv('LEADERBOARD_SIZE', default=100))
+LEADERBOARD_MIN_REVIEWS = int(
+    os.getenv('LEADERBOARD_MIN_REVIEWS', default=3)
+)
+LEADERBOARD_REFRESH_INTERVAL = int(
+    os.getenv('LEADERBOARD_REFRESH_INTERVAL', default=300)
+)
+
+# Замеры запросов (api/instrumentation.py): заголовок Server-Timing,
+# журнал медленных запросов и поиск повторяющегося SQL (N+1).
+REQUEST_METRICS = os.getenv('REQUEST_METRICS', default='False') == 'True'
+SLOW_REQUEST_MS = float(os.getenv('SLOW_REQUEST_MS', default=500))
+REQUEST_METRICS_DUPLICATES = os.getenv(
+    'REQUEST_METRICS_DUPLICATES', default=str(DEBUG)
+) == 'True'
+DUPLICATE_QUERY_THRESHOLD = int(
+    os.getenv('DUPLICATE_QUERY_THRESHOLD', default=3)
+)
+
+# Метрики Prometheus на /metrics (api/metrics.py). Для нескольких
+# процессов gunicorn задайте каталог PROMETHEUS_MULTIPROC_DIR.
+PROMETHEUS_METRICS = (
+    os.getenv('PROMETHEUS_METRICS', default='False') == 'True'
+)
+
+# Профилирование запросов (api/profiling.py): по заголовку X-Profile
+# или ?profile= от администратора и выборочно для доли
+# PROFILING_SAMPLE_RATE запросов. В каталоге PROFILING_DIR хранится
+# не больше PROFILING_MAX_FILES последних профилей каждого вида.
+PROFILING = os.getenv('PROFILING', default='False') == 'True'
+PROFILING_SAMPLE_RATE = float(os.getenv('PROFILING_SAMPLE_RATE', default=0))
+PROFILING_DIR = os.getenv('PROFILING_DIR', default='/tmp/yamdb-profiles')
+PROFILING_MAX_FILES = int(os.getenv('PROFILING_MAX_FILES', default=50))
+
+# До скольких строк админка считает записи в списке (reviews/admin.py).
+ADMIN_COUNT_LIMIT = int(os.getenv('ADMIN_COUNT_LIMIT', default=10000))
@@ -0,0 +1,22 @@
+"""
+Настройки gunicorn. Процессы пишут метрики Prometheus в каталог
+PROMETHEUS_MULTIPROC_DIR (см. api/metrics.py): при запуске сервера
+каталог очищается от файлов прошлого запуска, а файлы завершившихся
+процессов помечаются, чтобы их счётчики не терялись, а значения
+исчезнувших процессов не учитывались в текущих.
+"""
+import os
+import shutil
+
+
+def on_starting(server):
+    path = os.environ.get('PROMETHEUS_MULTIPROC_DIR')
+    if path:
+        shutil.rmtree(path, ignore_errors=True)
+        os.makedirs(path)
+
+
+def child_exit(server, worker):
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
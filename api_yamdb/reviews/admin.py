@@ -1,13 +1,53 @@
+from django.conf import settings
 from django.contrib import admin
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
 
 from .models import (Category, Comment, CustomUser, Genre, GenreTitle, Review,
                      Title)
+from .search import search_titles
+
+
+class ApproximateCountPaginator(Paginator):
+    """
+    Paginator для больших таблиц. Строки без фильтров в PostgreSQL
+    считаются по статистике таблицы, остальные — не дальше
+    ADMIN_COUNT_LIMIT строк: страницы после предела открываются
+    уточнением поиска или фильтров.
+    """
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        connection = connections[queryset.db]
+        if not queryset.query.where and connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    'SELECT reltuples FROM pg_class WHERE relname = %s',
+                    [queryset.model._meta.db_table]
+                )
+                row = cursor.fetchone()
+            # Оценка маленьких таблиц неточна, их проще посчитать.
+            if row and row[0] > settings.ADMIN_COUNT_LIMIT:
+                return int(row[0])
+        return queryset[:settings.ADMIN_COUNT_LIMIT].count()
+
+
+class LargeTableAdmin(admin.ModelAdmin):
+    """
+    Список без полного COUNT по таблице: число строк приблизительное,
+    а общее число без фильтров не показывается.
+    """
+    paginator = ApproximateCountPaginator
+    show_full_result_count = False
 
 
 @admin.register(CustomUser)
-class UserAdmin(admin.ModelAdmin):
+class UserAdmin(LargeTableAdmin):
     list_display = ('username', 'email', 'role')
-    search_fields = ('username', 'email', 'role', 'bio')
+    # Поиск по префиксу (^) вместо поиска подстроки по всей таблице.
+    search_fields = ('^username', '^email')
     list_filter = ('role',)
 
 
@@ -24,26 +64,45 @@ class GenreAdmin(admin.ModelAdmin):
 
 
 @admin.register(Title)
-class TitleAdmin(admin.ModelAdmin):
+class TitleAdmin(LargeTableAdmin):
     list_display = ('name', 'year', 'category')
-    search_fields = ('name', 'category__name', 'description')
+    list_select_related = ('category',)
+    search_fields = ('name',)
     list_filter = ('year', 'category')
+    autocomplete_fields = ('category',)
+    readonly_fields = ('rating', 'rating_count')
+    # Порядок по индексу title_name_idx.
+    ordering = ('name', 'id')
+
+    def get_search_results(self, request, queryset, search_term):
+        """Поиск по полнотекстовому индексу, как ?search= в API."""
+        if not search_term:
+            return queryset, False
+        return search_titles(queryset, search_term), False
 
 
 @admin.register(GenreTitle)
-class GenreTitleAdmin(admin.ModelAdmin):
-    pass
+class GenreTitleAdmin(LargeTableAdmin):
+    list_display = ('genre', 'title')
+    list_select_related = ('genre', 'title')
+    autocomplete_fields = ('genre', 'title')
 
 
 @admin.register(Review)
-class ReviewAdmin(admin.ModelAdmin):
+class ReviewAdmin(LargeTableAdmin):
     list_display = ('author', 'score', 'title')
-    search_fields = ('text', 'title__name')
-    list_filter = ('author', 'score', )
+    list_select_related = ('author', 'title')
+    search_fields = ('^author__username',)
+    list_filter = ('score', )
+    autocomplete_fields = ('author', 'title')
+    # Порядок по первичному ключу: индекса по одной pub_date нет.
+    ordering = ('-id',)
 
 
 @admin.register(Comment)
-class CommentAdmin(admin.ModelAdmin):
+class CommentAdmin(LargeTableAdmin):
     list_display = ('author', 'review', )
-    list_filter = ('author', )
-    search_fields = ('review__text', 'text')
+    list_select_related = ('author', 'review')
+    search_fields = ('^author__username',)
+    autocomplete_fields = ('author', 'review')
+    ordering = ('-id',)
@@ -0,0 +1,96 @@
+"""
+Удаление произведений, пользователей, категорий и жанров набором
+SQL-запросов. Обычный delete() загружает в память все зависимые
+отзывы и комментарии, чтобы отправить по ним сигналы, а связанные
+произведения категории обнуляет пачками по id. Здесь зависимые строки
+удаляются и обновляются запросами по условию, а то, что делали
+сигналы, — пересчёт рейтингов, дата изменения произведений, сброс
+кэша ответов — выполняется явно. Удаление идёт в одной транзакции:
+до её фиксации другие запросы видят данные целиком, а после — ни одной
+удалённой строки.
+"""
+from django.core.cache import cache
+from django.db import router, transaction
+from django.db.models import Q
+
+from .functions import Now
+from .leaderboards import REFRESHED_KEY, lock_leaderboard
+from .models import Comment, GenreTitle, Review, Title, TopTitle
+from .ratings import subtract_reviews
+from .signals import data_changed
+
+
+def raw_delete(queryset):
+    """Удаляет строки queryset одним DELETE, без загрузки и сигналов."""
+    deleted = queryset._raw_delete(router.db_for_write(queryset.model))
+    if deleted:
+        data_changed.send(sender=queryset.model)
+    return deleted
+
+
+def expire_leaderboards(top_titles):
+    """Рейтинги лучших с этими местами пересоберутся при первом запросе."""
+    keys = {
+        REFRESHED_KEY.format(scope, slug)
+        for scope, slug in top_titles.values_list('scope', 'scope_slug')
+    }
+    transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def delete_title(title):
+    """Удаляет произведение с отзывами, комментариями и местами в рейтингах."""
+    with transaction.atomic():
+        expire_leaderboards(TopTitle.objects.filter(title=title))
+        raw_delete(Comment.objects.filter(review__title=title))
+        raw_delete(Review.objects.filter(title=title))
+        raw_delete(GenreTitle.objects.filter(title=title))
+        title.delete()
+
+
+def delete_user(user):
+    """
+    Удаляет пользователя с его отзывами и комментариями, а также
+    комментариями к его отзывам. Оценки пользователя вычитаются
+    из рейтингов произведений до удаления отзывов.
+    """
+    with transaction.atomic():
+        reviews = Review.objects.filter(author=user)
+        subtract_reviews(reviews)
+        Review.objects.filter(comments__author=user).exclude(
+            author=user
+        ).update(updated=Now())
+        raw_delete(Comment.objects.filter(
+            Q(author=user) | Q(review__author=user)
+        ))
+        raw_delete(reviews)
+        user.delete()
+
+
+def delete_category(category):
+    """Удаляет категорию, одним UPDATE убирая её у произведений."""
+    with transaction.atomic():
+        if Title.objects.filter(category=category).update(
+            category=None, updated=Now()
+        ):
+            data_changed.send(sender=Title)
+        lock_leaderboard(TopTitle.SCOPE_CATEGORY, category.slug)
+        top_titles = TopTitle.objects.filter(
+            scope=TopTitle.SCOPE_CATEGORY, scope_slug=category.slug
+        )
+        expire_leaderboards(top_titles)
+        top_titles.delete()
+        category.delete()
+
+
+def delete_genre(genre):
+    """Удаляет жанр и одним DELETE — его связи с произведениями."""
+    with transaction.atomic():
+        Title.objects.filter(genre=genre).update(updated=Now())
+        raw_delete(GenreTitle.objects.filter(genre=genre))
+        lock_leaderboard(TopTitle.SCOPE_GENRE, genre.slug)
+        top_titles = TopTitle.objects.filter(
+            scope=TopTitle.SCOPE_GENRE, scope_slug=genre.slug
+        )
+        expire_leaderboards(top_titles)
+        top_titles.delete()
+        genre.delete()
@@ -0,0 +1,19 @@
+from django.db.models import functions
+
+
+class Now(functions.Now):
+    """
+    Текущее время базы данных. В SQLite Django 2.2 берёт
+    CURRENT_TIMESTAMP с точностью до секунды, а поле updated служит
+    версией лент отзывов и комментариев для ETag, поэтому здесь,
+    как в новых версиях Django, время берётся с долями секунды.
+    """
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        return self.as_sql(
+            compiler, connection,
+            # %% дважды: шаблон и параметры запроса подставляются
+            # через % по очереди.
+            template="STRFTIME('%%%%Y-%%%%m-%%%%d %%%%H:%%%%M:%%%%f', 'NOW')",
+            **extra_context
+        )
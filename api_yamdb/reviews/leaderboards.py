@@ -0,0 +1,112 @@
+import zlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections, router, transaction
+
+from .models import Category, Genre, Title, TopTitle
+
+REFRESHED_KEY = 'leaderboard:refreshed:{}:{}'
+# Первый ключ advisory-блокировок PostgreSQL для рейтингов.
+LOCK_NAMESPACE = 7301
+
+SCOPE_FILTERS = {
+    TopTitle.SCOPE_ALL: None,
+    TopTitle.SCOPE_GENRE: 'genre__slug',
+    TopTitle.SCOPE_CATEGORY: 'category__slug',
+}
+
+
+def get_lock_key(scope, slug):
+    """Второй ключ блокировки рейтинга: crc32 как знаковое int4."""
+    key = zlib.crc32(f'{scope}:{slug}'.encode())
+    return key - 2 ** 32 if key >= 2 ** 31 else key
+
+
+def lock_leaderboard(scope, slug=''):
+    """
+    Блокирует рейтинг до конца текущей транзакции, чтобы пересборки
+    из разных процессов шли по очереди: иначе вторая вставит места,
+    которых ещё не видит удалёнными, и нарушит
+    unique_top_title_position. В PostgreSQL это advisory-блокировка;
+    SQLite и так выполняет записывающие транзакции по одной.
+    """
+    connection = connections[router.db_for_write(TopTitle)]
+    if connection.vendor != 'postgresql':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT pg_advisory_xact_lock(%s, %s)',
+            [LOCK_NAMESPACE, get_lock_key(scope, slug)]
+        )
+
+
+def refresh_leaderboard(scope, slug=''):
+    """
+    Пересобирает рейтинг лучших произведений: берёт не больше
+    LEADERBOARD_SIZE произведений с LEADERBOARD_MIN_REVIEWS отзывами
+    и больше по сохранённому в Title рейтингу. Возвращает число мест.
+    """
+    titles = Title.objects.filter(
+        rating_count__gte=settings.LEADERBOARD_MIN_REVIEWS
+    )
+    field = SCOPE_FILTERS[scope]
+    if field is not None:
+        titles = titles.filter(**{field: slug})
+    rows = titles.order_by('-rating', '-rating_count', 'id').values_list(
+        'id', 'rating', 'rating_count'
+    )[:settings.LEADERBOARD_SIZE]
+    with transaction.atomic():
+        lock_leaderboard(scope, slug)
+        TopTitle.objects.filter(scope=scope, scope_slug=slug).delete()
+        created = TopTitle.objects.bulk_create(
+            TopTitle(
+                scope=scope, scope_slug=slug, position=position,
+                title_id=title_id, rating=rating, rating_count=rating_count
+            )
+            for position, (title_id, rating, rating_count)
+            in enumerate(rows, start=1)
+        )
+    cache.set(
+        REFRESHED_KEY.format(scope, slug), True,
+        settings.LEADERBOARD_REFRESH_INTERVAL
+    )
+    return len(created)
+
+
+def refresh_stale_leaderboard(scope, slug=''):
+    """
+    Пересобирает рейтинг, если он обновлялся больше
+    LEADERBOARD_REFRESH_INTERVAL секунд назад.
+    """
+    # add() ставит отметку, только если её нет: одновременные запросы
+    # одного процесса (или с общим кэшем) не пересобирают рейтинг
+    # повторно. Пересборки из разных процессов упорядочивает
+    # lock_leaderboard.
+    if cache.add(
+        REFRESHED_KEY.format(scope, slug), True,
+        settings.LEADERBOARD_REFRESH_INTERVAL
+    ):
+        refresh_leaderboard(scope, slug)
+
+
+def refresh_leaderboards():
+    """Пересобирает общий рейтинг и рейтинги всех жанров и категорий."""
+    scopes = {
+        TopTitle.SCOPE_ALL: [''],
+        TopTitle.SCOPE_GENRE: list(
+            Genre.objects.values_list('slug', flat=True)
+        ),
+        TopTitle.SCOPE_CATEGORY: list(
+            Category.objects.values_list('slug', flat=True)
+        ),
+    }
+    refreshed = 0
+    for scope, slugs in scopes.items():
+        # Рейтинги удалённых жанров и категорий больше не нужны.
+        TopTitle.objects.filter(scope=scope).exclude(
+            scope_slug__in=slugs
+        ).delete()
+        for slug in slugs:
+            refreshed += refresh_leaderboard(scope, slug)
+    return refreshed
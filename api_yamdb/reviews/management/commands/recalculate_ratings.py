@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from reviews.ratings import recalculate_ratings, recalculate_score_counts
+
+
+class Command(BaseCommand):
+    help = (
+        'Пересчитывает рейтинги и распределения оценок всех произведений '
+        'по их отзывам.'
+    )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            updated = recalculate_ratings()
+            score_counts = recalculate_score_counts()
+        self.stdout.write(self.style.SUCCESS(
+            f'Пересчитано произведений: {updated}, '
+            f'строк распределения оценок: {score_counts}.'
+        ))
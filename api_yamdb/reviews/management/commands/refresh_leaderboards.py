@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+from reviews.leaderboards import refresh_leaderboards
+
+
+class Command(BaseCommand):
+    help = (
+        'Пересобирает рейтинги лучших произведений: общий, '
+        'по жанрам и по категориям.'
+    )
+
+    def handle(self, *args, **options):
+        positions = refresh_leaderboards()
+        self.stdout.write(
+            self.style.SUCCESS(f'Мест в рейтингах: {positions}.')
+        )
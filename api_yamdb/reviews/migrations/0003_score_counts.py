@@ -0,0 +1,54 @@
+# Generated by Django 2.2.16 on 2026-10-17 07:46
+
+from itertools import islice
+
+from django.db import migrations, models
+from django.db.models import Count
+import django.db.models.deletion
+
+
+def fill_score_counts(apps, schema_editor):
+    Review = apps.get_model('reviews', 'Review')
+    ScoreCount = apps.get_model('reviews', 'ScoreCount')
+    rows = Review.objects.order_by().values('title_id', 'score').annotate(
+        total=Count('pk')
+    ).iterator()
+    while True:
+        batch = [
+            ScoreCount(
+                title_id=row['title_id'], score=row['score'],
+                count=row['total']
+            )
+            for row in islice(rows, 5000)
+        ]
+        if not batch:
+            break
+        ScoreCount.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0002_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScoreCount',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.PositiveSmallIntegerField(verbose_name='Оценка')),
+                ('count', models.PositiveIntegerField(default=0, verbose_name='Количество оценок')),
+                ('title', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='score_counts', to='reviews.Title', verbose_name='Произведение')),
+            ],
+            options={
+                'verbose_name': 'Распределение оценок',
+                'verbose_name_plural': 'Распределения оценок',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='scorecount',
+            constraint=models.UniqueConstraint(fields=('title', 'score'), name='unique_title_score'),
+        ),
+        migrations.RunPython(fill_score_counts, migrations.RunPython.noop),
+    ]
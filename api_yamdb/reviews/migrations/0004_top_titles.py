@@ -0,0 +1,35 @@
+# Generated by Django 2.2.16 on 2026-10-17 07:49
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0003_score_counts'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TopTitle',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('scope', models.CharField(choices=[('all', 'Все произведения'), ('genre', 'Жанр'), ('category', 'Категория')], max_length=16, verbose_name='Рейтинг')),
+                ('scope_slug', models.SlugField(blank=True, db_index=False, verbose_name='Жанр или категория')),
+                ('position', models.PositiveIntegerField(verbose_name='Место')),
+                ('rating', models.FloatField(verbose_name='Рейтинг произведения')),
+                ('rating_count', models.PositiveIntegerField(verbose_name='Количество оценок')),
+                ('title', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='reviews.Title', verbose_name='Произведение')),
+            ],
+            options={
+                'verbose_name': 'Место в рейтинге',
+                'verbose_name_plural': 'Рейтинги лучших произведений',
+                'ordering': ('scope', 'scope_slug', 'position'),
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='toptitle',
+            constraint=models.UniqueConstraint(fields=('scope', 'scope_slug', 'position'), name='unique_top_title_position'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 2.2.16 on 2026-10-17 07:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0004_top_titles'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='title',
+            name='title_name_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='title',
+            name='title_year_idx',
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['name', 'id'], name='title_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['year', 'id'], name='title_year_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['rating', 'id'], name='title_rating_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 2.2.16 on 2026-10-17 08:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0005_title_ordering_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='customuser',
+            name='claims_changed',
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name='Дата изменения прав'),
+        ),
+    ]
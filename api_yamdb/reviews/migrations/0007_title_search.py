@@ -0,0 +1,86 @@
+from django.db import migrations
+
+
+class VendorRunSQL(migrations.RunSQL):
+    """RunSQL, который выполняется только в базе vendor."""
+
+    def __init__(self, vendor, *args, **kwargs):
+        self.vendor = vendor
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, args, kwargs = super().deconstruct()
+        return name, [self.vendor, *args], kwargs
+
+    def database_forwards(self, app_label, schema_editor, from_state,
+                          to_state):
+        if schema_editor.connection.vendor == self.vendor:
+            super().database_forwards(
+                app_label, schema_editor, from_state, to_state
+            )
+
+    def database_backwards(self, app_label, schema_editor, from_state,
+                           to_state):
+        if schema_editor.connection.vendor == self.vendor:
+            super().database_backwards(
+                app_label, schema_editor, from_state, to_state
+            )
+
+
+# Раньше индекс создавался после каждого migrate (reviews.search),
+# поэтому он может уже существовать.
+POSTGRESQL_INDEX = (
+    'CREATE INDEX IF NOT EXISTS reviews_title_search_idx '
+    'ON reviews_title USING gin (('
+    "setweight(to_tsvector('russian', "
+    "coalesce(reviews_title.name, '')), 'A') || "
+    "setweight(to_tsvector('russian', "
+    "coalesce(reviews_title.description, '')), 'B')))"
+)
+
+SQLITE_FTS = [
+    'CREATE VIRTUAL TABLE IF NOT EXISTS reviews_title_fts USING fts5('
+    "name, description, content='reviews_title', content_rowid='id')",
+    'CREATE TRIGGER IF NOT EXISTS reviews_title_fts_insert '
+    'AFTER INSERT ON reviews_title BEGIN '
+    'INSERT INTO reviews_title_fts(rowid, name, description) '
+    'VALUES (new.id, new.name, new.description); END',
+    'CREATE TRIGGER IF NOT EXISTS reviews_title_fts_delete '
+    'AFTER DELETE ON reviews_title BEGIN '
+    'INSERT INTO reviews_title_fts(reviews_title_fts, rowid, name, '
+    "description) VALUES ('delete', old.id, old.name, old.description); "
+    'END',
+    'CREATE TRIGGER IF NOT EXISTS reviews_title_fts_update '
+    'AFTER UPDATE OF name, description ON reviews_title BEGIN '
+    'INSERT INTO reviews_title_fts(reviews_title_fts, rowid, name, '
+    "description) VALUES ('delete', old.id, old.name, old.description); "
+    'INSERT INTO reviews_title_fts(rowid, name, description) '
+    'VALUES (new.id, new.name, new.description); END',
+    # Индекс по уже существующим произведениям строится один раз.
+    "INSERT INTO reviews_title_fts(reviews_title_fts) VALUES ('rebuild')",
+]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0006_user_claims_changed'),
+    ]
+
+    operations = [
+        VendorRunSQL(
+            'postgresql',
+            POSTGRESQL_INDEX,
+            'DROP INDEX IF EXISTS reviews_title_search_idx',
+        ),
+        VendorRunSQL(
+            'sqlite',
+            SQLITE_FTS,
+            [
+                'DROP TRIGGER IF EXISTS reviews_title_fts_insert',
+                'DROP TRIGGER IF EXISTS reviews_title_fts_delete',
+                'DROP TRIGGER IF EXISTS reviews_title_fts_update',
+                'DROP TABLE IF EXISTS reviews_title_fts',
+            ],
+        ),
+    ]
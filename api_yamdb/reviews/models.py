@@ -1,8 +1,10 @@
 from django.conf import settings
 from django.contrib.auth.models import AbstractUser
 from django.core.validators import MaxValueValidator, MinValueValidator
-from django.db import models
+from django.db import models, transaction
+from django.utils import timezone
 
+from .functions import Now
 from .validators import (regex_validator, reserved_names_validator,
                          validate_year)
 
@@ -15,6 +17,8 @@ ROLES = (
     (MODERATOR, 'Модератор'),
     (ADMIN, 'Администратор'),
 )
+# Поля пользователя, от которых зависят права в API.
+CLAIM_FIELDS = ('username', 'role', 'is_staff', 'is_active')
 
 
 class CustomUser(AbstractUser):
@@ -40,6 +44,12 @@ class CustomUser(AbstractUser):
         max_length=max(len(role) for role, _ in ROLES),
         default=USER
     )
+    claims_changed = models.DateTimeField(
+        verbose_name='Дата изменения прав',
+        blank=True,
+        null=True,
+        editable=False
+    )
 
     class Meta(AbstractUser.Meta):
         ordering = ('username',)
@@ -47,6 +57,48 @@ class CustomUser(AbstractUser):
     def __str__(self):
         return self.username
 
+    def save(self, *args, **kwargs):
+        claims = getattr(self, '_claims', None)
+        changed = not self._state.adding and claims != self.get_claims()
+        if changed:
+            # Токены, выданные до этого момента, проверяются по базе.
+            self.claims_changed = timezone.now()
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'claims_changed'}
+        super().save(*args, **kwargs)
+        renamed = claims is None or (
+            claims[CLAIM_FIELDS.index('username')] != self.username
+        )
+        if changed and renamed:
+            # Имя автора входит в отзывы и комментарии: меняется их версия
+            # для If-Modified-Since и версия лент, где они выводятся.
+            for model in (Review, Comment):
+                model.objects.filter(author=self).update(updated=Now())
+            Title.objects.filter(reviews__author=self).update(updated=Now())
+            Review.objects.filter(comments__author=self).update(
+                updated=Now()
+            )
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance.remember_claims()
+        return instance
+
+    def remember_claims(self):
+        """
+        Запоминает поля, определяющие права, чтобы после сохранения
+        понять, устарели ли данные в выданных пользователю токенах.
+        """
+        if set(CLAIM_FIELDS) & self.get_deferred_fields():
+            self._claims = None
+        else:
+            self._claims = self.get_claims()
+
+    def get_claims(self):
+        return tuple(getattr(self, field) for field in CLAIM_FIELDS)
+
     @property
     def is_admin(self):
         return self.is_staff or self.role == ADMIN
@@ -113,6 +165,8 @@ class Title(models.Model):
         on_delete=models.SET_NULL,
         blank=True,
         null=True,
+        # Поиск по category покрывает индекс title_category_name_idx.
+        db_index=False,
         verbose_name='Категория'
     )
     genre = models.ManyToManyField(
@@ -120,9 +174,41 @@ class Title(models.Model):
         through='GenreTitle',
         verbose_name='Жанры'
     )
+    rating_sum = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Сумма оценок',
+    )
+    rating_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Количество оценок',
+    )
+    rating = models.FloatField(
+        blank=True,
+        null=True,
+        editable=False,
+        verbose_name='Рейтинг',
+    )
+    updated = models.DateTimeField(
+        auto_now=True,
+        verbose_name='Дата изменения',
+    )
 
     class Meta:
         ordering = ('name',)
+        indexes = [
+            # Сортировка ?ordering= дополняется id (TitlesOrderingFilter),
+            # поэтому id входит в индексы сортируемых полей.
+            models.Index(fields=['name', 'id'], name='title_name_idx'),
+            models.Index(fields=['year', 'id'], name='title_year_idx'),
+            models.Index(fields=['rating', 'id'], name='title_rating_idx'),
+            # Выгрузка изменений (api/export.py, ?since=) по updated.
+            models.Index(fields=['updated'], name='title_updated_idx'),
+            models.Index(
+                fields=['category', 'name'], name='title_category_name_idx'
+            ),
+        ]
         verbose_name = 'Произведение'
         verbose_name_plural = 'Произведения'
 
@@ -132,10 +218,17 @@ class Title(models.Model):
 
 class GenreTitle(models.Model):
     """Модель для связи произведений и жанров."""
-    genre = models.ForeignKey(Genre, on_delete=models.CASCADE)
+    # Поиск по genre покрывает ограничение unique_genre_title.
+    genre = models.ForeignKey(Genre, on_delete=models.CASCADE, db_index=False)
     title = models.ForeignKey(Title, on_delete=models.CASCADE)
 
     class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['genre', 'title'],
+                name='unique_genre_title'
+            )
+        ]
         verbose_name_plural = 'Жанры + Произведения'
 
     def __str__(self):
@@ -157,10 +250,14 @@ class ReviewComment(models.Model):
         auto_now_add=True,
         verbose_name='Дата публикации'
     )
+    updated = models.DateTimeField(
+        auto_now=True,
+        verbose_name='Дата изменения'
+    )
 
     class Meta:
         abstract = True
-        ordering = ('-pub_date',)
+        ordering = ('-pub_date', '-id')
 
     def __str__(self):
         return self.text[:50]
@@ -172,6 +269,8 @@ class Review(ReviewComment):
         Title,
         related_name='reviews',
         on_delete=models.CASCADE,
+        # Поиск по title покрывает индекс review_title_pub_date_idx.
+        db_index=False,
         verbose_name='Произведение'
     )
     score = models.IntegerField(
@@ -189,9 +288,43 @@ class Review(ReviewComment):
                 name='unique_review'
             )
         ]
+        indexes = [
+            models.Index(
+                fields=['title', '-pub_date', '-id'],
+                name='review_title_pub_date_idx'
+            ),
+        ]
         verbose_name = 'Отзыв'
         verbose_name_plural = 'Отзывы'
 
+    def save(self, *args, **kwargs):
+        # Отзыв и сдвиг рейтинга в сигнале post_save сохраняются в одной
+        # транзакции. Прежние произведение и оценка перечитываются
+        # с блокировкой строки: параллельное изменение того же отзыва
+        # ждёт, и каждое сдвигает рейтинг на действительную разницу.
+        with transaction.atomic(savepoint=False):
+            self._rating_values = None
+            if not self._state.adding:
+                self._rating_values = self.get_locked_rating_values()
+            super().save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        # Рейтинг уменьшается на оценку из базы, а не загруженную:
+        # её мог изменить параллельный запрос.
+        with transaction.atomic(savepoint=False):
+            row = self.get_locked_rating_values()
+            if row is None:
+                # Отзыв уже удалил параллельный запрос вместе с его оценкой.
+                return 0, {}
+            self.title_id, self.score = row
+            return super().delete(*args, **kwargs)
+
+    def get_locked_rating_values(self):
+        """Произведение и оценка отзыва в базе, строка блокируется."""
+        return Review.objects.select_for_update().filter(
+            pk=self.pk
+        ).values_list('title_id', 'score').first()
+
 
 class Comment(ReviewComment):
     """Модель комментариев."""
@@ -199,9 +332,105 @@ class Comment(ReviewComment):
         Review,
         on_delete=models.CASCADE,
         related_name='comments',
+        # Поиск по review покрывает индекс comment_review_pub_date_idx.
+        db_index=False,
         verbose_name='Отзыв',
     )
 
     class Meta(ReviewComment.Meta):
+        indexes = [
+            models.Index(
+                fields=['review', '-pub_date', '-id'],
+                name='comment_review_pub_date_idx'
+            ),
+        ]
         verbose_name = 'Комментарий'
         verbose_name_plural = 'Комментарии'
+
+    def delete(self, *args, **kwargs):
+        # Дата изменения отзыва — версия ленты его комментариев.
+        # Не приёмник post_delete: с ним удаление отзыва загружало бы
+        # все его комментарии вместо одного DELETE.
+        Review.objects.filter(pk=self.review_id).update(updated=Now())
+        return super().delete(*args, **kwargs)
+
+
+class ScoreCount(models.Model):
+    """Сколько раз произведению поставили каждую оценку."""
+    title = models.ForeignKey(
+        Title,
+        related_name='score_counts',
+        on_delete=models.CASCADE,
+        # Поиск по title покрывает ограничение unique_title_score.
+        db_index=False,
+        verbose_name='Произведение'
+    )
+    score = models.PositiveSmallIntegerField(verbose_name='Оценка')
+    count = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Количество оценок'
+    )
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['title', 'score'],
+                name='unique_title_score'
+            )
+        ]
+        verbose_name = 'Распределение оценок'
+        verbose_name_plural = 'Распределения оценок'
+
+    def __str__(self):
+        return f'{self.title}: {self.score} — {self.count}'
+
+
+class TopTitle(models.Model):
+    """Место произведения в рейтинге лучших: общем, жанра или категории."""
+    SCOPE_ALL = 'all'
+    SCOPE_GENRE = 'genre'
+    SCOPE_CATEGORY = 'category'
+    SCOPES = (
+        (SCOPE_ALL, 'Все произведения'),
+        (SCOPE_GENRE, 'Жанр'),
+        (SCOPE_CATEGORY, 'Категория'),
+    )
+
+    scope = models.CharField(
+        max_length=16,
+        choices=SCOPES,
+        verbose_name='Рейтинг'
+    )
+    scope_slug = models.SlugField(
+        max_length=settings.SLUG_LENGHT,
+        blank=True,
+        # Поиск по scope_slug покрывает unique_top_title_position.
+        db_index=False,
+        verbose_name='Жанр или категория'
+    )
+    position = models.PositiveIntegerField(verbose_name='Место')
+    title = models.ForeignKey(
+        Title,
+        related_name='+',
+        on_delete=models.CASCADE,
+        verbose_name='Произведение'
+    )
+    rating = models.FloatField(verbose_name='Рейтинг произведения')
+    rating_count = models.PositiveIntegerField(
+        verbose_name='Количество оценок'
+    )
+
+    class Meta:
+        ordering = ('scope', 'scope_slug', 'position')
+        constraints = [
+            # Страница рейтинга читается диапазоном по этому индексу.
+            models.UniqueConstraint(
+                fields=['scope', 'scope_slug', 'position'],
+                name='unique_top_title_position'
+            )
+        ]
+        verbose_name = 'Место в рейтинге'
+        verbose_name_plural = 'Рейтинги лучших произведений'
+
+    def __str__(self):
+        return f'{self.scope} {self.scope_slug}: {self.position}. {self.title}'
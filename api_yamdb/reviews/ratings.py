@@ -0,0 +1,140 @@
+from itertools import islice
+
+from django.db import IntegrityError, transaction
+from django.db.models import (Avg, Case, Count, Exists, ExpressionWrapper, F,
+                              FloatField, OuterRef, Subquery, Sum, Value, When)
+from django.db.models.functions import Cast, Coalesce
+
+from .functions import Now
+from .models import Review, ScoreCount, Title
+
+BATCH_SIZE = 5000
+
+
+def shift_rating(title_id, score_delta, count_delta):
+    """
+    Одним UPDATE сдвигает сумму и количество оценок произведения
+    и пересчитывает средний рейтинг.
+    """
+    return Title.objects.filter(pk=title_id).update(
+        rating_sum=F('rating_sum') + score_delta,
+        rating_count=F('rating_count') + count_delta,
+        rating=Case(
+            When(rating_count=-count_delta, then=Value(None)),
+            default=ExpressionWrapper(
+                Cast(F('rating_sum') + score_delta, FloatField())
+                / (F('rating_count') + count_delta),
+                output_field=FloatField()
+            ),
+            output_field=FloatField()
+        ),
+        updated=Now()
+    )
+
+
+def recalculate_ratings(titles=None):
+    """Пересчитывает рейтинги произведений по всем их отзывам."""
+    if titles is None:
+        titles = Title.objects.all()
+    reviews = Review.objects.filter(
+        title=OuterRef('pk')
+    ).order_by().values('title')
+    return titles.update(
+        rating_sum=Coalesce(
+            Subquery(reviews.annotate(total=Sum('score')).values('total')),
+            0
+        ),
+        rating_count=Coalesce(
+            Subquery(reviews.annotate(total=Count('pk')).values('total')),
+            0
+        ),
+        rating=Subquery(
+            reviews.annotate(average=Avg('score')).values('average'),
+            output_field=FloatField()
+        ),
+        updated=Now()
+    )
+
+
+def subtract_reviews(reviews):
+    """
+    Вычитает отзывы reviews из рейтингов и распределений оценок их
+    произведений: одним UPDATE на таблицу, без загрузки строк.
+    На произведение должно приходиться не больше одного отзыва
+    (например, отзывы одного автора). Вызывается до удаления отзывов.
+    """
+    score = Subquery(
+        reviews.filter(title=OuterRef('pk')).order_by().values('score')[:1]
+    )
+    Title.objects.filter(pk__in=reviews.values('title_id')).update(
+        rating_sum=F('rating_sum') - score,
+        rating_count=F('rating_count') - 1,
+        rating=Case(
+            When(rating_count=1, then=Value(None)),
+            default=ExpressionWrapper(
+                Cast(F('rating_sum') - score, FloatField())
+                / (F('rating_count') - 1),
+                output_field=FloatField()
+            ),
+            output_field=FloatField()
+        ),
+        updated=Now()
+    )
+    score_counts = ScoreCount.objects.annotate(
+        reviewed=Exists(reviews.filter(
+            title=OuterRef('title'), score=OuterRef('score')
+        ))
+    ).filter(reviewed=True)
+    score_counts.update(count=F('count') - 1)
+    # Как и после пересчёта, оценок без отзывов в распределении нет.
+    score_counts.filter(count=0).delete()
+
+
+def shift_score_count(title_id, score, delta):
+    """Сдвигает число оценок score у произведения на delta."""
+    score_counts = ScoreCount.objects.filter(title_id=title_id, score=score)
+    updated = score_counts.update(count=F('count') + delta)
+    if delta < 0:
+        # Как и после пересчёта, оценок без отзывов в распределении нет.
+        score_counts.filter(count__lte=0).delete()
+    if updated or delta <= 0:
+        return
+    try:
+        with transaction.atomic():
+            ScoreCount.objects.create(
+                title_id=title_id, score=score, count=delta
+            )
+    except IntegrityError:
+        # Строку успел создать параллельный запрос.
+        shift_score_count(title_id, score, delta)
+
+
+def recalculate_score_counts(titles=None):
+    """
+    Пересобирает распределение оценок произведений:
+    количества считает база одним GROUP BY по отзывам.
+    """
+    reviews = Review.objects.all()
+    score_counts = ScoreCount.objects.all()
+    if titles is not None:
+        reviews = reviews.filter(title__in=titles)
+        score_counts = score_counts.filter(title__in=titles)
+    score_counts.delete()
+    rows = reviews.order_by().values('title_id', 'score').annotate(
+        total=Count('pk')
+    ).iterator()
+    created = 0
+    # Строки читаются пачками по BATCH_SIZE; на INSERT-запросы пачку
+    # делит bulk_create с учётом ограничений базы (в SQLite — 500 строк).
+    while True:
+        batch = [
+            ScoreCount(
+                title_id=row['title_id'], score=row['score'],
+                count=row['total']
+            )
+            for row in islice(rows, BATCH_SIZE)
+        ]
+        if not batch:
+            return created
+        ScoreCount.objects.bulk_create(batch)
+        created += len(batch)
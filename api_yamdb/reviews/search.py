@@ -0,0 +1,94 @@
+import re
+
+from django.db import connections
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+from .models import Title
+
+SEARCH_CONFIG = 'russian'
+WORD_REGEX = re.compile(r'\w+')
+
+TABLE = Title._meta.db_table
+FTS_TABLE = f'{TABLE}_fts'
+
+# Выражение общее для индекса и запросов: PostgreSQL использует
+# индекс по выражению, только если условие совпадает с ним.
+POSTGRESQL_VECTOR = (
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', "
+    f"coalesce({TABLE}.name, '')), 'A') || "
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', "
+    f"coalesce({TABLE}.description, '')), 'B')"
+)
+POSTGRESQL_QUERY = f"plainto_tsquery('{SEARCH_CONFIG}', %s)"
+
+# Индекс PostgreSQL и таблица FTS5 создаются миграцией 0007_title_search.
+# Пересоздание таблицы при миграциях в SQLite удаляет её триггеры,
+# поэтому они восстанавливаются после каждого migrate.
+SQLITE_TRIGGERS = (
+    f'CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_insert '
+    f'AFTER INSERT ON {TABLE} BEGIN '
+    f'INSERT INTO {FTS_TABLE}(rowid, name, description) '
+    f'VALUES (new.id, new.name, new.description); END',
+    f'CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_delete '
+    f'AFTER DELETE ON {TABLE} BEGIN '
+    f'INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, description) '
+    f"VALUES ('delete', old.id, old.name, old.description); END",
+    f'CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_update '
+    f'AFTER UPDATE OF name, description ON {TABLE} BEGIN '
+    f'INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, description) '
+    f"VALUES ('delete', old.id, old.name, old.description); "
+    f'INSERT INTO {FTS_TABLE}(rowid, name, description) '
+    f'VALUES (new.id, new.name, new.description); END',
+)
+# bm25 тем меньше, чем запись релевантнее, поэтому берётся со знаком минус.
+SQLITE_RANK = f'-bm25({FTS_TABLE}, 10.0, 5.0)'
+
+
+def restore_search_triggers(using='default', **kwargs):
+    """
+    Восстанавливает триггеры, которые обновляют таблицу FTS5
+    произведений в SQLite. Вызывается после migrate; пока миграция
+    с таблицей не применена, ничего не делает.
+    """
+    connection = connections[using]
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        if FTS_TABLE not in connection.introspection.table_names(cursor):
+            return
+        for statement in SQLITE_TRIGGERS:
+            cursor.execute(statement)
+
+
+def search_titles(queryset, query):
+    """
+    Оставляет произведения, подходящие под поисковый запрос по названию
+    и описанию, и сортирует их по релевантности (поле search_rank).
+    Название весит больше описания. В SQLite слова ищутся по префиксу,
+    в PostgreSQL — с учётом морфологии русского языка.
+    """
+    vendor = connections[queryset.db].vendor
+    if vendor == 'postgresql':
+        return queryset.extra(
+            where=[f'({POSTGRESQL_VECTOR}) @@ {POSTGRESQL_QUERY}'],
+            params=[query]
+        ).annotate(
+            search_rank=RawSQL(
+                f'ts_rank({POSTGRESQL_VECTOR}, {POSTGRESQL_QUERY})', [query]
+            )
+        ).order_by('-search_rank', 'name')
+    if vendor != 'sqlite':
+        return queryset.filter(
+            Q(name__icontains=query) | Q(description__icontains=query)
+        )
+    words = WORD_REGEX.findall(query)
+    if not words:
+        return queryset.none()
+    match = ' '.join(f'"{word}"*' for word in words)
+    return queryset.extra(
+        select={'search_rank': SQLITE_RANK},
+        tables=[FTS_TABLE],
+        where=[f'{FTS_TABLE}.rowid = {TABLE}.id', f'{FTS_TABLE} MATCH %s'],
+        params=[match]
+    ).order_by('-search_rank', 'name')
@@ -0,0 +1,96 @@
+from django.db.models.signals import (m2m_changed, post_delete, post_save,
+                                      pre_delete)
+from django.dispatch import Signal, receiver
+
+from .functions import Now
+from .models import Category, Comment, Genre, GenreTitle, Review, Title
+from .ratings import (recalculate_ratings, recalculate_score_counts,
+                      shift_rating, shift_score_count)
+
+# Отправляется после массовой загрузки данных в обход сигналов моделей.
+data_imported = Signal()
+# Отправляется после изменения или удаления строк запросом по условию
+# в обход сигналов моделей (reviews/deletion.py).
+data_changed = Signal()
+
+
+@receiver(post_save, sender=Review)
+def update_rating_on_review_save(sender, instance, created, **kwargs):
+    # Прежние произведение и оценку Review.save() перечитывает
+    # с блокировкой строки в той же транзакции.
+    if created:
+        shift_rating(instance.title_id, instance.score, 1)
+        shift_score_count(instance.title_id, instance.score, 1)
+    else:
+        previous = getattr(instance, '_rating_values', None)
+        if previous is None:
+            titles = Title.objects.filter(pk=instance.title_id)
+            recalculate_ratings(titles)
+            recalculate_score_counts(titles)
+        else:
+            previous_title_id, previous_score = previous
+            if previous_title_id != instance.title_id:
+                shift_rating(previous_title_id, -previous_score, -1)
+                shift_rating(instance.title_id, instance.score, 1)
+            elif previous_score != instance.score:
+                shift_rating(
+                    instance.title_id, instance.score - previous_score, 0
+                )
+            if previous != (instance.title_id, instance.score):
+                shift_score_count(previous_title_id, previous_score, -1)
+                shift_score_count(instance.title_id, instance.score, 1)
+            else:
+                # Рейтинг не изменился, но дата изменения произведения —
+                # версия ленты его отзывов.
+                touch_titles(Title.objects.filter(pk=instance.title_id))
+
+
+@receiver(post_delete, sender=Review)
+def update_rating_on_review_delete(sender, instance, **kwargs):
+    shift_rating(instance.title_id, -instance.score, -1)
+    shift_score_count(instance.title_id, instance.score, -1)
+
+
+@receiver(post_save, sender=Comment)
+def touch_review_on_comment_save(sender, instance, **kwargs):
+    # Дата изменения отзыва — версия ленты его комментариев.
+    Review.objects.filter(pk=instance.review_id).update(updated=Now())
+
+
+def touch_titles(titles):
+    """Обновляет дату изменения произведений, чьё представление изменилось."""
+    titles.update(updated=Now())
+
+
+@receiver(post_save, sender=GenreTitle)
+@receiver(post_delete, sender=GenreTitle)
+def touch_title_on_genre_link_change(sender, instance, **kwargs):
+    touch_titles(Title.objects.filter(pk=instance.title_id))
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def touch_titles_on_genres_change(sender, instance, action, reverse, pk_set,
+                                  **kwargs):
+    if not reverse and action.startswith('post_'):
+        touch_titles(Title.objects.filter(pk=instance.pk))
+    elif reverse and action == 'pre_clear':
+        touch_titles(Title.objects.filter(genre=instance))
+    elif reverse and action.startswith('post_') and pk_set:
+        touch_titles(Title.objects.filter(pk__in=pk_set))
+
+
+@receiver(post_save, sender=Genre)
+def touch_titles_on_genre_change(sender, instance, created, **kwargs):
+    if not created:
+        touch_titles(Title.objects.filter(genre=instance))
+
+
+@receiver(post_save, sender=Category)
+def touch_titles_on_category_change(sender, instance, created, **kwargs):
+    if not created:
+        touch_titles(Title.objects.filter(category=instance))
+
+
+@receiver(pre_delete, sender=Category)
+def touch_titles_on_category_delete(sender, instance, **kwargs):
+    touch_titles(Title.objects.filter(category=instance))
@@ -0,0 +1,78 @@
+"""
+Задержка запроса к API при разных способах подключения к PostgreSQL:
+новое соединение на каждый запрос (plain), постоянное соединение
+(persistent, CONN_MAX_AGE) и пул соединений (pool, api_yamdb.db_pool).
+Нужна запущенная PostgreSQL, адрес берётся из тех же переменных
+окружения, что и в settings.py (DB_HOST, DB_PORT, DB_NAME, ...).
+
+    python -m benchmarks.connections --repeat 500
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+from .utils import PROJECT_DIR, measure, summarize
+
+MODES = {
+    'plain': {
+        'DB_ENGINE': 'django.db.backends.postgresql', 'DB_CONN_MAX_AGE': '0'
+    },
+    'persistent': {
+        'DB_ENGINE': 'django.db.backends.postgresql', 'DB_CONN_MAX_AGE': '60'
+    },
+    'pool': {'DB_ENGINE': 'api_yamdb.db_pool', 'DB_CONN_MAX_AGE': '0'},
+}
+
+
+def run_mode(repeat):
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
+    sys.path.insert(0, str(PROJECT_DIR))
+
+    import django
+    from django.core.management import call_command
+    from django.test import Client
+
+    django.setup()
+    call_command('migrate', verbosity=0)
+
+    from reviews.models import Title
+
+    title, _ = Title.objects.get_or_create(name='Бенчмарк', year=2000)
+    url = f'/api/v1/titles/{title.id}/reviews/'
+    client = Client()
+    # Client, как и gunicorn, посылает request_started и request_finished,
+    # по которым Django закрывает или возвращает соединения.
+    client.get(url)
+    return summarize(measure(lambda: client.get(url), repeat))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeat', type=int, default=200)
+    parser.add_argument('--mode', choices=MODES)
+    args = parser.parse_args()
+
+    if args.mode:
+        stats = run_mode(args.repeat)
+        print(
+            f'{args.mode:<12} '
+            f'{stats["median_ms"]:>12} {stats["p95_ms"]:>10}'
+        )
+        return
+    print(
+        f'{"режим":<12} {"медиана, мс":>12} {"p95, мс":>10}', flush=True
+    )
+    # Настройки читаются при запуске Django, поэтому каждый режим
+    # замеряется в отдельном процессе.
+    for mode, env in MODES.items():
+        subprocess.run(
+            [sys.executable, '-m', 'benchmarks.connections',
+             '--mode', mode, '--repeat', str(args.repeat)],
+            env={**os.environ, **env},
+            check=True
+        )
+
+
+if __name__ == '__main__':
+    main()
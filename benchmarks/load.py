@@ -0,0 +1,295 @@
+"""
+Нагрузочный тест API на синтетических данных в SQLite.
+Запросы идут через django.test.Client в настоящие адреса api/urls.py
+со всеми middleware из нескольких потоков одновременно. Для каждого
+адреса выводятся p50/p95/p99, пропускная способность и число
+SQL-запросов; --output сохраняет результат в JSON, --compare
+сравнивает с сохранённым ранее прогоном (например, другого коммита).
+
+    python -m benchmarks.load --titles 5000 --threads 8 --requests 500 \\
+        --output load.json
+    python -m benchmarks.load --titles 5000 --compare load.json
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+from .utils import ROOT_DIR, percentile, setup_django
+
+SEARCH_WORDS = ('мир', 'звезда', 'ночь', 'река', 'остров')
+
+# Адреса и шаблоны подстановки: title и review — случайные id из данных,
+# genre и category — случайные slug, word — слово из SEARCH_WORDS.
+ENDPOINTS = {
+    'titles': '/api/v1/titles/',
+    'titles_filtered': (
+        '/api/v1/titles/?genre={genre}&ordering=-rating&rating__gte=5'
+    ),
+    'titles_search': '/api/v1/titles/?search={word}',
+    'titles_top': '/api/v1/titles/top/?category={category}',
+    'title': '/api/v1/titles/{title}/',
+    'title_stats': '/api/v1/titles/{title}/stats/',
+    'reviews': '/api/v1/titles/{title}/reviews/',
+    'reviews_cursor': '/api/v1/titles/{title}/reviews/?cursor=',
+    'comments': '/api/v1/titles/{title}/reviews/{review}/comments/',
+    'genres': '/api/v1/genres/',
+    'categories': '/api/v1/categories/',
+}
+
+
+def seed(options):
+    """
+    Заполняет базу одинаковыми при одном seed данными и возвращает
+    их объём. bulk_create не вызывает сигналы, поэтому рейтинги
+    и распределения оценок пересчитываются в конце.
+    """
+    from reviews.models import (Category, Comment, CustomUser, Genre,
+                                GenreTitle, Review, Title)
+    from reviews.ratings import recalculate_ratings, recalculate_score_counts
+
+    generator = random.Random(options.seed)
+    CustomUser.objects.bulk_create(
+        CustomUser(username=f'user{index}', email=f'user{index}@yamdb.ru')
+        for index in range(options.users)
+    )
+    Category.objects.bulk_create(
+        Category(name=f'Категория {index}', slug=f'category-{index}')
+        for index in range(options.categories)
+    )
+    Genre.objects.bulk_create(
+        Genre(name=f'Жанр {index}', slug=f'genre-{index}')
+        for index in range(options.genres)
+    )
+    # bulk_create в SQLite не возвращает id, поэтому id перечитываются.
+    user_ids = list(CustomUser.objects.values_list('id', flat=True))
+    category_ids = list(Category.objects.values_list('id', flat=True))
+    genre_ids = list(Genre.objects.values_list('id', flat=True))
+    Title.objects.bulk_create(
+        Title(
+            name=' '.join(generator.choices(SEARCH_WORDS, k=2)).capitalize()
+            + f' {index}',
+            year=generator.randint(1900, 2020),
+            description='Описание произведения ' * 10,
+            category_id=generator.choice(category_ids),
+        )
+        for index in range(options.titles)
+    )
+    title_ids = list(Title.objects.values_list('id', flat=True))
+    GenreTitle.objects.bulk_create(
+        GenreTitle(title_id=title_id, genre_id=genre_id)
+        for title_id in title_ids
+        for genre_id in generator.sample(
+            genre_ids, min(3, len(genre_ids))
+        )
+    )
+    reviews_per_title = min(options.reviews, len(user_ids))
+    Review.objects.bulk_create(
+        Review(
+            title_id=title_id, author_id=author_id, text='Текст отзыва ' * 20,
+            score=generator.randint(1, 10)
+        )
+        for title_id in title_ids
+        for author_id in generator.sample(user_ids, reviews_per_title)
+    )
+    review_ids = list(Review.objects.values_list('id', flat=True))
+    Comment.objects.bulk_create(
+        Comment(
+            review_id=review_id, author_id=generator.choice(user_ids),
+            text='Комментарий ' * 10
+        )
+        for review_id in review_ids
+        for _ in range(options.comments)
+    )
+    recalculate_ratings()
+    recalculate_score_counts()
+    return {
+        'users': len(user_ids),
+        'categories': len(category_ids),
+        'genres': len(genre_ids),
+        'titles': len(title_ids),
+        'reviews': len(review_ids),
+        'comments': len(review_ids) * options.comments,
+    }
+
+
+def build_urls(template, count, generator):
+    """Адреса для count запросов с подставленными случайными id."""
+    from reviews.models import Category, Genre, Review
+
+    reviews = list(Review.objects.values_list('title_id', 'id')[:10000])
+    genres = list(Genre.objects.values_list('slug', flat=True))
+    categories = list(Category.objects.values_list('slug', flat=True))
+    urls = []
+    for _ in range(count):
+        title_id, review_id = generator.choice(reviews)
+        urls.append(template.format(
+            title=title_id, review=review_id,
+            genre=generator.choice(genres),
+            category=generator.choice(categories),
+            word=generator.choice(SEARCH_WORDS),
+        ))
+    return urls
+
+
+_local = threading.local()
+
+
+def fetch(url):
+    """
+    Выполняет GET-запрос в потоке пула и возвращает статус,
+    длительность в миллисекундах и число SQL-запросов.
+    """
+    from django.db import connection
+    from django.test import Client
+
+    if not hasattr(_local, 'client'):
+        _local.client = Client()
+    queries = 0
+
+    def count_queries(execute, sql, params, many, context):
+        nonlocal queries
+        queries += 1
+        return execute(sql, params, many, context)
+
+    started = time.perf_counter()
+    # Соединение у каждого потока своё, счётчик видит только его запросы.
+    with connection.execute_wrapper(count_queries):
+        response = _local.client.get(url)
+    return (
+        response.status_code,
+        (time.perf_counter() - started) * 1000,
+        queries
+    )
+
+
+def run_endpoint(urls, threads, warmup):
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(fetch, urls[:warmup]))
+        started = time.perf_counter()
+        results = list(executor.map(fetch, urls))
+        elapsed = time.perf_counter() - started
+    durations = [duration for _, duration, _ in results]
+    queries = [count for _, _, count in results]
+    return {
+        'requests': len(results),
+        'errors': sum(status >= 400 for status, _, _ in results),
+        'throughput_rps': round(len(results) / elapsed, 1),
+        'mean_ms': round(statistics.mean(durations), 3),
+        'p50_ms': round(percentile(durations, 50), 3),
+        'p95_ms': round(percentile(durations, 95), 3),
+        'p99_ms': round(percentile(durations, 99), 3),
+        'queries_mean': round(statistics.mean(queries), 2),
+        'queries_max': max(queries),
+    }
+
+
+def get_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT_DIR,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_results(results, previous=None):
+    header = (
+        f'{"адрес":<16} {"rps":>8} {"p50, мс":>9} {"p95, мс":>9} '
+        f'{"p99, мс":>9} {"запросов":>9} {"ошибок":>7}'
+    )
+    if previous:
+        header += f' {"p50 было":>9} {"p95 было":>9}'
+    print(header)
+    for name, stats in results.items():
+        line = (
+            f'{name:<16} {stats["throughput_rps"]:>8} {stats["p50_ms"]:>9} '
+            f'{stats["p95_ms"]:>9} {stats["p99_ms"]:>9} '
+            f'{stats["queries_mean"]:>9} {stats["errors"]:>7}'
+        )
+        if previous and name in previous:
+            line += (
+                f' {previous[name]["p50_ms"]:>9} {previous[name]["p95_ms"]:>9}'
+            )
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter
+    )
+    parser.add_argument('--users', type=int, default=200)
+    parser.add_argument('--categories', type=int, default=10)
+    parser.add_argument('--genres', type=int, default=20)
+    parser.add_argument('--titles', type=int, default=2000)
+    parser.add_argument(
+        '--reviews', type=int, default=10, help='отзывов на произведение'
+    )
+    parser.add_argument(
+        '--comments', type=int, default=2, help='комментариев на отзыв'
+    )
+    parser.add_argument('--threads', type=int, default=4)
+    parser.add_argument(
+        '--requests', type=int, default=200, help='запросов на адрес'
+    )
+    parser.add_argument('--warmup', type=int, default=10)
+    parser.add_argument(
+        '--endpoints', default=','.join(ENDPOINTS),
+        help='адреса через запятую из: ' + ', '.join(ENDPOINTS)
+    )
+    parser.add_argument(
+        '--no-cache', action='store_true',
+        help='отключить кэш ответов (CACHE_BACKEND=DummyCache)'
+    )
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--db', default=None)
+    parser.add_argument('--output', help='файл для результатов в JSON')
+    parser.add_argument('--compare', help='JSON прошлого прогона')
+    args = parser.parse_args()
+    endpoints = args.endpoints.split(',')
+    unknown = set(endpoints) - set(ENDPOINTS)
+    if unknown:
+        parser.error(f'неизвестные адреса: {", ".join(sorted(unknown))}')
+
+    if args.no_cache:
+        os.environ['CACHE_BACKEND'] = (
+            'django.core.cache.backends.dummy.DummyCache'
+        )
+    setup_django(args.db)
+    dataset = seed(args)
+    print(', '.join(f'{name}: {count}' for name, count in dataset.items()))
+
+    generator = random.Random(args.seed)
+    results = {}
+    for name in endpoints:
+        urls = build_urls(ENDPOINTS[name], args.requests, generator)
+        results[name] = run_endpoint(urls, args.threads, args.warmup)
+
+    previous = None
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as file:
+            previous = json.load(file)['endpoints']
+    print_results(results, previous)
+    if args.output:
+        report = {
+            'commit': get_commit(),
+            'created': datetime.now(timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'options': vars(args),
+            'dataset': dataset,
+            'endpoints': results,
+        }
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump(report, file, ensure_ascii=False, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""
+Сравнение поиска произведений: фильтр name (icontains) и полнотекстовый
+фильтр search на синтетическом каталоге.
+
+    python -m benchmarks.search --titles 200000 --repeat 20
+"""
+import argparse
+import random
+
+from .utils import measure, setup_django, summarize
+
+WORDS = (
+    'война', 'мир', 'любовь', 'время', 'город', 'море', 'звезда', 'дорога',
+    'ночь', 'песня', 'зима', 'сад', 'тень', 'огонь', 'река', 'дом', 'сон',
+    'ветер', 'камень', 'небо', 'лес', 'поле', 'свет', 'голос', 'остров',
+)
+SYLLABLES = ('ка', 'ро', 'ми', 'ла', 'то', 'ве', 'ну', 'са', 'ди', 'по')
+QUERIES = ('мир', 'звезда', 'ночь река', 'остров')
+BATCH_SIZE = 5000
+
+
+def seed_titles(count, seed):
+    from reviews.models import Title
+
+    generator = random.Random(seed)
+    vocabulary = WORDS + tuple(
+        ''.join(generator.choices(SYLLABLES, k=4)) for _ in range(5000)
+    )
+    for start in range(0, count, BATCH_SIZE):
+        Title.objects.bulk_create(
+            Title(
+                name=' '.join(generator.choices(vocabulary, k=3)).capitalize(),
+                year=generator.randint(1900, 2020),
+                description=' '.join(generator.choices(vocabulary, k=20)),
+            )
+            for _ in range(start, min(start + BATCH_SIZE, count))
+        )
+
+
+def run_filter(data, limit=10):
+    from api.filters import TitlesFilter
+    from reviews.models import Title
+
+    queryset = TitlesFilter(data, queryset=Title.objects.all()).qs
+    queryset.count()
+    list(queryset[:limit])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--titles', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--db', default=None)
+    args = parser.parse_args()
+
+    setup_django(args.db)
+    seed_titles(args.titles, args.seed)
+    print(f'Произведений: {args.titles}')
+    print(f'{"запрос":<12} {"режим":<10} {"медиана, мс":>12} {"p95, мс":>10}')
+    for query in QUERIES:
+        for mode in ('name', 'search'):
+            stats = summarize(
+                measure(lambda: run_filter({mode: query}), args.repeat)
+            )
+            print(
+                f'{query:<12} {mode:<10} '
+                f'{stats["median_ms"]:>12} {stats["p95_ms"]:>10}'
+            )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,141 @@
+"""
+Сравнение сериализации страниц списков: сериализаторы DRF по объектам
+моделей и api.fast_serializers по строкам values(). В замер входят
+выборка страницы из базы, сериализация и рендеринг JSON.
+
+    python -m benchmarks.serializers --repeat 20
+"""
+import argparse
+import random
+
+from .utils import measure, setup_django, summarize
+
+PAGE_SIZES = (10, 100, 1000)
+
+
+def seed(count, seed):
+    from reviews.models import (Category, Comment, CustomUser, Genre,
+                                GenreTitle, Review, Title)
+
+    generator = random.Random(seed)
+    Category.objects.bulk_create(
+        Category(name=f'Категория {index}', slug=f'category-{index}')
+        for index in range(10)
+    )
+    Genre.objects.bulk_create(
+        Genre(name=f'Жанр {index}', slug=f'genre-{index}')
+        for index in range(20)
+    )
+    CustomUser.objects.bulk_create(
+        CustomUser(username=f'user{index}', email=f'user{index}@yamdb.ru')
+        for index in range(count)
+    )
+    # bulk_create в SQLite не возвращает id, поэтому объекты перечитываются.
+    categories = list(Category.objects.all())
+    genres = list(Genre.objects.all())
+    users = list(CustomUser.objects.all())
+    Title.objects.bulk_create(
+        Title(
+            name=f'Произведение {index}',
+            year=generator.randint(1900, 2020),
+            description='Описание произведения ' * 5,
+            category=generator.choice(categories),
+            rating=generator.uniform(1, 10),
+        )
+        for index in range(count)
+    )
+    titles = list(Title.objects.all())
+    GenreTitle.objects.bulk_create(
+        GenreTitle(title=title, genre=genre)
+        for title in titles
+        for genre in generator.sample(genres, 3)
+    )
+    title = titles[0]
+    Review.objects.bulk_create(
+        Review(
+            title=title, author=user, text='Текст отзыва ' * 20,
+            score=generator.randint(1, 10)
+        )
+        for user in users
+    )
+    review = Review.objects.first()
+    Comment.objects.bulk_create(
+        Comment(review=review, author=user, text='Комментарий ' * 10)
+        for user in users
+    )
+
+
+def get_cases():
+    from api import fast_serializers, serializers
+    from api.views import TitlesViewSet
+    from reviews.models import Comment, Review
+
+    return {
+        'titles': (
+            TitlesViewSet.queryset,
+            serializers.TitleSerializer,
+            fast_serializers.TitleRowSerializer,
+        ),
+        'reviews': (
+            Review.objects.select_related('author'),
+            serializers.ReviewSerializer,
+            fast_serializers.ReviewRowSerializer,
+        ),
+        'comments': (
+            Comment.objects.select_related('author'),
+            serializers.CommentSerializer,
+            fast_serializers.CommentRowSerializer,
+        ),
+    }
+
+
+def render_drf(queryset, serializer_class, size):
+    from rest_framework.renderers import JSONRenderer
+
+    page = list(queryset.all()[:size])
+    return JSONRenderer().render(serializer_class(page, many=True).data)
+
+
+def render_rows(queryset, row_serializer_class, size):
+    from rest_framework.renderers import JSONRenderer
+
+    serializer = row_serializer_class()
+    page = list(serializer.get_rows(queryset.all())[:size])
+    return JSONRenderer().render(serializer.to_representation(page))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--db', default=None)
+    args = parser.parse_args()
+
+    setup_django(args.db)
+    seed(max(PAGE_SIZES), args.seed)
+    print(
+        f'{"список":<10} {"строк":>6} {"режим":<6} '
+        f'{"медиана, мс":>12} {"строк/с":>10}'
+    )
+    for name, (queryset, serializer, row_serializer) in get_cases().items():
+        for size in PAGE_SIZES:
+            assert render_drf(queryset, serializer, size) == render_rows(
+                queryset, row_serializer, size
+            ), f'{name}: ответы DRF и values() различаются'
+            for mode, func, serializer_class in (
+                ('drf', render_drf, serializer),
+                ('rows', render_rows, row_serializer),
+            ):
+                stats = summarize(measure(
+                    lambda: func(queryset, serializer_class, size),
+                    args.repeat
+                ))
+                rows_per_second = round(size / stats['median_ms'] * 1000)
+                print(
+                    f'{name:<10} {size:>6} {mode:<6} '
+                    f'{stats["median_ms"]:>12} {rows_per_second:>10}'
+                )
+
+
+if __name__ == '__main__':
+    main()
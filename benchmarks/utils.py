@@ -0,0 +1,53 @@
+"""Общие функции бенчмарков: Django на отдельной базе SQLite и замеры."""
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+PROJECT_DIR = ROOT_DIR / 'api_yamdb'
+
+
+def setup_django(db_name=None):
+    """
+    Настраивает Django на базе SQLite (по умолчанию во временном файле)
+    и создаёт в ней таблицы. Вызывается до импорта моделей.
+    """
+    if db_name is None:
+        db_name = os.path.join(tempfile.mkdtemp(), 'benchmark.sqlite3')
+    os.environ['DB_ENGINE'] = 'django.db.backends.sqlite3'
+    os.environ['DB_NAME'] = str(db_name)
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
+    sys.path.insert(0, str(PROJECT_DIR))
+
+    import django
+    from django.core.management import call_command
+
+    django.setup()
+    call_command('migrate', verbosity=0)
+    return db_name
+
+
+def measure(func, repeat):
+    """Выполняет func repeat раз и возвращает длительности в миллисекундах."""
+    durations = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        durations.append((time.perf_counter() - started) * 1000)
+    return durations
+
+
+def percentile(values, percent):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(percent / 100 * len(ordered))))
+    return ordered[index]
+
+
+def summarize(durations):
+    return {
+        'median_ms': round(statistics.median(durations), 3),
+        'p95_ms': round(percentile(durations, 95), 3),
+    }
@@ -1,9 +1,46 @@
 import sys
 from os.path import abspath, dirname, join
+from threading import local
+
+import pytest
+from django.core.cache import cache
+from django.db import connections
 
 root_dir = dirname(dirname(abspath(__file__)))
 sys.path.append(root_dir)
 infra_dir_path = join(root_dir, 'infra')
 
 pytest_plugins = [
+    'tests.fixtures.fixture_data',
 ]
+
+
+@pytest.fixture(scope='session')
+def django_db_modify_db_settings():
+    """
+    Тесты с базой данных работают с SQLite в памяти:
+    настройки PostgreSQL из settings.py не меняются,
+    подменяется только конфигурация подключений.
+    """
+    connections._databases = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': ':memory:',
+        },
+    }
+    connections.__dict__.pop('databases', None)
+    connections._connections = local()
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+
+
+@pytest.fixture
+def shared_claims_cache(settings):
+    """
+    Тесты идут в одном процессе, и кэш в памяти для них общий:
+    время изменения прав кэшируется, как с общим бэкендом кэша.
+    """
+    settings.JWT_CLAIMS_CACHE_TIMEOUT = 3600
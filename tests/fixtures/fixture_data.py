@@ -0,0 +1,58 @@
+import pytest
+
+
+@pytest.fixture
+def category():
+    from reviews.models import Category
+    return Category.objects.create(name='Фильмы', slug='films')
+
+
+@pytest.fixture
+def genres():
+    from reviews.models import Genre
+    return [
+        Genre.objects.create(name=f'Жанр {index}', slug=f'genre-{index}')
+        for index in range(3)
+    ]
+
+
+@pytest.fixture
+def titles(category, genres):
+    from reviews.models import Title
+    titles = []
+    for index in range(30):
+        title = Title.objects.create(
+            name=f'Произведение {index}',
+            year=2000 + index % 20,
+            category=category
+        )
+        title.genre.set(genres[:index % 3 + 1])
+        titles.append(title)
+    return titles
+
+
+@pytest.fixture
+def users():
+    from reviews.models import CustomUser
+    return [
+        CustomUser.objects.create(
+            username=f'user{index}', email=f'user{index}@yamdb.ru'
+        )
+        for index in range(5)
+    ]
+
+
+@pytest.fixture
+def reviews(titles, users):
+    from reviews.models import Comment, Review
+    reviews = []
+    for index, user in enumerate(users):
+        review = Review.objects.create(
+            author=user, title=titles[0], text=f'Отзыв {index}', score=index + 5
+        )
+        for author in users:
+            Comment.objects.create(
+                author=author, review=review, text=f'Комментарий {author}'
+            )
+        reviews.append(review)
+    return reviews
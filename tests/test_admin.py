@@ -0,0 +1,64 @@
+import pytest
+
+
+@pytest.mark.django_db
+class TestAdmin:
+
+    @pytest.fixture
+    def admin_client(self, client):
+        from reviews.models import CustomUser
+        superuser = CustomUser.objects.create_superuser(
+            username='superuser', email='superuser@yamdb.ru',
+            password='password'
+        )
+        client.force_login(superuser)
+        return client
+
+    @pytest.mark.parametrize('model', (
+        'title', 'genretitle', 'review', 'comment', 'customuser'
+    ))
+    def test_changelist_queries(
+        self, admin_client, django_assert_max_num_queries, model, reviews
+    ):
+        # Сессия, пользователь, фильтры, COUNT и строки с join.
+        with django_assert_max_num_queries(8):
+            response = admin_client.get(f'/admin/reviews/{model}/')
+
+        assert response.status_code == 200, (
+            f'Проверьте, что список `/admin/reviews/{model}/` открывается'
+        )
+
+    def test_author_filters_removed(self, admin_client, reviews):
+        content = admin_client.get('/admin/reviews/review/').content.decode()
+        assert 'author__id__exact' not in content, (
+            'Проверьте, что в админке отзывов нет фильтра по всем авторам'
+        )
+
+    def test_autocomplete(self, admin_client, users):
+        response = admin_client.get(
+            '/admin/reviews/customuser/autocomplete/', {'term': 'user1'}
+        )
+
+        assert [row['text'] for row in response.json()['results']] == [
+            'user1'
+        ], (
+            'Проверьте, что пользователи ищутся по началу имени'
+        )
+
+    def test_title_search(self, admin_client, titles):
+        response = admin_client.get(
+            '/admin/reviews/title/', {'q': 'Произведение'}
+        )
+        assert response.context['cl'].result_count == len(titles)
+
+    def test_count_limited(self, settings, titles):
+        from reviews.admin import ApproximateCountPaginator
+        from reviews.models import Title
+        settings.ADMIN_COUNT_LIMIT = 10
+
+        paginator = ApproximateCountPaginator(Title.objects.all(), 5)
+        assert paginator.count == 10, (
+            'Проверьте, что админка считает строки не дальше '
+            'ADMIN_COUNT_LIMIT'
+        )
+        assert paginator.num_pages == 2
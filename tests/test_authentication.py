@@ -0,0 +1,123 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+@pytest.mark.django_db
+class TestClaimsAuthentication:
+
+    @staticmethod
+    def auth(user):
+        from api.authentication import get_access_token
+        return {'HTTP_AUTHORIZATION': f'Bearer {get_access_token(user)}'}
+
+    @pytest.fixture
+    def admin(self):
+        from reviews.models import CustomUser
+        return CustomUser.objects.create(
+            username='boss', email='boss@yamdb.ru', role='admin'
+        )
+
+    def test_user_not_loaded_from_db(self, client, admin, titles):
+        from reviews.models import CustomUser
+        with CaptureQueriesContext(connection) as context:
+            response = client.get('/api/v1/users/me/', **self.auth(admin))
+            client.post(
+                '/api/v1/categories/', {'name': 'Игра', 'slug': 'game'},
+                content_type='application/json', **self.auth(admin)
+            )
+
+        assert response.json()['username'] == 'boss'
+        assert sum(
+            CustomUser._meta.db_table in query['sql']
+            for query in context.captured_queries
+        ) == 1, (
+            'Проверьте, что пользователь берётся из claims токена '
+            'и загружается из базы только в `/api/v1/users/me/`'
+        )
+        client.post(
+            f'/api/v1/titles/{titles[0].id}/reviews/',
+            {'text': 'Отзыв', 'score': 7},
+            content_type='application/json', **self.auth(admin)
+        )
+        assert titles[0].reviews.get().author == admin, (
+            'Проверьте, что автором отзыва становится пользователь из токена'
+        )
+
+    def test_claims_cached_by_default(self, client, admin, titles):
+        from django.conf import settings
+        from django.core.cache import cache
+        from reviews.models import CustomUser
+        assert 0 < settings.JWT_CLAIMS_CACHE_TIMEOUT <= 60, (
+            'Проверьте, что с кэшем в памяти процесса время изменения '
+            'прав кэшируется ненадолго'
+        )
+        headers = self.auth(admin)
+        cache.clear()
+
+        with CaptureQueriesContext(connection) as context:
+            for _ in range(3):
+                client.post(
+                    '/api/v1/categories/', {'name': 'Игра', 'slug': 'game'},
+                    content_type='application/json', **headers
+                )
+        assert sum(
+            CustomUser._meta.db_table in query['sql']
+            for query in context.captured_queries
+        ) == 1, (
+            'Проверьте, что по умолчанию время изменения прав читается '
+            'из базы один раз, а не на каждый запрос'
+        )
+
+    def test_role_change_invalidates_claims(
+        self, client, admin, shared_claims_cache
+    ):
+        from reviews.models import CustomUser
+        demoted = CustomUser.objects.create(
+            username='former', email='former@yamdb.ru', role='admin'
+        )
+        headers = self.auth(demoted)
+        assert client.get('/api/v1/users/', **headers).status_code == 200
+
+        client.patch(
+            '/api/v1/users/former/', {'role': 'user'},
+            content_type='application/json', **self.auth(admin)
+        )
+
+        assert client.get('/api/v1/users/', **headers).status_code == 403, (
+            'Проверьте, что после смены роли старый токен не даёт '
+            'прежних прав'
+        )
+
+    @pytest.mark.parametrize('claims_cache_timeout', (0, 3600))
+    def test_role_change_survives_cache_eviction(
+        self, client, settings, admin, claims_cache_timeout
+    ):
+        from django.core.cache import cache
+        from reviews.models import CustomUser
+        settings.JWT_CLAIMS_CACHE_TIMEOUT = claims_cache_timeout
+        demoted = CustomUser.objects.create(
+            username='former', email='former@yamdb.ru', role='admin'
+        )
+        headers = self.auth(demoted)
+        assert client.get('/api/v1/users/', **headers).status_code == 200
+
+        demoted.role = 'user'
+        demoted.save()
+        # Кэш вытеснил отметку или изменение сделал другой процесс.
+        cache.clear()
+
+        assert client.get('/api/v1/users/', **headers).status_code == 403, (
+            'Проверьте, что при промахе кэша время изменения прав '
+            'читается из базы, а не считается неизменным'
+        )
+        assert CustomUser.objects.get(pk=demoted.pk).claims_changed
+
+    def test_unchanged_claims_not_bumped(self, admin):
+        from reviews.models import CustomUser
+        admin.bio = 'Биография'
+        admin.save()
+        assert CustomUser.objects.get(pk=admin.pk).claims_changed is None, (
+            'Проверьте, что изменение полей, не влияющих на права, '
+            'не отзывает токены'
+        )
@@ -0,0 +1,146 @@
+import pytest
+
+
+@pytest.mark.django_db
+class TestConditionalGet:
+
+    def test_title_detail_not_modified(
+        self, client, django_assert_num_queries, titles
+    ):
+        url = f'/api/v1/titles/{titles[0].id}/'
+        response = client.get(url)
+
+        assert response.has_header('ETag'), (
+            'Проверьте, что `/api/v1/titles/{id}/` отдаёт заголовок ETag'
+        )
+        assert response.has_header('Last-Modified'), (
+            'Проверьте, что `/api/v1/titles/{id}/` отдаёт заголовок '
+            'Last-Modified'
+        )
+        # Ответ берётся из кэша, ETag считается по нему без запросов.
+        with django_assert_num_queries(0):
+            not_modified = client.get(
+                url, HTTP_IF_NONE_MATCH=response['ETag']
+            )
+        assert not_modified.status_code == 304, (
+            'Проверьте, что при совпадении If-None-Match возвращается 304'
+        )
+        not_modified = client.get(
+            url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified']
+        )
+        assert not_modified.status_code == 304, (
+            'Проверьте, что при неизменённом объекте If-Modified-Since '
+            'возвращает 304'
+        )
+
+    def test_reviews_list_etag_changes(self, client, reviews, titles):
+        from reviews.models import CustomUser, Review
+        url = f'/api/v1/titles/{titles[0].id}/reviews/'
+        etag = client.get(url)['ETag']
+
+        assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+        author = CustomUser.objects.create(username='new', email='new@a.ru')
+        Review.objects.create(author=author, title=titles[0], text='т', score=1)
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200, (
+            'Проверьте, что новый отзыв меняет ETag ленты отзывов'
+        )
+
+    @pytest.mark.parametrize('feed', ('reviews', 'comments'))
+    def test_feed_not_modified_without_page_query(
+        self, client, django_assert_num_queries, reviews, titles, feed
+    ):
+        url = f'/api/v1/titles/{titles[0].id}/reviews/'
+        if feed == 'comments':
+            url = f'{url}{reviews[0].id}/comments/'
+        response = client.get(url, {'cursor': ''})
+        assert response.has_header('Last-Modified'), (
+            'Проверьте, что ленты отдают заголовок Last-Modified'
+        )
+
+        # Только запрос родителя: страница не выбирается и не сериализуется.
+        with django_assert_num_queries(1):
+            not_modified = client.get(
+                url, {'cursor': ''}, HTTP_IF_NONE_MATCH=response['ETag']
+            )
+        assert not_modified.status_code == 304, (
+            'Проверьте, что при совпадении If-None-Match лента '
+            'возвращает 304'
+        )
+        assert client.get(
+            url, {'cursor': ''},
+            HTTP_IF_MODIFIED_SINCE=response['Last-Modified']
+        ).status_code == 304, (
+            'Проверьте, что If-Modified-Since учитывается в лентах'
+        )
+        assert client.get(
+            url, {'cursor': '', 'limit': 1},
+            HTTP_IF_NONE_MATCH=response['ETag']
+        ).status_code == 200, (
+            'Проверьте, что у разных страниц ленты разные ETag'
+        )
+
+    def test_feeds_etag_changes_on_edit(self, client, reviews, titles):
+        review = reviews[0]
+        reviews_url = f'/api/v1/titles/{titles[0].id}/reviews/'
+        comments_url = f'{reviews_url}{review.id}/comments/'
+        reviews_etag = client.get(reviews_url)['ETag']
+        comments_etag = client.get(comments_url)['ETag']
+
+        review.text = 'Новый текст'
+        review.save()
+        comment = review.comments.first()
+        comment.text = 'Новый текст'
+        comment.save()
+
+        assert client.get(
+            reviews_url, HTTP_IF_NONE_MATCH=reviews_etag
+        ).status_code == 200, (
+            'Проверьте, что изменение текста отзыва меняет ETag ленты'
+        )
+        assert client.get(
+            comments_url, HTTP_IF_NONE_MATCH=comments_etag
+        ).status_code == 200, (
+            'Проверьте, что изменение комментария меняет ETag ленты'
+        )
+
+    def test_comments_list_etag_changes_on_delete(
+        self, client, reviews, titles
+    ):
+        review = reviews[0]
+        url = f'/api/v1/titles/{titles[0].id}/reviews/{review.id}/comments/'
+        etag = client.get(url)['ETag']
+        review.comments.order_by('pub_date').first().delete()
+
+        assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 200, (
+            'Проверьте, что удаление комментария меняет ETag ленты'
+        )
+
+    def test_reviews_validators_change_on_author_rename(
+        self, client, reviews, titles
+    ):
+        from django.utils import timezone
+        from reviews.models import Review
+        review = reviews[0]
+        Review.objects.update(
+            updated=timezone.now() - timezone.timedelta(days=1)
+        )
+        url = f'/api/v1/titles/{titles[0].id}/reviews/'
+        etag = client.get(url, {'cursor': ''})['ETag']
+        last_modified = client.get(f'{url}{review.id}/')['Last-Modified']
+
+        review.author.username = 'renamed'
+        review.author.save()
+
+        assert client.get(
+            url, {'cursor': ''}, HTTP_IF_NONE_MATCH=etag
+        ).status_code == 200, (
+            'Проверьте, что переименование автора меняет ETag ленты'
+        )
+        assert client.get(
+            f'{url}{review.id}/', HTTP_IF_MODIFIED_SINCE=last_modified
+        ).status_code == 200, (
+            'Проверьте, что переименование автора меняет дату изменения '
+            'его отзывов'
+        )
@@ -0,0 +1,113 @@
+import pytest
+from django.db import DatabaseError
+from psycopg2 import extensions
+
+
+class FakeConnection:
+    """Минимальная замена соединения psycopg2 для проверки пула."""
+
+    def __init__(self, healthy=True):
+        self.closed = False
+        self.autocommit = True
+        self.healthy = healthy
+        self.status = extensions.TRANSACTION_STATUS_IDLE
+
+    def get_transaction_status(self):
+        if self.closed:
+            return extensions.TRANSACTION_STATUS_UNKNOWN
+        return self.status
+
+    def rollback(self):
+        self.status = extensions.TRANSACTION_STATUS_IDLE
+
+    def close(self):
+        self.closed = True
+
+    def cursor(self):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    def execute(self, sql):
+        import psycopg2
+        if not self.healthy:
+            raise psycopg2.OperationalError('server closed the connection')
+
+
+class TestConnectionPool:
+
+    @pytest.fixture
+    def pool(self):
+        from api_yamdb.db_pool.base import ConnectionPool
+        return ConnectionPool(
+            max_size=2, timeout=0.05, check_after=0, max_idle=300,
+            alias='pool-test'
+        )
+
+    def test_connection_reused(self, pool):
+        first = pool.getconn(FakeConnection)
+        pool.putconn(first)
+
+        assert pool.getconn(FakeConnection) is first, (
+            'Проверьте, что пул выдаёт возвращённое соединение повторно'
+        )
+        assert pool.stats()['open'] == 1
+
+    def test_size_capped(self, pool):
+        pool.getconn(FakeConnection)
+        pool.getconn(FakeConnection)
+
+        with pytest.raises(DatabaseError):
+            pool.getconn(FakeConnection)
+        assert pool.stats()['waits'] == 1, (
+            'Проверьте, что пул считает ожидания свободного соединения'
+        )
+
+    def test_stale_and_broken_connections_replaced(self, pool):
+        stale = pool.getconn(lambda: FakeConnection(healthy=False))
+        pool.putconn(stale)
+        fresh = pool.getconn(FakeConnection)
+
+        assert fresh is not stale and stale.closed, (
+            'Проверьте, что соединение проверяется перед выдачей из пула'
+        )
+        fresh.status = extensions.TRANSACTION_STATUS_INTRANS
+        pool.putconn(fresh)
+        assert fresh.status == extensions.TRANSACTION_STATUS_IDLE, (
+            'Проверьте, что незавершённая транзакция откатывается'
+        )
+        broken = pool.getconn(FakeConnection)
+        broken.close()
+        pool.putconn(broken)
+        assert pool.stats() == {
+            'open': 0, 'idle': 0, 'in_use': 0, 'waits': 0, 'max_size': 2
+        }
+
+    def test_stats_exported(self, pool):
+        from prometheus_client import REGISTRY
+
+        def sample(name, **labels):
+            return REGISTRY.get_sample_value(
+                name, {'alias': 'pool-test', **labels}
+            ) or 0
+
+        waits = sample('yamdb_db_pool_waits_total')
+        first = pool.getconn(FakeConnection)
+        pool.getconn(FakeConnection)
+        with pytest.raises(DatabaseError):
+            pool.getconn(FakeConnection)
+        pool.putconn(first)
+
+        assert {
+            state: sample('yamdb_db_pool_connections', state=state)
+            for state in ('open', 'idle', 'in_use', 'max_size')
+        } == {'open': 2, 'idle': 1, 'in_use': 1, 'max_size': 2}, (
+            'Проверьте, что состояние пула публикуется в метрики'
+        )
+        assert sample('yamdb_db_pool_waits_total') == waits + 1, (
+            'Проверьте, что ожидания соединения считаются в метриках'
+        )
@@ -0,0 +1,148 @@
+import pytest
+from django.db import connections
+from django.test import Client
+
+
+@pytest.fixture
+def replica():
+    """Реплика — второе подключение к той же тестовой базе SQLite."""
+    replica = {
+        **connections['default'].settings_dict, 'TEST': {'MIRROR': 'default'}
+    }
+    connections.databases['replica'] = replica
+    yield
+    connections['replica'].close()
+    del connections.databases['replica']
+    del connections['replica']
+
+
+@pytest.mark.django_db(transaction=True)
+class TestReplicaRouting:
+
+    @pytest.fixture
+    def author_client(self, client, users):
+        from api.authentication import get_access_token
+        client.defaults['HTTP_AUTHORIZATION'] = (
+            f'Bearer {get_access_token(users[0])}'
+        )
+        return client
+
+    def test_reads_go_to_replica(self, client, replica, titles):
+        response = client.get(f'/api/v1/titles/{titles[0].id}/reviews/')
+
+        assert response.status_code == 200
+        assert response['X-DB-Alias'] == 'replica', (
+            'Проверьте, что GET-запросы к API читают из реплики'
+        )
+
+    def test_client_pinned_after_write(self, author_client, replica, titles):
+        url = f'/api/v1/titles/{titles[0].id}/reviews/'
+        response = author_client.post(
+            url, {'text': 'Отзыв', 'score': 8},
+            content_type='application/json'
+        )
+        assert response['X-DB-Alias'] == 'default'
+
+        response = author_client.get(url)
+        assert response['X-DB-Alias'] == 'default', (
+            'Проверьте, что после записи клиент читает из основной базы'
+        )
+        assert response.json()['count'] == 1
+        # Другой клиент: без токена и без cookie автора.
+        assert Client().get(url)['X-DB-Alias'] == 'replica', (
+            'Проверьте, что другие клиенты по-прежнему читают из реплики'
+        )
+
+    def test_pin_carried_by_cookie(self, author_client, replica, titles):
+        from django.core.cache import cache
+        url = f'/api/v1/titles/{titles[0].id}/reviews/'
+        author_client.post(
+            url, {'text': 'Отзыв', 'score': 8},
+            content_type='application/json'
+        )
+        # Следующий запрос обслуживает процесс, не видевший записи.
+        cache.clear()
+
+        assert author_client.get(url)['X-DB-Alias'] == 'default', (
+            'Проверьте, что закрепление за основной базой приходит '
+            'с клиентом, а не только из кэша процесса'
+        )
+        author_client.cookies['db_pinned'] = 'forged'
+        assert author_client.get(url)['X-DB-Alias'] == 'replica'
+
+    def test_anonymous_pin_not_shared(self, client, replica, titles):
+        url = f'/api/v1/titles/{titles[0].id}/reviews/'
+        # За прокси у всех анонимных клиентов один REMOTE_ADDR.
+        client.post(url, {'text': 'Отзыв', 'score': 8})
+
+        assert client.get(url)['X-DB-Alias'] == 'default'
+        assert Client().get(url)['X-DB-Alias'] == 'replica', (
+            'Проверьте, что запись анонимного клиента не закрепляет '
+            'за основной базой других клиентов с тем же адресом'
+        )
+
+    def test_replica_reads_not_cached(self, client, replica, titles):
+        url = f'/api/v1/titles/{titles[0].id}/'
+        client.get(url)
+        response = client.get(url)
+
+        assert response['X-Cache'] == 'MISS', (
+            'Проверьте, что ответы, прочитанные из реплики, '
+            'не сохраняются в кэш ответов'
+        )
+
+    def test_demoted_admin_checked_on_primary(self, client, replica, titles):
+        from api.authentication import get_access_token
+        from django.core.cache import cache
+        from reviews.models import CustomUser
+        admin = CustomUser.objects.create(
+            username='demoted', email='demoted@yamdb.ru', role='admin'
+        )
+        client.defaults['HTTP_AUTHORIZATION'] = (
+            f'Bearer {get_access_token(admin)}'
+        )
+        admin.role = 'user'
+        admin.save()
+        # Запрос обслуживает процесс, в кэше которого ничего нет.
+        cache.clear()
+
+        replica_sql = []
+
+        def record(execute, sql, params, many, context):
+            replica_sql.append(sql)
+            return execute(sql, params, many, context)
+
+        with connections['replica'].execute_wrapper(record):
+            response = client.get('/api/v1/titles/')
+            assert response['X-DB-Alias'] == 'replica'
+            response = client.get('/api/v1/users/')
+
+        assert response.status_code == 403, (
+            'Проверьте, что токен администратора, лишённого прав, '
+            'больше не даёт прав администратора'
+        )
+        assert not any('reviews_customuser' in sql for sql in replica_sql), (
+            'Проверьте, что права пользователя проверяются по основной '
+            'базе, а не по реплике'
+        )
+
+    def test_without_replica_reads_default(self, client, titles):
+        response = client.get(f'/api/v1/titles/{titles[0].id}/reviews/')
+        assert response['X-DB-Alias'] == 'default'
+
+    def test_transaction_reads_default(self):
+        from django.db import transaction
+        from reviews.models import Title
+
+        from api_yamdb.db_router import (ReplicaRouter, RoutingState,
+                                         routing_state)
+        token = routing_state.set(RoutingState('replica'))
+        try:
+            assert ReplicaRouter().db_for_read(Title) == 'replica'
+            with transaction.atomic():
+                assert ReplicaRouter().db_for_read(Title) == 'default', (
+                    'Проверьте, что внутри транзакции чтение идёт '
+                    'из основной базы'
+                )
+        finally:
+            routing_state.reset(token)
@@ -0,0 +1,97 @@
+import pytest
+
+
+@pytest.mark.django_db
+class TestDeletion:
+
+    @pytest.fixture
+    def admin_client(self, client):
+        from api.authentication import get_access_token
+        from reviews.models import CustomUser
+        admin = CustomUser.objects.create(
+            username='remover', email='remover@yamdb.ru', role='admin'
+        )
+        client.defaults['HTTP_AUTHORIZATION'] = (
+            f'Bearer {get_access_token(admin)}'
+        )
+        return client
+
+    def test_delete_title(
+        self, admin_client, django_assert_num_queries, titles, reviews
+    ):
+        from reviews.models import Comment, GenreTitle, Review, ScoreCount
+        title = titles[0]
+        # Число запросов не зависит от числа отзывов и комментариев.
+        with django_assert_num_queries(12):
+            response = admin_client.delete(f'/api/v1/titles/{title.id}/')
+
+        assert response.status_code == 204
+        assert not Review.objects.exists() and not Comment.objects.exists(), (
+            'Проверьте, что удаление произведения удаляет его отзывы '
+            'и комментарии к ним'
+        )
+        assert not GenreTitle.objects.filter(title_id=title.id).exists()
+        assert not ScoreCount.objects.filter(title_id=title.id).exists()
+
+    def test_delete_user(self, admin_client, titles, users, reviews):
+        from reviews.models import Comment, ScoreCount, Title
+        author = users[0]
+        response = admin_client.delete(f'/api/v1/users/{author.username}/')
+
+        assert response.status_code == 204
+        assert not Comment.objects.filter(author=author.id).exists()
+        assert not Comment.objects.filter(review=reviews[0].id).exists(), (
+            'Проверьте, что удаляются комментарии к отзывам пользователя'
+        )
+        title = Title.objects.get(pk=titles[0].pk)
+        assert (title.rating_count, title.rating) == (4, 7.5), (
+            'Проверьте, что удаление пользователя пересчитывает рейтинг '
+            'оценённых им произведений'
+        )
+        assert not ScoreCount.objects.filter(title=title, score=5).exists()
+
+    def test_delete_category(self, admin_client, category, titles):
+        from django.utils import timezone
+        from reviews.models import Title
+        updated = timezone.now() - timezone.timedelta(days=1)
+        Title.objects.update(updated=updated)
+        response = admin_client.delete(f'/api/v1/categories/{category.slug}/')
+
+        assert response.status_code == 204
+        assert Title.objects.count() == len(titles)
+        assert not Title.objects.filter(category__isnull=False).exists(), (
+            'Проверьте, что удаление категории убирает её у произведений'
+        )
+        assert Title.objects.get(pk=titles[0].pk).updated > updated
+
+    def test_delete_genre(self, admin_client, genres, titles):
+        from reviews.models import GenreTitle
+        response = admin_client.delete(f'/api/v1/genres/{genres[0].slug}/')
+
+        assert response.status_code == 204
+        assert not GenreTitle.objects.filter(genre_id=genres[0].id).exists()
+        assert GenreTitle.objects.filter(genre=genres[1]).exists()
+
+    @pytest.mark.django_db(transaction=True)
+    def test_deleted_title_not_served_from_cache(
+        self, admin_client, titles, reviews
+    ):
+        from reviews.leaderboards import refresh_leaderboard
+        from reviews.models import TopTitle
+        refresh_leaderboard(TopTitle.SCOPE_ALL)
+        title = titles[0]
+        admin_client.get('/api/v1/titles/')
+        admin_client.get(f'/api/v1/titles/{title.id}/')
+        admin_client.delete(f'/api/v1/titles/{title.id}/')
+
+        assert admin_client.get(
+            f'/api/v1/titles/{title.id}/'
+        ).status_code == 404
+        names = [
+            row['name']
+            for row in admin_client.get('/api/v1/titles/').json()['results']
+        ]
+        assert title.name not in names, (
+            'Проверьте, что удалённое произведение не отдаётся из кэша'
+        )
+        assert admin_client.get('/api/v1/titles/top/').json()['count'] == 0
@@ -0,0 +1,46 @@
+import json
+
+import pytest
+
+
+@pytest.mark.django_db
+class TestExport:
+    url = '/api/v1/export/'
+
+    @pytest.fixture
+    def admin_client(self, client):
+        from reviews.models import CustomUser
+        from rest_framework_simplejwt.tokens import RefreshToken
+        admin = CustomUser.objects.create(
+            username='exporter', email='exporter@yamdb.ru', role='admin'
+        )
+        client.defaults['HTTP_AUTHORIZATION'] = (
+            f'Bearer {RefreshToken.for_user(admin).access_token}'
+        )
+        return client
+
+    def test_export_streams_ndjson(self, admin_client, titles, reviews):
+        response = admin_client.get(self.url, {'types': 'titles,reviews'})
+        records = [
+            json.loads(line)
+            for line in b''.join(response.streaming_content).splitlines()
+        ]
+
+        assert response['Content-Type'] == 'application/x-ndjson'
+        assert [record['type'] for record in records] == (
+            ['title'] * len(titles) + ['review'] * len(reviews)
+        ), 'Проверьте, что выгружаются только запрошенные типы записей'
+        assert records[0]['genre'] and records[0]['category'], (
+            'Проверьте, что произведения выгружаются с жанрами и категорией'
+        )
+
+    def test_export_since_and_validation(self, admin_client, titles):
+        response = admin_client.get(self.url, {'since': '2999-01-01'})
+        assert b''.join(response.streaming_content) == b'', (
+            'Проверьте, что параметр since отбрасывает старые записи'
+        )
+        response = admin_client.get(self.url, {'types': 'users'})
+        assert response.status_code == 400
+
+    def test_export_admin_only(self, client):
+        assert client.get(self.url).status_code == 401
@@ -0,0 +1,76 @@
+import pytest
+from rest_framework.renderers import JSONRenderer
+
+
+def render(data):
+    return JSONRenderer().render(data)
+
+
+@pytest.mark.django_db
+class TestFastSerializers:
+
+    @pytest.fixture
+    def edge_titles(self, titles, users, reviews):
+        """Произведения без категории, описания и с дробным рейтингом."""
+        from reviews.models import Review
+        titles[1].category = None
+        titles[1].description = None
+        titles[1].save()
+        titles[2].description = 'Описание "в кавычках" и с \\ слэшем'
+        titles[2].save()
+        for user, score in zip(users, (7, 8)):
+            Review.objects.create(
+                author=user, title=titles[2], text='Отзыв', score=score
+            )
+        return titles
+
+    def test_titles_match_title_serializer(self, edge_titles):
+        from api.fast_serializers import TitleRowSerializer
+        from api.serializers import TitleSerializer
+        from api.views import TitlesViewSet
+        queryset = TitlesViewSet.queryset.all()
+        serializer = TitleRowSerializer()
+
+        assert render(
+            serializer.to_representation(serializer.get_rows(queryset))
+        ) == render(TitleSerializer(queryset, many=True).data), (
+            'Проверьте, что TitleRowSerializer выдаёт тот же JSON, '
+            'что и TitleSerializer'
+        )
+
+    @pytest.mark.parametrize('row_serializer,serializer,queryset', (
+        ('ReviewRowSerializer', 'ReviewSerializer', 'reviews'),
+        ('CommentRowSerializer', 'CommentSerializer', 'comments'),
+    ))
+    def test_feeds_match_serializers(
+        self, reviews, row_serializer, serializer, queryset
+    ):
+        from api import fast_serializers, serializers
+        from reviews.models import Comment, Review
+        queryset = {
+            'reviews': Review.objects.select_related('author'),
+            'comments': Comment.objects.select_related('author'),
+        }[queryset]
+        row_serializer = getattr(fast_serializers, row_serializer)()
+        serializer = getattr(serializers, serializer)
+
+        assert render(
+            row_serializer.to_representation(
+                row_serializer.get_rows(queryset)
+            )
+        ) == render(serializer(queryset, many=True).data), (
+            f'Проверьте, что {row_serializer.__class__.__name__} выдаёт '
+            f'тот же JSON, что и {serializer.__name__}'
+        )
+
+    def test_cursor_pagination_with_rows(self, client, titles, reviews):
+        url = f'/api/v1/titles/{titles[0].id}/reviews/'
+        first = client.get(url, {'cursor': '', 'limit': 2}).json()
+        second = client.get(first['next']).json()
+
+        assert [review['id'] for review in first['results']] == [
+            review.id for review in reversed(reviews[-2:])
+        ]
+        assert second['results'][0]['id'] == reviews[-3].id, (
+            'Проверьте, что курсорная пагинация работает со строками values()'
+        )
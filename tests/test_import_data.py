@@ -0,0 +1,56 @@
+import json
+
+import pytest
+from django.core.management import call_command
+
+
+@pytest.mark.django_db
+class TestImportData:
+
+    def test_import_resolves_references_and_ratings(self, tmp_path):
+        from reviews.models import Review, Title
+        files = {
+            'users.csv': 'id,username,email\n1,reader,reader@yamdb.ru\n',
+            'categories.csv': 'id,name,slug\n1,Фильм,movie\n',
+            'genres.csv': (
+                'id,name,slug\n1,Драма,drama\n2,Антиутопия,1984\n'
+            ),
+            'titles.csv': (
+                'id,name,year,category\n'
+                '1,Побег из Шоушенка,1994,movie\n'
+                '2,Крёстный отец,1972,1\n'
+                '3,Без категории,1972,unknown\n'
+            ),
+            'genre_title.csv': (
+                'title_id,genre,genre_id\n1,drama,\n2,1,\n2,1984,\n'
+                '1,,1984\n'
+            ),
+            'reviews.ndjson': '\n'.join(json.dumps(row) for row in (
+                {'title_id': 1, 'author': 'reader', 'text': 'ok',
+                 'score': 9, 'pub_date': '2019-09-24T21:08:21Z'},
+                {'title': 2, 'author': 1, 'text': 'ok', 'score': 6},
+            )),
+        }
+        for name, content in files.items():
+            (tmp_path / name).write_text(content, encoding='utf-8')
+            call_command(
+                'import_data', name.split('.')[0], str(tmp_path / name),
+                batch_size=1
+            )
+
+        assert Title.objects.count() == 2, (
+            'Проверьте, что строки с ненайденными ссылками пропускаются'
+        )
+        assert Title.objects.get(pk=1).genre.get().slug == 'drama'
+        assert set(
+            Title.objects.get(pk=2).genre.values_list('slug', flat=True)
+        ) == {'drama', '1984'}, (
+            'Проверьте, что ссылка из цифр ищется по slug, а если такого '
+            'slug нет — по id, а колонка `<имя>_id` — только по id'
+        )
+        assert Title.objects.get(pk=1).rating == 9, (
+            'Проверьте, что загрузка отзывов обновляет рейтинг произведений'
+        )
+        assert Review.objects.get(title_id=1).pub_date.year == 2019, (
+            'Проверьте, что дата публикации берётся из файла'
+        )
@@ -0,0 +1,66 @@
+import json
+import logging
+
+import pytest
+
+
+@pytest.mark.django_db
+class TestRequestMetrics:
+
+    @pytest.fixture
+    def metrics_settings(self, settings):
+        settings.REQUEST_METRICS = True
+        settings.SLOW_REQUEST_MS = 10 ** 6
+        settings.REQUEST_METRICS_DUPLICATES = False
+        return settings
+
+    def test_server_timing_header(self, client, metrics_settings, titles):
+        response = client.get('/api/v1/titles/')
+
+        timing = dict(
+            part.split(';', 1)[0:2]
+            for part in response['Server-Timing'].split(', ')
+        )
+        assert set(timing) == {'sql', 'serialize', 'render', 'total'}, (
+            'Проверьте, что заголовок Server-Timing содержит время SQL, '
+            'сериализации, рендеринга и всего запроса'
+        )
+        assert 'desc="3 queries"' in timing['sql'], (
+            'Проверьте, что Server-Timing содержит число SQL-запросов'
+        )
+
+    def test_disabled_by_default(self, client, titles):
+        assert not client.get('/api/v1/titles/').has_header('Server-Timing'), (
+            'Проверьте, что без REQUEST_METRICS замеры не включаются'
+        )
+
+    def test_slow_request_logged(
+        self, client, caplog, metrics_settings, titles
+    ):
+        metrics_settings.SLOW_REQUEST_MS = 0
+        with caplog.at_level(logging.WARNING, logger='api.middleware'):
+            client.get(f'/api/v1/titles/{titles[0].id}/')
+
+        record = json.loads(caplog.records[-1].args[0])
+        assert record['view'] == 'TitlesViewSet', (
+            'Проверьте, что в журнал медленных запросов пишется вьюсет'
+        )
+        assert record['action'] == 'retrieve'
+        assert record['route'] == 'api/v1/titles/(?P<pk>[^/.]+)/$'
+        assert record['queries'] == 2 and record['status'] == 200
+
+    def test_duplicate_queries_detected(self, users):
+        from api.instrumentation import RequestMetrics
+        from django.db import connection
+        from reviews.models import CustomUser
+        metrics = RequestMetrics(track_duplicates=True)
+        with connection.execute_wrapper(metrics.record_query):
+            for user in users:
+                CustomUser.objects.get(pk=user.pk)
+            CustomUser.objects.count()
+
+        assert list(metrics.duplicates(3).values()) == [len(users)], (
+            'Проверьте, что повторяющийся SQL с разными параметрами '
+            'считается как N+1'
+        )
+        assert metrics.queries == len(users) + 1
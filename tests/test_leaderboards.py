@@ -0,0 +1,131 @@
+import pytest
+from django.core.management import call_command
+
+
+@pytest.mark.django_db
+class TestLeaderboards:
+
+    @pytest.fixture
+    def rated_titles(self, settings, titles, users):
+        """Произведения 1–6: у i-го i отзывов с оценкой i."""
+        from reviews.models import Review
+        settings.LEADERBOARD_MIN_REVIEWS = 2
+        for index in range(1, 7):
+            for user in users[:min(index, len(users))]:
+                Review.objects.create(
+                    author=user, title=titles[index], text='Отзыв',
+                    score=index
+                )
+        return titles
+
+    def top_ids(self, client, **params):
+        response = client.get('/api/v1/titles/top/', params)
+        assert response.status_code == 200, (
+            'Проверьте, что GET-запрос к `/api/v1/titles/top/` '
+            'возвращает статус 200'
+        )
+        return [row['title']['id'] for row in response.json()['results']]
+
+    def test_top_titles(self, client, rated_titles):
+        assert self.top_ids(client) == [
+            rated_titles[index].id for index in range(6, 1, -1)
+        ], (
+            'Проверьте, что `/api/v1/titles/top/` упорядочен по рейтингу '
+            'и не содержит произведений с малым числом отзывов'
+        )
+        assert self.top_ids(client, genre='genre-2') == [
+            rated_titles[5].id, rated_titles[2].id
+        ], (
+            'Проверьте, что `/api/v1/titles/top/?genre=` возвращает '
+            'рейтинг жанра'
+        )
+        assert self.top_ids(client, category='films')[0] == (
+            rated_titles[6].id
+        )
+        response = client.get('/api/v1/titles/top/', {'genre': 'unknown'})
+        assert response.status_code == 404, (
+            'Проверьте, что рейтинг неизвестного жанра возвращает 404 '
+            'и не пересобирается'
+        )
+        from reviews.models import TopTitle
+        assert not TopTitle.objects.filter(scope_slug='unknown').exists()
+
+    def test_top_shows_stored_ratings(self, client, rated_titles):
+        from reviews.models import Review
+        self.top_ids(client)
+        # Отзывы после пересборки: места остаются прежними.
+        Review.objects.filter(title=rated_titles[6]).update(score=1)
+        rated_titles[6].reviews.first().save()
+
+        results = client.get('/api/v1/titles/top/').json()['results']
+        ratings = [row['rating'] for row in results]
+        assert ratings == sorted(ratings, reverse=True), (
+            'Проверьте, что рейтинг лучших показывает сохранённые '
+            'рейтинги, по которым расставлены места'
+        )
+        assert results[0]['title']['rating'] == 6
+        assert results[0]['rating_count'] == 5
+
+    def test_top_titles_refreshed_after_interval(
+        self, client, django_assert_max_num_queries, rated_titles
+    ):
+        from django.core.cache import cache
+        self.top_ids(client)
+        rated_titles[6].reviews.all().delete()
+
+        with django_assert_max_num_queries(4):
+            top = self.top_ids(client)
+        assert top[0] == rated_titles[6].id, (
+            'Проверьте, что рейтинг не пересобирается на каждый запрос'
+        )
+        cache.clear()
+        assert self.top_ids(client)[0] == rated_titles[5].id, (
+            'Проверьте, что рейтинг пересобирается по истечении '
+            'LEADERBOARD_REFRESH_INTERVAL'
+        )
+
+    def test_refresh_command(self, rated_titles, genres):
+        from reviews.models import TopTitle
+        TopTitle.objects.create(
+            scope=TopTitle.SCOPE_GENRE, scope_slug='deleted', position=1,
+            title=rated_titles[0], rating=10, rating_count=10
+        )
+
+        call_command('refresh_leaderboards')
+
+        assert not TopTitle.objects.filter(scope_slug='deleted').exists(), (
+            'Проверьте, что refresh_leaderboards удаляет рейтинги '
+            'удалённых жанров'
+        )
+        assert set(
+            TopTitle.objects.values_list('scope', 'scope_slug').distinct()
+        ) == {
+            ('all', ''), ('category', 'films'),
+            *(('genre', genre.slug) for genre in genres)
+        }, (
+            'Проверьте, что refresh_leaderboards пересобирает общий рейтинг '
+            'и рейтинги всех жанров и категорий'
+        )
+
+    def test_rebuilds_locked_per_scope(self, monkeypatch, rated_titles):
+        from reviews import leaderboards
+        from reviews.models import TopTitle
+        locked = []
+        monkeypatch.setattr(
+            leaderboards, 'lock_leaderboard',
+            lambda scope, slug='': locked.append((scope, slug))
+        )
+
+        call_command('refresh_leaderboards')
+
+        assert (TopTitle.SCOPE_ALL, '') in locked
+        assert (TopTitle.SCOPE_GENRE, 'genre-0') in locked
+        assert (TopTitle.SCOPE_CATEGORY, 'films') in locked, (
+            'Проверьте, что refresh_leaderboards блокирует каждый рейтинг '
+            'на время пересборки'
+        )
+        keys = {
+            leaderboards.get_lock_key(scope, slug) for scope, slug in locked
+        }
+        assert len(keys) == len(locked)
+        assert all(-2 ** 31 <= key < 2 ** 31 for key in keys)
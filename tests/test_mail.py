@@ -0,0 +1,63 @@
+import pytest
+from django.core import mail
+
+
+class FlakyConnection:
+    """Соединение, которое падает на первой отправке."""
+
+    def __init__(self):
+        self.attempts = 0
+
+    def open(self):
+        pass
+
+    def close(self):
+        pass
+
+    def send_messages(self, messages):
+        self.attempts += 1
+        if self.attempts == 1:
+            raise ConnectionError('SMTP недоступен')
+        mail.outbox.extend(messages)
+        return len(messages)
+
+
+@pytest.mark.django_db
+class TestMail:
+
+    def test_signup_mail_delivered_in_background(self, client):
+        from api.mail import dispatcher, mail_stats
+        sent = mail_stats()['sent']
+        response = client.post(
+            '/api/v1/auth/signup/',
+            {'username': 'newbie', 'email': 'newbie@yamdb.ru'}
+        )
+        dispatcher.flush()
+
+        assert response.status_code == 200
+        assert len(mail.outbox) == 1, (
+            'Проверьте, что письмо с кодом подтверждения доставляется'
+        )
+        assert mail.outbox[0].to == ['newbie@yamdb.ru']
+        assert 'код подтверждения' in mail.outbox[0].body
+        assert mail_stats()['sent'] == sent + 1
+        assert mail_stats()['queue_depth'] == 0
+
+    def test_delivery_retried(self):
+        from api.mail import MailDispatcher
+        from django.core.mail import EmailMessage
+        dispatcher = MailDispatcher(
+            workers=1, queue_size=1, retries=2, retry_delay=0,
+            idle_timeout=1
+        )
+        connection = FlakyConnection()
+        dispatcher.deliver(
+            connection, EmailMessage('Тема', 'Текст', to=['a@yamdb.ru']), 0
+        )
+
+        assert connection.attempts == 2, (
+            'Проверьте, что неудачная отправка письма повторяется'
+        )
+        assert dispatcher.stats()['retried'] == 1
+        assert dispatcher.stats()['sent'] == 1
+        assert len(mail.outbox) == 1
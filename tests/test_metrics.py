@@ -0,0 +1,100 @@
+import os
+import subprocess
+import sys
+
+import pytest
+from django.conf import settings as django_settings
+
+
+@pytest.mark.django_db
+class TestMetrics:
+
+    @pytest.fixture
+    def metrics_enabled(self, settings):
+        settings.PROMETHEUS_METRICS = True
+
+    def get_sample(self, name, **labels):
+        from prometheus_client import REGISTRY
+        return REGISTRY.get_sample_value(name, labels) or 0
+
+    def test_requests_observed(self, client, metrics_enabled, titles):
+        labels = {
+            'view': 'TitlesViewSet', 'action': 'list', 'method': 'GET',
+            'status': '200'
+        }
+        requests = self.get_sample('yamdb_http_requests_total', **labels)
+        hits = self.get_sample(
+            'yamdb_response_cache_requests_total', result='hit'
+        )
+        client.get('/api/v1/titles/')
+        client.get('/api/v1/titles/')
+
+        response = client.get('/metrics')
+        assert response.status_code == 200, (
+            'Проверьте, что `/metrics` возвращает статус 200'
+        )
+        assert b'yamdb_http_request_duration_seconds_bucket' in (
+            response.content
+        )
+        assert self.get_sample(
+            'yamdb_http_requests_total', **labels
+        ) == requests + 2, (
+            'Проверьте, что запросы считаются по вьюсету, действию и статусу'
+        )
+        assert self.get_sample(
+            'yamdb_response_cache_requests_total', result='hit'
+        ) == hits + 1, (
+            'Проверьте, что считаются попадания в кэш ответов'
+        )
+        assert self.get_sample(
+            'yamdb_http_request_db_queries_count',
+            view='TitlesViewSet', action='list'
+        ) >= 2
+
+    def test_mail_observed(self, client, metrics_enabled):
+        from api.mail import dispatcher
+        delivered = self.get_sample('yamdb_mail_delivery_seconds_count')
+        client.post(
+            '/api/v1/auth/signup/',
+            {'username': 'newbie', 'email': 'newbie@yamdb.ru'}
+        )
+        dispatcher.flush()
+
+        content = client.get('/metrics').content.decode()
+        assert 'yamdb_mail_queue_depth 0.0' in content, (
+            'Проверьте, что глубина очереди писем отдаётся в метриках'
+        )
+        assert self.get_sample(
+            'yamdb_mail_delivery_seconds_count'
+        ) == delivered + 1, (
+            'Проверьте, что время доставки писем учитывается в гистограмме'
+        )
+
+    def test_metrics_disabled(self, client):
+        assert client.get('/metrics').status_code == 404
+
+    def test_multiprocess_aggregation(
+        self, client, metrics_enabled, monkeypatch, tmp_path
+    ):
+        env = {
+            **os.environ,
+            'PROMETHEUS_MULTIPROC_DIR': str(tmp_path),
+            'PYTHONPATH': str(django_settings.BASE_DIR),
+        }
+        for _ in range(2):
+            subprocess.run(
+                [sys.executable, '-c', (
+                    'from api.metrics import REQUESTS; '
+                    "REQUESTS.labels('Worker', 'list', 'GET', '200').inc()"
+                )],
+                env=env, check=True
+            )
+        monkeypatch.setenv('PROMETHEUS_MULTIPROC_DIR', str(tmp_path))
+
+        content = client.get('/metrics').content.decode()
+        assert (
+            'yamdb_http_requests_total{action="list",method="GET",'
+            'status="200",view="Worker"} 2.0'
+        ) in content, (
+            'Проверьте, что `/metrics` суммирует метрики всех процессов'
+        )
@@ -0,0 +1,81 @@
+import pytest
+
+
+@pytest.mark.django_db
+class TestNestedQueries:
+
+    @pytest.fixture
+    def author_client(self, client, users):
+        from api.authentication import get_access_token
+        client.defaults['HTTP_AUTHORIZATION'] = (
+            f'Bearer {get_access_token(users[0])}'
+        )
+        return client
+
+    @pytest.fixture
+    def urls(self, reviews, users, titles):
+        review = reviews[0]
+        comment = review.comments.get(author=users[0])
+        reviews_url = f'/api/v1/titles/{review.title_id}/reviews/'
+        comments_url = f'{reviews_url}{review.id}/comments/'
+        return {
+            'reviews': reviews_url,
+            'review': f'{reviews_url}{review.id}/',
+            'new_review': f'/api/v1/titles/{titles[1].id}/reviews/',
+            'comments': comments_url,
+            'comment': f'{comments_url}{comment.id}/',
+        }
+
+    # Запросы внутри транзакции теста: SAVEPOINT и RELEASE тоже считаются.
+    @pytest.mark.parametrize('method,url,data,status,queries', (
+        ('get', 'reviews', None, 200, 3),
+        ('get', 'review', None, 200, 2),
+        ('post', 'new_review', {'text': 'Отзыв', 'score': 5}, 201, 10),
+        ('post', 'reviews', {'text': 'Отзыв', 'score': 5}, 400, 6),
+        ('patch', 'review', {'text': 'Отзыв'}, 200, 5),
+        ('delete', 'review', None, 204, 8),
+        ('get', 'comments', None, 200, 3),
+        ('get', 'comment', None, 200, 2),
+        ('post', 'comments', {'text': 'Комментарий'}, 201, 4),
+        ('patch', 'comment', {'text': 'Комментарий'}, 200, 4),
+        ('delete', 'comment', None, 204, 4),
+    ))
+    def test_nested_action_queries(
+        self, author_client, django_assert_num_queries, urls,
+        method, url, data, status, queries
+    ):
+        kwargs = {}
+        if data is not None:
+            kwargs = {'data': data, 'content_type': 'application/json'}
+        with django_assert_num_queries(queries):
+            response = getattr(author_client, method)(urls[url], **kwargs)
+
+        assert response.status_code == status, (
+            f'Проверьте, что {method.upper()}-запрос к `{urls[url]}` '
+            f'возвращает статус {status}'
+        )
+
+    def test_comments_check_review_title(self, client, urls, titles):
+        url = urls['comments'].replace(
+            urls['reviews'], f'/api/v1/titles/{titles[1].id}/reviews/'
+        )
+        assert client.get(url).status_code == 404, (
+            'Проверьте, что комментарии недоступны по адресу '
+            'с чужим произведением'
+        )
+
+    def test_other_integrity_errors_not_masked(
+        self, author_client, urls, monkeypatch
+    ):
+        from django.db import IntegrityError
+        from reviews.models import Review
+
+        def save(*args, **kwargs):
+            raise IntegrityError('CHECK constraint failed: score')
+
+        monkeypatch.setattr(Review, 'save', save)
+        with pytest.raises(IntegrityError):
+            author_client.post(
+                urls['new_review'], {'text': 'Отзыв', 'score': 5},
+                content_type='application/json'
+            )
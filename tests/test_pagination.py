@@ -0,0 +1,83 @@
+from base64 import urlsafe_b64encode
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+@pytest.mark.django_db
+class TestCursorPagination:
+
+    @pytest.fixture
+    def urls(self, reviews):
+        review = reviews[0]
+        reviews_url = f'/api/v1/titles/{review.title_id}/reviews/'
+        return {
+            'reviews': reviews_url,
+            'comments': f'{reviews_url}{review.id}/comments/',
+        }
+
+    @staticmethod
+    def expected_ids(url_name, reviews):
+        from reviews.models import Comment, Review
+        if url_name == 'reviews':
+            queryset = Review.objects.filter(title_id=reviews[0].title_id)
+        else:
+            queryset = Comment.objects.filter(review=reviews[0])
+        return list(
+            queryset.order_by('-pub_date', '-id').values_list('id', flat=True)
+        )
+
+    @pytest.mark.parametrize('url_name', ('reviews', 'comments'))
+    def test_next_previous_round_trip(self, client, urls, reviews, url_name):
+        pages = [client.get(urls[url_name], {'cursor': '', 'limit': 2})
+                 .json()]
+        assert pages[0]['previous'] is None, (
+            'Проверьте, что у первой страницы с cursor нет ссылки previous'
+        )
+        while pages[-1]['next']:
+            pages.append(client.get(pages[-1]['next']).json())
+
+        ids = [item['id'] for page in pages for item in page['results']]
+        assert ids == self.expected_ids(url_name, reviews), (
+            'Проверьте, что ссылки next проходят ленту по (pub_date, id) '
+            'без пропусков и повторов'
+        )
+        assert [len(page['results']) for page in pages] == [2, 2, 1]
+
+        page = pages[-1]
+        for expected in reversed(pages[:-1]):
+            page = client.get(page['previous']).json()
+            assert page['results'] == expected['results'], (
+                'Проверьте, что ссылка previous возвращает предыдущую '
+                'страницу целиком'
+            )
+        assert page['previous'] is None and page['next']
+
+    @pytest.mark.parametrize('cursor', (
+        'не-base64',
+        urlsafe_b64encode(b'not json').decode(),
+        urlsafe_b64encode(b'["2020-01-01T00:00:00", 1]').decode(),
+        urlsafe_b64encode(b'["not a date", 1, 0]').decode(),
+        urlsafe_b64encode(b'["2020-01-01T00:00:00", "x", 0]').decode(),
+    ))
+    def test_invalid_cursor(self, client, urls, cursor):
+        response = client.get(urls['reviews'], {'cursor': cursor})
+        assert response.status_code == 404, (
+            'Проверьте, что некорректный cursor возвращает статус 404'
+        )
+
+    @pytest.mark.parametrize('url_name', ('reviews', 'comments'))
+    def test_cursor_pages_skip_count(self, client, urls, url_name):
+        first = client.get(urls[url_name], {'cursor': '', 'limit': 2}).json()
+        with CaptureQueriesContext(connection) as context:
+            client.get(first['next'])
+            client.get(urls[url_name], {'cursor': ''})
+
+        assert context.captured_queries
+        sql = ' '.join(
+            query['sql'] for query in context.captured_queries
+        ).upper()
+        assert 'COUNT(' not in sql and 'MAX(' not in sql, (
+            'Проверьте, что страницы с cursor не выполняют COUNT и MAX'
+        )
@@ -0,0 +1,101 @@
+import json
+import os
+import pstats
+
+import pytest
+
+
+@pytest.mark.django_db
+class TestProfiling:
+
+    @pytest.fixture
+    def profiling_settings(self, settings, tmp_path):
+        settings.PROFILING = True
+        settings.PROFILING_SAMPLE_RATE = 0
+        settings.PROFILING_DIR = str(tmp_path)
+        settings.PROFILING_MAX_FILES = 2
+        return settings
+
+    @pytest.fixture
+    def admin_client(self, client):
+        from api.authentication import get_access_token
+        from reviews.models import CustomUser
+        admin = CustomUser.objects.create(
+            username='profiler', email='profiler@yamdb.ru', role='admin'
+        )
+        client.defaults['HTTP_AUTHORIZATION'] = (
+            f'Bearer {get_access_token(admin)}'
+        )
+        return client
+
+    def test_admin_profile_saved(
+        self, admin_client, profiling_settings, tmp_path, titles
+    ):
+        response = admin_client.get(
+            f'/api/v1/titles/{titles[0].id}/', HTTP_X_PROFILE='1'
+        )
+
+        name = response['X-Profile-Id']
+        path = tmp_path / 'requested' / name
+        assert pstats.Stats(str(path) + '.prof').total_calls, (
+            'Проверьте, что профиль запроса сохраняется в формате pstats'
+        )
+        record = json.loads((tmp_path / 'requested' / f'{name}.json')
+                            .read_text(encoding='utf-8'))
+        assert record['view'] == 'titles-detail'
+        assert record['status'] == 200 and record['queries'] == 2
+        assert len(record['sql']) == 2, (
+            'Проверьте, что вместе с профилем сохраняется выполненный SQL'
+        )
+        assert {'sql', 'params', 'ms'} <= set(record['sql'][0])
+
+    def test_report_instead_of_response(
+        self, admin_client, profiling_settings, titles
+    ):
+        data = admin_client.get(
+            '/api/v1/titles/', {'profile': 'report'}
+        ).json()
+
+        assert data['view'] == 'titles-list' and data['sql'], (
+            'Проверьте, что `?profile=report` возвращает SQL запроса'
+        )
+        assert 'cumulative' in data['profile'], (
+            'Проверьте, что отчёт содержит самые долгие функции'
+        )
+
+    def test_only_admin_can_profile(
+        self, client, profiling_settings, tmp_path, titles
+    ):
+        response = client.get('/api/v1/titles/', {'profile': 'report'})
+
+        assert response.status_code == 200
+        assert 'results' in response.json(), (
+            'Проверьте, что профилирование доступно только администратору'
+        )
+        assert not response.has_header('X-Profile-Id')
+        assert not list(tmp_path.iterdir())
+
+    def test_sampled_profiles_ring_buffer(
+        self, client, profiling_settings, tmp_path, titles
+    ):
+        profiling_settings.PROFILING_SAMPLE_RATE = 1
+        for title in titles[:3]:
+            response = client.get(f'/api/v1/titles/{title.id}/')
+            assert not response.has_header('X-Profile-Id')
+
+        files = sorted(os.listdir(tmp_path / 'sampled'))
+        assert len(files) == 4, (
+            'Проверьте, что хранятся только PROFILING_MAX_FILES '
+            'последних профилей'
+        )
+        assert files[-2].endswith('.json')
+        record = json.loads((tmp_path / 'sampled' / files[-2])
+                            .read_text(encoding='utf-8'))
+        assert record['path'] == f'/api/v1/titles/{titles[2].id}/'
+        assert 'params' not in record['sql'][0], (
+            'Проверьте, что выборочные профили не хранят параметры SQL'
+        )
+
+    def test_disabled_by_default(self, admin_client, titles):
+        response = admin_client.get('/api/v1/titles/', HTTP_X_PROFILE='1')
+        assert not response.has_header('X-Profile-Id')
@@ -0,0 +1,67 @@
+import re
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+# Строка плана SQLite без индекса: полный проход по таблице.
+FULL_SCAN_REGEX = re.compile(r'^SCAN (TABLE )?\w+( AS \w+)?$')
+
+
+@pytest.fixture
+def dataset(category, genres, users):
+    from reviews.models import Category, Comment, GenreTitle, Review, Title
+    categories = [category] + [
+        Category.objects.create(name=f'Категория {index}', slug=f'c-{index}')
+        for index in range(9)
+    ]
+    Title.objects.bulk_create(
+        Title(name=f'Произведение {index}', year=1900 + index % 120,
+              category=categories[index % len(categories)])
+        for index in range(300)
+    )
+    titles = list(Title.objects.all())
+    GenreTitle.objects.bulk_create(
+        GenreTitle(title=title, genre=genres[index % len(genres)])
+        for index, title in enumerate(titles)
+    )
+    Review.objects.bulk_create(
+        Review(title=title, author=user, text='Отзыв', score=5)
+        for title in titles for user in users
+    )
+    reviews = list(Review.objects.all()[:300])
+    Comment.objects.bulk_create(
+        Comment(review=review, author=user, text='Комментарий')
+        for review in reviews for user in users
+    )
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE')
+    return reviews[0]
+
+
+@pytest.mark.django_db
+def test_list_queries_use_indexes(client, dataset):
+    urls = (
+        '/api/v1/titles/',
+        '/api/v1/titles/?category=films',
+        '/api/v1/titles/?genre=genre-1',
+        '/api/v1/titles/?year=1950',
+        '/api/v1/titles/?year__gte=1950&year__lte=1960',
+        '/api/v1/titles/?rating__gte=9',
+        '/api/v1/titles/?ordering=-rating',
+        '/api/v1/titles/?ordering=year',
+        '/api/v1/titles/?ordering=-name',
+        f'/api/v1/titles/{dataset.title_id}/reviews/',
+        f'/api/v1/titles/{dataset.title_id}/reviews/{dataset.id}/comments/',
+    )
+    for url in urls:
+        with CaptureQueriesContext(connection) as context:
+            assert client.get(url).status_code == 200
+        for query in context.captured_queries:
+            with connection.cursor() as cursor:
+                cursor.execute(f'EXPLAIN QUERY PLAN {query["sql"]}')
+                plan = [row[-1] for row in cursor.fetchall()]
+            assert not any(FULL_SCAN_REGEX.match(row) for row in plan), (
+                f'Проверьте, что запросы `{url}` используют индексы: '
+                f'{query["sql"]}\n{plan}'
+            )
@@ -0,0 +1,128 @@
+import pytest
+
+
+def expected_rating(title):
+    scores = list(title.reviews.values_list('score', flat=True))
+    return (
+        sum(scores),
+        len(scores),
+        sum(scores) / len(scores) if scores else None
+    )
+
+
+def assert_ratings_match_reviews(message):
+    from reviews.models import Title
+    for title in Title.objects.all():
+        assert (
+            title.rating_sum, title.rating_count, title.rating
+        ) == pytest.approx(expected_rating(title)), message
+
+
+@pytest.mark.django_db
+class TestRatings:
+
+    def test_score_edit(self, reviews):
+        from reviews.models import Review
+        review = Review.objects.get(pk=reviews[0].pk)
+        review.score = 10
+        review.save()
+        reviews[1].score = 1
+        reviews[1].save()
+
+        assert_ratings_match_reviews(
+            'Проверьте, что рейтинг пересчитывается при изменении оценки'
+        )
+
+    def test_stale_instances_do_not_drift(self, reviews):
+        from reviews.models import Review
+        first = Review.objects.get(pk=reviews[0].pk)
+        second = Review.objects.get(pk=reviews[0].pk)
+        first.score = 10
+        first.save()
+        second.score = 1
+        second.save()
+        assert_ratings_match_reviews(
+            'Проверьте, что изменение отзыва, загруженного до другого '
+            'изменения, сдвигает рейтинг на разницу с оценкой в базе'
+        )
+
+        stale = Review.objects.get(pk=reviews[1].pk)
+        Review.objects.get(pk=reviews[1].pk).delete()
+        assert stale.delete() == (0, {})
+        changed = Review.objects.get(pk=reviews[2].pk)
+        changed.score = 3
+        changed.save()
+        reviews[2].delete()
+        assert_ratings_match_reviews(
+            'Проверьте, что при удалении отзыва вычитается оценка из базы '
+            'и уже удалённый отзыв не вычитается повторно'
+        )
+
+    def test_review_moved_to_another_title(self, titles, reviews):
+        reviews[1].title = titles[1]
+        reviews[1].save()
+        reviews[2].title = titles[1]
+        reviews[2].score = 2
+        reviews[2].save()
+
+        titles[1].refresh_from_db()
+        assert (titles[1].rating_sum, titles[1].rating_count) == (8, 2)
+        assert_ratings_match_reviews(
+            'Проверьте, что при переносе отзыва рейтинг пересчитывается '
+            'у обоих произведений'
+        )
+
+    def test_review_delete(self, titles, reviews):
+        reviews[0].delete()
+        assert_ratings_match_reviews(
+            'Проверьте, что рейтинг пересчитывается при удалении отзыва'
+        )
+
+        for review in reviews[1:]:
+            review.delete()
+        titles[0].refresh_from_db()
+        assert (
+            titles[0].rating_sum, titles[0].rating_count, titles[0].rating
+        ) == (0, 0, None), (
+            'Проверьте, что у произведения без отзывов нет рейтинга'
+        )
+
+    def test_user_cascade(self, titles, reviews, users):
+        from reviews.deletion import delete_user
+        from reviews.models import Review
+        Review.objects.create(
+            title=titles[1], author=users[0], text='Отзыв', score=3
+        )
+        Review.objects.create(
+            title=titles[1], author=users[1], text='Отзыв', score=7
+        )
+
+        users[0].delete()
+        assert_ratings_match_reviews(
+            'Проверьте, что рейтинг пересчитывается при удалении '
+            'автора отзывов'
+        )
+        delete_user(users[1])
+        assert_ratings_match_reviews(
+            'Проверьте, что delete_user пересчитывает рейтинги '
+            'произведений автора'
+        )
+
+    def test_recalculate_ratings(self, titles, reviews):
+        from reviews.models import Title
+        from reviews.ratings import recalculate_ratings
+        Title.objects.update(rating_sum=100, rating_count=3, rating=1)
+
+        recalculate_ratings(Title.objects.filter(pk=titles[0].pk))
+        titles[0].refresh_from_db()
+        assert titles[0].rating == pytest.approx(7)
+        assert Title.objects.get(pk=titles[1].pk).rating_count == 3, (
+            'Проверьте, что recalculate_ratings пересчитывает только '
+            'переданные произведения'
+        )
+
+        recalculate_ratings()
+        assert_ratings_match_reviews(
+            'Проверьте, что recalculate_ratings восстанавливает рейтинги '
+            'по отзывам'
+        )
@@ -0,0 +1,57 @@
+import pytest
+
+
+@pytest.mark.django_db
+class TestResponseCache:
+
+    def test_titles_list_cached(
+        self, client, django_assert_num_queries, titles
+    ):
+        url = '/api/v1/titles/?limit=5&genre=genre-0'
+        first = client.get(url)
+        with django_assert_num_queries(0):
+            second = client.get(url)
+
+        assert first['X-Cache'] == 'MISS' and second['X-Cache'] == 'HIT', (
+            'Проверьте, что повторный GET-запрос к `/api/v1/titles/` '
+            'отдаётся из кэша'
+        )
+        assert first.json() == second.json(), (
+            'Проверьте, что закэшированный ответ совпадает с исходным'
+        )
+
+    def test_query_params_normalized(self, client, titles):
+        client.get('/api/v1/titles/?genre=genre-0&limit=5')
+        response = client.get('/api/v1/titles/?limit=5&genre=genre-0&x=1')
+
+        assert response['X-Cache'] == 'HIT', (
+            'Проверьте, что порядок и лишние параметры запроса '
+            'не влияют на ключ кэша'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_cache_invalidated_on_change(self, client, titles, genres):
+        from reviews.models import Genre
+        url = '/api/v1/genres/'
+        client.get(url)
+        Genre.objects.create(name='Новый жанр', slug='new-genre')
+        response = client.get(url)
+
+        assert response['X-Cache'] == 'MISS', (
+            'Проверьте, что изменение жанров сбрасывает кэш `/api/v1/genres/`'
+        )
+        assert response.json()['count'] == len(genres) + 1
+
+    @pytest.mark.django_db(transaction=True)
+    def test_titles_invalidated_on_review(self, client, titles):
+        from reviews.models import CustomUser, Review
+        title = titles[0]
+        url = f'/api/v1/titles/{title.id}/'
+        client.get(url)
+        author = CustomUser.objects.create(username='author', email='a@a.ru')
+        Review.objects.create(author=author, title=title, text='ok', score=7)
+        response = client.get(url)
+
+        assert response.json()['rating'] == 7, (
+            'Проверьте, что новый отзыв сбрасывает кэш произведения'
+        )
@@ -0,0 +1,97 @@
+import pytest
+from django.core.management import call_command
+
+
+def score_counts(title):
+    return dict(title.score_counts.values_list('score', 'count'))
+
+
+@pytest.mark.django_db
+class TestTitleStats:
+
+    def test_score_counts_follow_reviews(self, titles, reviews):
+        title = titles[0]
+        assert score_counts(title) == {5: 1, 6: 1, 7: 1, 8: 1, 9: 1}, (
+            'Проверьте, что распределение оценок обновляется '
+            'при создании отзыва'
+        )
+
+        reviews[0].score = 9
+        reviews[0].save()
+        reviews[1].title = titles[1]
+        reviews[1].save()
+        reviews[2].delete()
+
+        assert score_counts(title) == {8: 1, 9: 2}, (
+            'Проверьте, что распределение оценок обновляется '
+            'при изменении и удалении отзыва, а оценки без отзывов '
+            'из него удаляются'
+        )
+        assert score_counts(titles[1]) == {6: 1}
+
+    def test_recalculate_command_rebuilds_score_counts(self, titles, reviews):
+        from reviews.models import ScoreCount
+        ScoreCount.objects.all().delete()
+        ScoreCount.objects.create(title=titles[5], score=3, count=7)
+
+        call_command('recalculate_ratings')
+
+        assert score_counts(titles[0]) == {5: 1, 6: 1, 7: 1, 8: 1, 9: 1}, (
+            'Проверьте, что recalculate_ratings пересобирает '
+            'распределение оценок'
+        )
+        assert not score_counts(titles[5])
+
+    def test_recalculate_many_titles(self, users):
+        from reviews.models import Review, ScoreCount, Title
+        from reviews.ratings import recalculate_score_counts
+        Title.objects.bulk_create(
+            (Title(name=f'Произведение {index}', year=2000)
+             for index in range(600)),
+            batch_size=100
+        )
+        Review.objects.bulk_create(
+            (Review(title=title, author=users[0], text='Отзыв', score=5)
+             for title in Title.objects.all()),
+            batch_size=100
+        )
+
+        assert recalculate_score_counts() == 600, (
+            'Проверьте, что распределение оценок пересобирается '
+            'для большого числа произведений'
+        )
+        assert ScoreCount.objects.count() == 600
+
+    def test_stats_endpoint(
+        self, client, django_assert_num_queries, titles, reviews
+    ):
+        url = f'/api/v1/titles/{titles[0].id}/stats/'
+        with django_assert_num_queries(2):
+            response = client.get(url)
+
+        assert response.status_code == 200, (
+            'Проверьте, что GET-запрос к `/api/v1/titles/{id}/stats/` '
+            'возвращает статус 200'
+        )
+        data = response.json()
+        assert data['rating'] == 7 and data['rating_count'] == 5
+        assert data['scores'] == [
+            {'score': score, 'count': int(5 <= score <= 9)}
+            for score in range(1, 11)
+        ], (
+            'Проверьте, что `/api/v1/titles/{id}/stats/` возвращает число '
+            'оценок каждого значения, включая нулевые'
+        )
+        assert client.get(url)['X-Cache'] == 'HIT'
+
+    def test_title_detail_with_stats(self, client, titles, reviews):
+        url = f'/api/v1/titles/{titles[0].id}/'
+        data = client.get(url, {'stats': 'true'}).json()
+
+        assert data['stats']['scores'][4] == {'score': 5, 'count': 1}, (
+            'Проверьте, что `?stats=true` добавляет распределение оценок '
+            'к произведению'
+        )
+        assert 'stats' not in client.get(url).json(), (
+            'Проверьте, что без `?stats=true` ответ не меняется'
+        )
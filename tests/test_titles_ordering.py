@@ -0,0 +1,45 @@
+import pytest
+
+
+@pytest.mark.django_db
+class TestTitlesOrdering:
+
+    def get_ids(self, client, params):
+        response = client.get('/api/v1/titles/', {'limit': 100, **params})
+        assert response.status_code == 200, (
+            'Проверьте, что GET-запрос к `/api/v1/titles/` с параметрами '
+            f'{params} возвращает статус 200'
+        )
+        return [title['id'] for title in response.json()['results']]
+
+    def test_ordering(self, client, titles):
+        expected = [
+            title.id for title in sorted(
+                titles, key=lambda title: (-title.year, -title.id)
+            )
+        ]
+        assert self.get_ids(client, {'ordering': '-year'}) == expected, (
+            'Проверьте, что `/api/v1/titles/` сортируется по ordering, '
+            'а при равных значениях — по id'
+        )
+        assert self.get_ids(client, {'ordering': 'description'}) == (
+            self.get_ids(client, {})
+        ), (
+            'Проверьте, что сортировка доступна только по name, year '
+            'и rating'
+        )
+
+    def test_range_filters(self, client, titles, reviews):
+        ids = self.get_ids(client, {'year__gte': 2005, 'year__lte': 2007})
+        assert sorted(ids) == sorted(
+            title.id for title in titles if 2005 <= title.year <= 2007
+        ), (
+            'Проверьте, что `/api/v1/titles/` фильтруется по диапазону лет'
+        )
+        assert self.get_ids(
+            client, {'rating__gte': 6, 'rating__lte': 8}
+        ) == [titles[0].id], (
+            'Проверьте, что `/api/v1/titles/` фильтруется по диапазону '
+            'рейтинга'
+        )
+        assert self.get_ids(client, {'rating__gte': 8}) == []
@@ -0,0 +1,47 @@
+import pytest
+
+
+@pytest.mark.django_db
+class TestTitlesQueries:
+
+    @pytest.mark.parametrize('limit', (1, 10, 25))
+    def test_titles_list_queries(
+        self, client, django_assert_num_queries, titles, limit
+    ):
+        with django_assert_num_queries(3):
+            response = client.get(f'/api/v1/titles/?limit={limit}')
+
+        assert response.status_code == 200, (
+            'Проверьте, что GET-запрос к `/api/v1/titles/` возвращает статус 200'
+        )
+        assert len(response.json()['results']) == limit, (
+            'Проверьте, что `/api/v1/titles/` учитывает параметр limit'
+        )
+
+    @pytest.mark.parametrize('limit', (10, 25))
+    def test_titles_list_filtered_queries(
+        self, client, django_assert_num_queries, titles, limit
+    ):
+        with django_assert_num_queries(3):
+            response = client.get(
+                f'/api/v1/titles/?limit={limit}&genre=genre-0&category=films'
+            )
+
+        assert response.status_code == 200, (
+            'Проверьте, что фильтрация `/api/v1/titles/` возвращает статус 200'
+        )
+
+    def test_title_detail_queries(
+        self, client, django_assert_num_queries, titles
+    ):
+        title = titles[-1]
+        with django_assert_num_queries(2):
+            response = client.get(f'/api/v1/titles/{title.id}/')
+
+        assert response.status_code == 200, (
+            'Проверьте, что GET-запрос к `/api/v1/titles/{id}/` '
+            'возвращает статус 200'
+        )
+        assert len(response.json()['genre']) == title.genre.count(), (
+            'Проверьте, что `/api/v1/titles/{id}/` возвращает все жанры'
+        )
@@ -0,0 +1,69 @@
+import pytest
+
+
+@pytest.mark.django_db
+class TestTitlesSearch:
+
+    def test_search_ranks_name_above_description(self, client):
+        from reviews.models import Title
+        Title.objects.create(
+            name='Тихий Дон', year=1940,
+            description='Роман о том, как война меняет людей'
+        )
+        Title.objects.create(
+            name='Война и мир', year=1869, description='Эпопея'
+        )
+        Title.objects.create(name='Отцы и дети', year=1862)
+
+        response = client.get('/api/v1/titles/?search=война')
+
+        assert response.status_code == 200, (
+            'Проверьте, что поиск по `/api/v1/titles/?search=` '
+            'возвращает статус 200'
+        )
+        names = [title['name'] for title in response.json()['results']]
+        assert names == ['Война и мир', 'Тихий Дон'], (
+            'Проверьте, что поиск находит слово в названии и описании '
+            'и ставит совпадения в названии выше'
+        )
+
+    def test_search_follows_updates(self, client):
+        from reviews.models import Title
+        title = Title.objects.create(name='Черновик', year=2000)
+        title.name = 'Мастер и Маргарита'
+        title.save()
+
+        names = [
+            result['name'] for result in
+            client.get('/api/v1/titles/?search=маргарита').json()['results']
+        ]
+        assert names == ['Мастер и Маргарита'], (
+            'Проверьте, что поисковый индекс обновляется при изменении '
+            'произведения'
+        )
+        assert not client.get(
+            '/api/v1/titles/?search=черновик'
+        ).json()['results']
+
+    def test_triggers_restored_after_migrate(self, client):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from reviews.models import Title
+        from reviews.search import FTS_TABLE, restore_search_triggers
+        with connection.cursor() as cursor:
+            for action in ('insert', 'delete', 'update'):
+                cursor.execute(f'DROP TRIGGER {FTS_TABLE}_{action}')
+
+        with CaptureQueriesContext(connection) as context:
+            restore_search_triggers()
+        assert not any(
+            'rebuild' in query['sql'] for query in context.captured_queries
+        ), 'Проверьте, что после migrate индекс не перестраивается целиком'
+
+        Title.objects.create(name='Мастер и Маргарита', year=1967)
+        assert client.get(
+            '/api/v1/titles/?search=маргарита'
+        ).json()['results'], (
+            'Проверьте, что после migrate триггеры поискового индекса '
+            'восстанавливаются'
+        )